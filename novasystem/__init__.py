@@ -5,15 +5,28 @@ A system for automatically reading software repository documentation,
 extracting installation instructions, and executing them in a secure sandbox.
 """
 
+import importlib
+from typing import Any, List
+
 # Version number should match the one in pyproject.toml
 __version__ = "0.1.1"
 
-# Import main components for easy access
-from .repository import RepositoryHandler
-from .parser import DocumentationParser, Command, CommandType, CommandSource
-from .docker import DockerExecutor, CommandResult
-from .database import DatabaseManager
-from .nova import Nova
+# Main components, imported from their modules on first access so that
+# `import novasystem` does not load git, docker or requests
+_LAZY_ATTRIBUTES = {
+    'RepositoryHandler': '.repository',
+    'DocumentationParser': '.parser',
+    'Command': '.parser',
+    'CommandType': '.parser',
+    'CommandSource': '.parser',
+    'Executor': '.executor',
+    'LocalExecutor': '.executor',
+    'CommandResult': '.executor',
+    'DockerExecutor': '.docker',
+    'DatabaseManager': '.database',
+    'AsyncDatabaseManager': '.async_database',
+    'Nova': '.nova',
+}
 
 # Define what should be imported with `from novasystem import *`
 __all__ = [
@@ -22,8 +35,37 @@ __all__ = [
     'Command',
     'CommandType',
     'CommandSource',
+    'Executor',
+    'LocalExecutor',
     'DockerExecutor',
     'CommandResult',
     'DatabaseManager',
+    'AsyncDatabaseManager',
     'Nova',
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Import a main component on first access.
+
+    Args:
+        name: Attribute name.
+
+    Returns:
+        The component.
+
+    Raises:
+        AttributeError: If the name is not a component.
+    """
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache it, so later accesses skip this function
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -0,0 +1,343 @@
+"""
+Run History Archives for NovaSystem.
+
+This module reads and writes run history archives: one record per run,
+holding the run with its commands and documentation. Archives are JSON
+Lines, plain or compressed with gzip or zstd, or Parquet. zstd needs the
+zstandard package and Parquet needs pyarrow; both are optional, and are
+imported only when an archive in their format is opened.
+"""
+
+import io
+import gzip
+import json
+import logging
+from types import ModuleType
+from typing import Dict, Any, List, Optional, BinaryIO, Iterator
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMATS = ("jsonl", "jsonl.gz", "jsonl.zst", "parquet")
+
+# Formats whose flushed records can be read back before the archive is
+# closed; Parquet writes its footer, which readers need, only on close
+INCREMENTAL_FORMATS = ("jsonl", "jsonl.gz", "jsonl.zst")
+
+# Run columns stored as Parquet columns; commands and documentation are
+# stored as JSON text, since their shape differs between schema versions
+PARQUET_RUN_COLUMNS = ("id", "repo_url", "start_time", "end_time", "status", "success",
+                       "summary", "repository_type", "metadata")
+
+# Records buffered per Parquet row group
+PARQUET_ROW_GROUP = 1000
+
+# Leading bytes identifying compressed and Parquet archives
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+PARQUET_MAGIC = b"PAR1"
+
+
+def _zstandard() -> ModuleType:
+    """
+    Import zstandard.
+
+    Raises:
+        ValueError: If it is not installed.
+    """
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("zstd archives require the zstandard package")
+    return zstandard
+
+
+def _pyarrow() -> ModuleType:
+    """
+    Import pyarrow with its Parquet module.
+
+    Raises:
+        ValueError: If it is not installed.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("Parquet archives require the pyarrow package")
+    return pyarrow
+
+
+def archive_format(path: str) -> str:
+    """
+    Choose an archive format from a file name.
+
+    Args:
+        path: Archive path, e.g. "runs.jsonl.gz".
+
+    Returns:
+        One of ARCHIVE_FORMATS; plain JSON Lines if the suffix is not recognized.
+    """
+    name = path.lower()
+    if name.endswith(".parquet"):
+        return "parquet"
+    if name.endswith(".zst"):
+        return "jsonl.zst"
+    if name.endswith(".gz"):
+        return "jsonl.gz"
+    return "jsonl"
+
+
+class RunArchiveWriter:
+    """
+    Writes run records to a new archive file or to a stream.
+
+    A record is a dictionary with "run" (the run record), "commands" and
+    "documentation" (lists of records). An archive file is created
+    exclusively, so an existing archive is never overwritten.
+    """
+
+    def __init__(self, path: Optional[str] = None, format: Optional[str] = None,
+                 fileobj: Optional[BinaryIO] = None):
+        """
+        Initialize the RunArchiveWriter.
+
+        Args:
+            path: Path of the archive to create.
+            format: One of ARCHIVE_FORMATS. If None, chosen from the file name,
+                or plain JSON Lines for a stream.
+            fileobj: Binary stream to write to instead of a file, such as
+                sys.stdout.buffer. It is left open.
+
+        Raises:
+            ValueError: If the format is unavailable or the file cannot be created.
+        """
+        self.path = path or "<stream>"
+        self.format = format or (archive_format(path) if path else "jsonl")
+        self.count = 0
+        self._owns_file = fileobj is None
+        self._file: Optional[BinaryIO] = None
+        self._stream: Optional[BinaryIO] = None
+        self._parquet_writer = None
+        self._rows: List[Dict[str, Any]] = []
+
+        if self.format not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unknown archive format: {self.format}")
+        # Check before creating the file, so a missing package leaves nothing behind
+        if self.format == "jsonl.zst":
+            _zstandard()
+        elif self.format == "parquet":
+            _pyarrow()
+
+        if fileobj is not None:
+            self._file = fileobj
+        else:
+            try:
+                self._file = open(path, "xb")
+            except OSError as e:
+                raise ValueError(f"Cannot create archive {path}: {str(e)}")
+
+        if self.format == "jsonl.gz":
+            self._stream = gzip.GzipFile(fileobj=self._file, mode="wb")
+        elif self.format == "jsonl.zst":
+            self._stream = _zstandard().ZstdCompressor().stream_writer(self._file, closefd=self._owns_file)
+        elif self.format == "jsonl":
+            self._stream = self._file
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """
+        Append a run record.
+
+        Args:
+            record: Run record with its commands and documentation.
+        """
+        if self.format == "parquet":
+            run = record["run"]
+            row = {column: run.get(column) for column in PARQUET_RUN_COLUMNS}
+            if row["success"] is not None:
+                row["success"] = bool(row["success"])
+            if row["metadata"] is not None and not isinstance(row["metadata"], str):
+                row["metadata"] = json.dumps(row["metadata"])
+            row["commands"] = json.dumps(record["commands"], default=str)
+            row["documentation"] = json.dumps(record["documentation"], default=str)
+            self._rows.append(row)
+            if len(self._rows) >= PARQUET_ROW_GROUP:
+                self._write_row_group()
+        else:
+            self._stream.write(json.dumps(record, default=str).encode("utf-8") + b"\n")
+        self.count += 1
+
+    @property
+    def incremental(self) -> bool:
+        """
+        Whether flushed records can be read back if the archive is never closed.
+        """
+        return self.format in INCREMENTAL_FORMATS
+
+    def flush(self) -> None:
+        """
+        Push buffered records to the file.
+
+        For incremental formats, flushed records survive if the process stops
+        before close(). A Parquet archive stays unreadable until it is closed.
+        """
+        if self.format == "parquet":
+            self._write_row_group()
+        else:
+            self._stream.flush()
+            self._file.flush()
+
+    def close(self) -> None:
+        """
+        Finish the archive and close the file.
+        """
+        if self._file is None:
+            return
+        try:
+            if self.format == "parquet":
+                self._write_row_group()
+                if self._parquet_writer is not None:
+                    self._parquet_writer.close()
+            elif self._stream is not self._file:
+                self._stream.close()
+        finally:
+            if self._owns_file:
+                self._file.close()
+            else:
+                self._file.flush()
+            self._file = None
+        logger.info(f"Archived {self.count} runs to {self.path}")
+
+    def _write_row_group(self) -> None:
+        """
+        Write buffered records as a Parquet row group.
+        """
+        if not self._rows:
+            return
+        pyarrow = _pyarrow()
+        schema = pyarrow.schema(
+            [("id", pyarrow.int64()), ("success", pyarrow.bool_())]
+            + [(column, pyarrow.string()) for column in PARQUET_RUN_COLUMNS if column not in ("id", "success")]
+            + [("commands", pyarrow.string()), ("documentation", pyarrow.string())]
+        )
+        if self._parquet_writer is None:
+            self._parquet_writer = pyarrow.parquet.ParquetWriter(self._file, schema, compression="zstd")
+        self._parquet_writer.write_table(pyarrow.Table.from_pylist(self._rows, schema=schema))
+        self._rows = []
+
+    def __enter__(self) -> "RunArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class RunArchiveReader:
+    """
+    Reads run records from an archive file or stream.
+
+    The format is detected from the content, so compressed archives can be
+    read from a pipe.
+    """
+
+    def __init__(self, path: Optional[str] = None, fileobj: Optional[BinaryIO] = None):
+        """
+        Initialize the RunArchiveReader.
+
+        Args:
+            path: Path of the archive to read.
+            fileobj: Buffered binary stream to read instead of a file, such as
+                sys.stdin.buffer. It is left open.
+
+        Raises:
+            ValueError: If the archive cannot be opened or its format is unavailable.
+        """
+        self.path = path or "<stream>"
+        self._owns_file = fileobj is None
+        self._wrapped = fileobj is not None and not hasattr(fileobj, "peek")
+        if fileobj is not None:
+            # Detecting the format needs to peek without consuming
+            self._file = io.BufferedReader(fileobj) if self._wrapped else fileobj
+        else:
+            try:
+                self._file = open(path, "rb")
+            except OSError as e:
+                raise ValueError(f"Cannot open archive {path}: {str(e)}")
+
+        magic = self._file.peek(4)[:4]
+        if magic.startswith(GZIP_MAGIC):
+            self.format = "jsonl.gz"
+        elif magic == ZSTD_MAGIC:
+            self.format = "jsonl.zst"
+        elif magic == PARQUET_MAGIC:
+            self.format = "parquet"
+        else:
+            self.format = "jsonl"
+
+        try:
+            if self.format == "jsonl.zst":
+                _zstandard()
+            elif self.format == "parquet":
+                _pyarrow()
+        except ValueError:
+            self.close()
+            raise
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """
+        Read the records one at a time.
+
+        Yields:
+            Run records.
+
+        Raises:
+            ValueError: If a record is not valid JSON.
+        """
+        if self.format == "parquet":
+            yield from self._read_parquet()
+            return
+
+        if self.format == "jsonl.gz":
+            stream = gzip.GzipFile(fileobj=self._file, mode="rb")
+        elif self.format == "jsonl.zst":
+            stream = io.BufferedReader(_zstandard().ZstdDecompressor().stream_reader(
+                self._file, read_across_frames=True, closefd=False))
+        else:
+            stream = self._file
+
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"Invalid record on line {line_number} of {self.path}: {str(e)}")
+
+    def _read_parquet(self) -> Iterator[Dict[str, Any]]:
+        """
+        Read records from a Parquet archive.
+        """
+        for batch in _pyarrow().parquet.ParquetFile(self._file).iter_batches(batch_size=PARQUET_ROW_GROUP):
+            for row in batch.to_pylist():
+                yield {
+                    "run": {column: row.get(column) for column in PARQUET_RUN_COLUMNS},
+                    "commands": json.loads(row["commands"] or "[]"),
+                    "documentation": json.loads(row["documentation"] or "[]"),
+                }
+
+    def close(self) -> None:
+        """
+        Close the archive file.
+        """
+        if self._file is None:
+            return
+        if self._owns_file:
+            self._file.close()
+        elif self._wrapped:
+            # Release the caller's stream without closing it
+            self._file.detach()
+        self._file = None
+
+    def __enter__(self) -> "RunArchiveReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,310 @@
+"""
+Async Database Manager for NovaSystem.
+
+This module provides an asyncio interface to the run database, so event
+loop based orchestration can log runs without blocking on SQLite. Writes
+are queued to a dedicated writer thread, which applies everything queued
+since its last batch back to back; reads run on a small thread pool with
+their own connections.
+"""
+
+import queue
+import asyncio
+import logging
+import functools
+import threading
+import concurrent.futures
+from typing import List, Dict, Any, Optional, AsyncIterator, Callable, TypeVar
+
+from .database import (DatabaseManager, DEFAULT_COMMIT_BATCH, DEFAULT_COMMIT_INTERVAL,
+                       DEFAULT_DELETE_BATCH, run_cursor)
+
+logger = logging.getLogger(__name__)
+
+# Threads serving reads; each keeps its own read connection
+DEFAULT_READ_WORKERS = 4
+
+# Runs fetched per page by iter_runs
+DEFAULT_PAGE_SIZE = 100
+
+T = TypeVar("T")
+
+
+class AsyncDatabaseManager:
+    """
+    Asyncio wrapper around DatabaseManager.
+
+    Writes are applied in the order they are awaited. Awaiting a write
+    returns once it is applied and visible to later reads; like
+    DatabaseManager, it is group-committed shortly after. Cancelling a
+    write that has not started yet drops it.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, batch_size: int = DEFAULT_COMMIT_BATCH,
+                 commit_interval: float = DEFAULT_COMMIT_INTERVAL,
+                 read_workers: int = DEFAULT_READ_WORKERS,
+                 db_manager: Optional[DatabaseManager] = None):
+        """
+        Initialize the AsyncDatabaseManager.
+
+        Args:
+            db_path: Path to the SQLite database file. If None, uses the default path.
+            batch_size: Maximum number of queued writes applied together, and
+                of writes per group commit.
+            commit_interval: Maximum time a write stays uncommitted (in seconds).
+            read_workers: Number of threads serving reads.
+            db_manager: Manager to wrap instead of opening db_path. It is
+                closed with this manager.
+        """
+        self.db_manager = db_manager or DatabaseManager(db_path, commit_batch=batch_size,
+                                                        commit_interval=commit_interval)
+        self.batch_size = max(1, batch_size)
+        self._queue: "queue.SimpleQueue[Optional[tuple]]" = queue.SimpleQueue()
+        self._readers = concurrent.futures.ThreadPoolExecutor(max_workers=read_workers,
+                                                              thread_name_prefix="novasystem-db-reader")
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name="novasystem-db-writer", daemon=True)
+        self._writer.start()
+
+    async def _write(self, method: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Queue a write for the writer thread and wait for it.
+
+        Args:
+            method: DatabaseManager method to call.
+            *args: Positional arguments.
+            **kwargs: Keyword arguments.
+
+        Returns:
+            The method's result.
+
+        Raises:
+            ValueError: If the manager is closed.
+        """
+        if self._closed:
+            raise ValueError("Database manager is closed")
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self._queue.put((future, method, args, kwargs))
+        # Cancelling the awaiting task cancels the future, which the writer then skips
+        return await asyncio.wrap_future(future)
+
+    async def _read(self, method: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run a read (or a long maintenance operation) on the reader threads.
+
+        Args:
+            method: DatabaseManager method to call.
+            *args: Positional arguments.
+            **kwargs: Keyword arguments.
+
+        Returns:
+            The method's result.
+
+        Raises:
+            ValueError: If the manager is closed.
+        """
+        if self._closed:
+            raise ValueError("Database manager is closed")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, functools.partial(method, *args, **kwargs))
+
+    def _write_loop(self) -> None:
+        """
+        Apply queued writes in batches until closed.
+        """
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size and batch[-1] is not None:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            with self.db_manager.batch():
+                for entry in batch:
+                    if entry is None:
+                        continue
+                    future, method, args, kwargs = entry
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        future.set_result(method(*args, **kwargs))
+                    except BaseException as e:
+                        future.set_exception(e)
+
+            if batch[-1] is None:
+                return
+
+    async def create_run(self, repo_url: str, repository_type: Optional[str] = None,
+                         metadata: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Create a new repository run record. See DatabaseManager.create_run.
+        """
+        return await self._write(self.db_manager.create_run, repo_url, repository_type, metadata)
+
+    async def update_run(self, run_id: int, status: Optional[str] = None,
+                         success: Optional[bool] = None, summary: Optional[str] = None,
+                         end_time: bool = False, repository_type: Optional[str] = None,
+                         metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Update a run record. See DatabaseManager.update_run.
+        """
+        return await self._write(self.db_manager.update_run, run_id, status, success, summary,
+                                 end_time, repository_type, metadata)
+
+    async def log_command(self, run_id: int, command: str, **kwargs) -> int:
+        """
+        Log a command execution. See DatabaseManager.log_command for the keyword arguments.
+        """
+        return await self._write(self.db_manager.log_command, run_id, command, **kwargs)
+
+    async def update_command(self, command_id: int, **kwargs) -> bool:
+        """
+        Record the result of a logged command. See DatabaseManager.update_command.
+        """
+        return await self._write(self.db_manager.update_command, command_id, **kwargs)
+
+    async def store_documentation(self, run_id: int, file_path: str, content: str,
+                                  metadata: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Store documentation content. See DatabaseManager.store_documentation.
+        """
+        return await self._write(self.db_manager.store_documentation, run_id, file_path, content, metadata)
+
+    async def add_checkpoint(self, run_id: int, command_index: int, image: str,
+                             stage: Optional[str] = None) -> int:
+        """
+        Record a checkpoint image for a run. See DatabaseManager.add_checkpoint.
+        """
+        return await self._write(self.db_manager.add_checkpoint, run_id, command_index, image, stage)
+
+    async def delete_checkpoints(self, run_id: Optional[int] = None,
+                                 images: Optional[List[str]] = None) -> int:
+        """
+        Delete checkpoint records by run or by image. See DatabaseManager.delete_checkpoints.
+        """
+        return await self._write(self.db_manager.delete_checkpoints, run_id, images)
+
+    async def delete_run(self, run_id: int) -> bool:
+        """
+        Delete a run and all associated records.
+        """
+        return await self._write(self.db_manager.delete_run, run_id)
+
+    async def delete_old_runs(self, days: int, batch_size: int = DEFAULT_DELETE_BATCH) -> int:
+        """
+        Delete runs older than a specified number of days.
+
+        Runs on a reader thread: retention takes the write lock one batch at
+        a time, so queued writes proceed in between.
+        """
+        return await self._read(self.db_manager.delete_old_runs, days, batch_size)
+
+    async def flush(self) -> None:
+        """
+        Commit all writes queued so far.
+        """
+        await self._write(self.db_manager.flush)
+
+    async def get_run(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get details of a run.
+        """
+        return await self._read(self.db_manager.get_run, run_id)
+
+    async def get_commands(self, run_id: int) -> List[Dict[str, Any]]:
+        """
+        Get commands for a run.
+        """
+        return await self._read(self.db_manager.get_commands, run_id)
+
+    async def get_documentation(self, run_id: int) -> List[Dict[str, Any]]:
+        """
+        Get documentation for a run.
+        """
+        return await self._read(self.db_manager.get_documentation, run_id)
+
+    async def list_runs(self, limit: int = 10, offset: int = 0, status: Optional[str] = None,
+                        success: Optional[bool] = None, after: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List runs with filtering and pagination, newest first. See DatabaseManager.list_runs.
+        """
+        return await self._read(self.db_manager.list_runs, limit, offset, status, success, after)
+
+    async def iter_runs(self, status: Optional[str] = None, success: Optional[bool] = None,
+                        page_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream runs newest first, a page at a time.
+
+        Args:
+            status: Filter by status.
+            success: Filter by success flag.
+            page_size: Runs fetched per page.
+
+        Yields:
+            Run records.
+        """
+        after = None
+        while True:
+            page = await self.list_runs(page_size, status=status, success=success, after=after)
+            for run in page:
+                yield run
+            if len(page) < page_size:
+                return
+            after = run_cursor(page[-1])
+
+    async def get_execution_times(self, normalized_command: str, limit: int = 200) -> List[float]:
+        """
+        Get recent execution times for a normalized command.
+        """
+        return await self._read(self.db_manager.get_execution_times, normalized_command, limit)
+
+    async def get_resource_report(self, group_by: str = "command", order_by: str = "peak_memory_bytes",
+                                  limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Aggregate command resource usage across runs.
+        """
+        return await self._read(self.db_manager.get_resource_report, group_by, order_by, limit)
+
+    async def get_stats(self, group_by: str = "repository_type", limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Get run statistics from the summary tables.
+        """
+        return await self._read(self.db_manager.get_stats, group_by, limit)
+
+    async def search(self, query: str, kind: str = "all", limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Search command text, command errors and documentation.
+        """
+        return await self._read(self.db_manager.search, query, kind, limit)
+
+    async def get_checkpoints(self, run_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get checkpoint records, oldest first.
+        """
+        return await self._read(self.db_manager.get_checkpoints, run_id)
+
+    async def get_latest_checkpoint(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the checkpoint covering the most commands of a run.
+        """
+        return await self._read(self.db_manager.get_latest_checkpoint, run_id)
+
+    async def close(self) -> None:
+        """
+        Apply queued writes, then close the database.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._writer.join)
+        self._readers.shutdown(wait=True)
+        self.db_manager.close()
+
+    async def __aenter__(self) -> "AsyncDatabaseManager":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
@@ -0,0 +1,318 @@
+"""
+Package Cache Volume module for NovaSystem.
+
+This module manages named Docker volumes that persist package-manager caches
+(pip, npm, yarn, cargo and Go modules) across runner containers. The
+docker package is imported only by the methods that talk to the daemon, so
+importing parse_size stays cheap.
+"""
+
+import os
+import re
+import json
+import time
+import logging
+import threading
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Mount point inside the container and the environment that points the
+# package manager at it, per cache.
+CACHE_MOUNTS: Dict[str, Dict[str, Any]] = {
+    "pip": {
+        "path": "/cache/pip",
+        "environment": {"PIP_CACHE_DIR": "/cache/pip"},
+    },
+    "npm": {
+        "path": "/cache/npm",
+        "environment": {"npm_config_cache": "/cache/npm"},
+    },
+    "yarn": {
+        "path": "/cache/yarn",
+        "environment": {"YARN_CACHE_FOLDER": "/cache/yarn"},
+    },
+    "cargo": {
+        "path": "/cache/cargo",
+        "environment": {"CARGO_HOME": "/cache/cargo"},
+    },
+    "go": {
+        "path": "/cache/go",
+        "environment": {"GOMODCACHE": "/cache/go/mod", "GOCACHE": "/cache/go/build"},
+    },
+}
+
+CACHE_LABEL = "novasystem.cache"
+DEFAULT_MAX_CACHE_BYTES = 10 * 1024 ** 3
+
+_SIZE_UNITS = {"": 1, "b": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3, "t": 1024 ** 4}
+
+
+def parse_size(value: Any) -> int:
+    """
+    Parse a Docker-style size string such as "512m" or "10g" into bytes.
+
+    Args:
+        value: Size as an integer number of bytes or a string with an optional unit.
+
+    Returns:
+        Size in bytes.
+
+    Raises:
+        ValueError: If the value cannot be parsed.
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([bkmgt]?)i?b?\s*", str(value).lower())
+    if not match:
+        raise ValueError(f"Invalid size: {value}")
+
+    number, unit = match.groups()
+    return int(float(number) * _SIZE_UNITS[unit])
+
+
+def image_family(image_name: str) -> str:
+    """
+    Derive the cache family for a Docker image.
+
+    Images that share a repository name (ignoring the tag and digest) share caches.
+
+    Args:
+        image_name: Docker image reference, e.g. "novasystem/runner:latest".
+
+    Returns:
+        A string usable inside a Docker volume name.
+    """
+    name = image_name.split("@", 1)[0]
+    # Strip the tag, but not a registry port ("host:5000/image")
+    if ":" in name.rsplit("/", 1)[-1]:
+        name = name.rsplit(":", 1)[0]
+    return re.sub(r"[^a-zA-Z0-9_.-]+", "-", name).strip("-.") or "default"
+
+
+class CacheVolumeManager:
+    """
+    Creates, mounts, measures and prunes package-manager cache volumes.
+
+    Docker does not track when a volume was last used, so last-use times are
+    kept in a small JSON index next to the user's NovaSystem log.
+    """
+
+    def __init__(self, client, family: str = "default",
+                 managers: Optional[List[str]] = None,
+                 index_path: Optional[str] = None,
+                 max_bytes: Optional[int] = None):
+        """
+        Initialize the CacheVolumeManager.
+
+        Args:
+            client: Docker client instance.
+            family: Image family the volumes belong to.
+            managers: Package managers to cache. If None, all known caches are used.
+            index_path: Path to the last-use index. If None, uses the default path.
+            max_bytes: Total size budget used by prune(). If None, read from
+                NOVASYSTEM_CACHE_MAX_SIZE or fall back to 10 GiB.
+        """
+        self.client = client
+        self.family = family
+        self.managers = managers or list(CACHE_MOUNTS)
+        self.index_path = index_path or os.environ.get(
+            "NOVASYSTEM_CACHE_INDEX",
+            os.path.expanduser("~/.novasystem/cache_volumes.json")
+        )
+        if max_bytes is None:
+            max_bytes = parse_size(os.environ.get("NOVASYSTEM_CACHE_MAX_SIZE", DEFAULT_MAX_CACHE_BYTES))
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        unknown = set(self.managers) - set(CACHE_MOUNTS)
+        if unknown:
+            raise ValueError(f"Unknown package caches: {', '.join(sorted(unknown))}")
+
+    def volume_name(self, manager: str) -> str:
+        """
+        Get the volume name for a package manager cache in this family.
+
+        Args:
+            manager: Package manager name (pip, npm, yarn, cargo, go).
+
+        Returns:
+            Docker volume name.
+        """
+        return f"novasystem-cache-{self.family}-{manager}"
+
+    def ensure_volumes(self) -> List[str]:
+        """
+        Create any missing cache volumes for this family.
+
+        Returns:
+            Names of the cache volumes.
+        """
+        from docker.errors import NotFound
+
+        names = []
+        for manager in self.managers:
+            name = self.volume_name(manager)
+            try:
+                self.client.volumes.get(name)
+            except NotFound:
+                logger.info(f"Creating cache volume {name}")
+                self.client.volumes.create(
+                    name=name,
+                    labels={CACHE_LABEL: "1", f"{CACHE_LABEL}.family": self.family,
+                            f"{CACHE_LABEL}.manager": manager}
+                )
+            names.append(name)
+        return names
+
+    def volume_bindings(self) -> Dict[str, Dict[str, str]]:
+        """
+        Get the volume specification for DockerClient.containers.run.
+
+        Creates missing volumes and records them as used now.
+
+        Returns:
+            Mapping of volume names to bind specifications.
+        """
+        names = self.ensure_volumes()
+        self._touch(names)
+        return {
+            self.volume_name(manager): {"bind": CACHE_MOUNTS[manager]["path"], "mode": "rw"}
+            for manager in self.managers
+        }
+
+    def environment(self) -> Dict[str, str]:
+        """
+        Get the environment variables pointing package managers at the cache mounts.
+
+        Returns:
+            Environment variables for the container.
+        """
+        env = {}
+        for manager in self.managers:
+            env.update(CACHE_MOUNTS[manager]["environment"])
+        return env
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Get size and usage information for all NovaSystem cache volumes.
+
+        Returns:
+            List of volume records ordered from least to most recently used.
+        """
+        from docker.errors import DockerException
+
+        index = self._load_index()
+        try:
+            df_volumes = self.client.df().get("Volumes") or []
+        except DockerException as e:
+            logger.error(f"Error reading Docker disk usage: {str(e)}")
+            df_volumes = []
+
+        records = []
+        for volume in df_volumes:
+            labels = volume.get("Labels") or {}
+            if labels.get(CACHE_LABEL) != "1":
+                continue
+            usage = volume.get("UsageData") or {}
+            records.append({
+                "name": volume["Name"],
+                "family": labels.get(f"{CACHE_LABEL}.family"),
+                "manager": labels.get(f"{CACHE_LABEL}.manager"),
+                "size": max(usage.get("Size", 0), 0),
+                "in_use": usage.get("RefCount", 0) > 0,
+                "last_used": index.get(volume["Name"]),
+            })
+
+        records.sort(key=lambda r: r["last_used"] or 0)
+        return records
+
+    def prune(self, max_bytes: Optional[int] = None, prune_all: bool = False) -> List[str]:
+        """
+        Remove least recently used cache volumes until the total size fits the budget.
+
+        Volumes mounted by a running container are never removed.
+
+        Args:
+            max_bytes: Size budget in bytes. If None, uses the manager's budget.
+            prune_all: Remove every unused cache volume regardless of size.
+
+        Returns:
+            Names of the removed volumes.
+        """
+        from docker.errors import DockerException
+
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        records = self.stats()
+        total = sum(r["size"] for r in records)
+
+        removed = []
+        for record in records:
+            if not prune_all and total <= budget:
+                break
+            if record["in_use"]:
+                continue
+            try:
+                self.client.volumes.get(record["name"]).remove()
+            except DockerException as e:
+                logger.warning(f"Failed to remove cache volume {record['name']}: {str(e)}")
+                continue
+            logger.info(f"Pruned cache volume {record['name']} ({record['size']} bytes)")
+            total -= record["size"]
+            removed.append(record["name"])
+
+        if removed:
+            with self._lock:
+                index = self._load_index()
+                for name in removed:
+                    index.pop(name, None)
+                self._save_index(index)
+
+        return removed
+
+    def _touch(self, names: List[str]) -> None:
+        """
+        Record the given volumes as used now.
+
+        Args:
+            names: Volume names.
+        """
+        with self._lock:
+            index = self._load_index()
+            now = time.time()
+            for name in names:
+                index[name] = now
+            self._save_index(index)
+
+    def _load_index(self) -> Dict[str, float]:
+        """
+        Load the last-use index.
+
+        Returns:
+            Mapping of volume names to last-use timestamps.
+        """
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable cache index {self.index_path}: {str(e)}")
+            return {}
+
+    def _save_index(self, index: Dict[str, float]) -> None:
+        """
+        Atomically write the last-use index.
+
+        Args:
+            index: Mapping of volume names to last-use timestamps.
+        """
+        try:
+            os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+            temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache index {self.index_path}: {str(e)}")
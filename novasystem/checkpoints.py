@@ -0,0 +1,182 @@
+"""
+Container Checkpoint module for NovaSystem.
+
+This module commits execution containers to images after each completed
+installation stage, so a failed run can be resumed from its last good stage
+instead of from the first command, and garbage-collects those images.
+Docker errors are imported where they are handled, so the CLI can read the
+defaults below without loading the docker package.
+"""
+
+import time
+import logging
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_REPOSITORY = "novasystem/checkpoint"
+CHECKPOINT_LABEL = "novasystem.checkpoint"
+
+# Stages worth checkpointing; later stages are cheap to repeat
+CHECKPOINT_STAGES = ("prepare", "install_deps", "build", "configure")
+
+DEFAULT_MAX_AGE_DAYS = 7
+DEFAULT_MAX_CHECKPOINT_BYTES = 20 * 1024 ** 3
+
+
+class CheckpointStore:
+    """
+    Creates, lists and garbage-collects checkpoint images.
+
+    Checkpoints are ordinary images in CHECKPOINT_REPOSITORY labelled with
+    CHECKPOINT_LABEL, so they can be found without the database.
+    """
+
+    def __init__(self, client, repository: str = CHECKPOINT_REPOSITORY):
+        """
+        Initialize the CheckpointStore.
+
+        Args:
+            client: Docker client.
+            repository: Image repository for checkpoint tags.
+        """
+        self.client = client
+        self.repository = repository
+
+    def commit(self, container, tag: str, labels: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """
+        Commit a running container to a checkpoint image.
+
+        Args:
+            container: Docker container to commit.
+            tag: Image tag, unique per checkpoint.
+            labels: Extra image labels.
+
+        Returns:
+            Image reference ("repository:tag"), or None if the commit failed.
+        """
+        from docker.errors import DockerException
+
+        start_time = time.time()
+        image_labels = {CHECKPOINT_LABEL: "1", **(labels or {})}
+        try:
+            container.commit(repository=self.repository, tag=tag, conf={"Labels": image_labels})
+        except DockerException as e:
+            logger.error(f"Failed to checkpoint container {container.id}: {str(e)}")
+            return None
+
+        image = f"{self.repository}:{tag}"
+        logger.info(f"Checkpointed container {container.id} as {image} in {time.time() - start_time:.2f}s")
+        return image
+
+    def exists(self, image: str) -> bool:
+        """
+        Check whether a checkpoint image still exists.
+
+        Args:
+            image: Image reference.
+
+        Returns:
+            True if the image exists.
+        """
+        from docker.errors import DockerException, ImageNotFound
+
+        try:
+            self.client.images.get(image)
+            return True
+        except ImageNotFound:
+            return False
+        except DockerException as e:
+            logger.error(f"Error checking checkpoint image {image}: {str(e)}")
+            return False
+
+    def remove(self, image: str) -> bool:
+        """
+        Remove a checkpoint image.
+
+        Args:
+            image: Image reference.
+
+        Returns:
+            True if the image was removed or did not exist.
+        """
+        from docker.errors import DockerException, ImageNotFound
+
+        try:
+            self.client.images.remove(image)
+            logger.info(f"Removed checkpoint image {image}")
+            return True
+        except ImageNotFound:
+            return True
+        except DockerException as e:
+            logger.warning(f"Failed to remove checkpoint image {image}: {str(e)}")
+            return False
+
+    def list(self) -> List[Dict[str, Any]]:
+        """
+        List checkpoint images with their size and age.
+
+        Size is the image's unique size (excluding layers shared with other
+        images), which is what removing it reclaims.
+
+        Returns:
+            List of image records ordered from oldest to newest.
+        """
+        from docker.errors import DockerException
+
+        try:
+            df_images = self.client.df().get("Images") or []
+        except DockerException as e:
+            logger.error(f"Error reading Docker disk usage: {str(e)}")
+            df_images = []
+
+        records = []
+        for image in df_images:
+            labels = image.get("Labels") or {}
+            if labels.get(CHECKPOINT_LABEL) != "1":
+                continue
+            tags = [t for t in image.get("RepoTags") or [] if t.startswith(f"{self.repository}:")]
+            if not tags:
+                continue
+            size = image.get("Size", 0)
+            shared = max(image.get("SharedSize", 0), 0)
+            records.append({
+                "image": tags[0],
+                "id": image.get("Id"),
+                "run_id": int(labels["novasystem.run_id"]) if labels.get("novasystem.run_id") else None,
+                "stage": labels.get("novasystem.stage"),
+                "size": max(size - shared, 0),
+                "created": image.get("Created", 0),
+            })
+
+        records.sort(key=lambda r: r["created"])
+        return records
+
+    def gc(self, max_age_days: Optional[float] = DEFAULT_MAX_AGE_DAYS,
+           max_bytes: Optional[int] = DEFAULT_MAX_CHECKPOINT_BYTES) -> List[str]:
+        """
+        Remove checkpoints older than max_age_days, then the oldest remaining
+        ones until the total size fits max_bytes.
+
+        Args:
+            max_age_days: Maximum checkpoint age. If None, age is not considered.
+            max_bytes: Total size budget. If None, size is not considered.
+
+        Returns:
+            References of the removed images.
+        """
+        records = self.list()
+        total = sum(r["size"] for r in records)
+        cutoff = time.time() - max_age_days * 24 * 60 * 60 if max_age_days is not None else None
+
+        removed = []
+        for record in records:
+            expired = cutoff is not None and record["created"] < cutoff
+            over_budget = max_bytes is not None and total > max_bytes
+            if not expired and not over_budget:
+                continue
+            if self.remove(record["image"]):
+                total -= record["size"]
+                removed.append(record["image"])
+
+        return removed
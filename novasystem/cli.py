@@ -14,6 +14,11 @@ import json
 from datetime import datetime
 
 from .nova import Nova
+from .cache import parse_size
+from .database import DEFAULT_DELETE_BATCH, DEFAULT_IMPORT_BATCH, run_cursor
+from .mirror import MirrorCache
+from .scheduler import PRIORITIES
+from .checkpoints import DEFAULT_MAX_AGE_DAYS, DEFAULT_MAX_CHECKPOINT_BYTES
 from .version import __version__
 
 # Configure logging
@@ -43,6 +48,10 @@ def configure_parser() -> argparse.ArgumentParser:
           novasystem install ./local/repo/path
           novasystem list-runs
           novasystem show-run 1
+          novasystem stats --by command
+          novasystem export --since 2024-01-01 | gzip > runs.jsonl.gz
+          novasystem import runs.jsonl.gz
+          novasystem cache stats
         """)
     )
 
@@ -62,15 +71,48 @@ def configure_parser() -> argparse.ArgumentParser:
                               help='Mount local directory when running in Docker')
     install_parser.add_argument('--no-detect', action='store_true',
                               help='Disable automatic repository type detection')
+    install_parser.add_argument('--backend', choices=['docker', 'local'], default='docker',
+                              help='Execution backend (default: docker)')
+    install_parser.add_argument('--priority', choices=list(PRIORITIES), default='normal',
+                              help='Scheduling priority; batch runs yield to others (default: normal)')
+    install_parser.add_argument('--workspace', choices=['bind', 'archive'], default='bind',
+                              help='Bind-mount the repository read-only, or stream a writable '
+                                   'copy into the container (default: bind)')
+    install_parser.add_argument('--mirror', action='store_true',
+                              help='Fetch into a persistent local mirror and check out a worktree '
+                                   'instead of cloning from scratch')
     install_parser.add_argument('--output', '-o', choices=['text', 'json'], default='text',
                               help='Output format (default: text)')
 
+    # Plan command
+    plan_parser = subparsers.add_parser('plan', help='Show the installation plan without executing it')
+    plan_parser.add_argument('repository', help='URL or path to the repository, or a tarball')
+    plan_parser.add_argument('--ref', default='HEAD',
+                           help='Branch, tag or commit for GitHub repositories (default: HEAD)')
+    plan_parser.add_argument('--output', '-o', choices=['text', 'json'], default='text',
+                           help='Output format (default: text)')
+
+    # Resume run command
+    resume_parser = subparsers.add_parser('resume', help='Resume a failed run from its last checkpoint')
+    resume_parser.add_argument('run_id', type=int, help='ID of the run to resume')
+    resume_parser.add_argument('--backend', choices=['docker', 'local'], default='docker',
+                             help='Execution backend (default: docker)')
+    resume_parser.add_argument('--workspace', choices=['bind', 'archive'], default='bind',
+                             help='Workspace mode used by the original run (default: bind)')
+    resume_parser.add_argument('--mirror', action='store_true',
+                             help='Check the repository out from the persistent local mirror')
+    resume_parser.add_argument('--output', '-o', choices=['text', 'json'], default='text',
+                             help='Output format (default: text)')
+
     # List runs command
     list_parser = subparsers.add_parser('list-runs', help='List previous runs')
     list_parser.add_argument('--limit', '-l', type=int, default=10,
                            help='Maximum number of runs to list (default: 10)')
     list_parser.add_argument('--offset', type=int, default=0,
                            help='Number of runs to skip (default: 0)')
+    list_parser.add_argument('--after', metavar='CURSOR',
+                           help='List runs after this cursor ("<start_time>/<id>" of the last run '
+                                'seen, printed after each page)')
     list_parser.add_argument('--status', choices=['started', 'completed', 'error'],
                            help='Filter by status')
     list_parser.add_argument('--output', '-o', choices=['text', 'json'], default='text',
@@ -82,6 +124,37 @@ def configure_parser() -> argparse.ArgumentParser:
     show_parser.add_argument('--output', '-o', choices=['text', 'json'], default='text',
                            help='Output format (default: text)')
 
+    # Resource usage report command
+    resources_parser = subparsers.add_parser('resources', help='Report command resource usage across runs')
+    resources_parser.add_argument('--by', choices=['command', 'repository_type'], default='command',
+                                help='Group usage by command or repository type (default: command)')
+    resources_parser.add_argument('--sort', choices=['memory', 'cpu', 'disk', 'network'], default='memory',
+                                help='Sort by peak memory, CPU time, disk or network I/O (default: memory)')
+    resources_parser.add_argument('--limit', '-l', type=int, default=20,
+                                help='Maximum number of rows to show (default: 20)')
+    resources_parser.add_argument('--output', '-o', choices=['text', 'json'], default='text',
+                                help='Output format (default: text)')
+
+    # Statistics command
+    stats_parser = subparsers.add_parser('stats', help='Show success rates and execution times across runs')
+    stats_parser.add_argument('--by', choices=['repository_type', 'command', 'day'], default='repository_type',
+                            help='Summarize by repository type (most failures first), command '
+                                 '(slowest first) or day (most recent first) (default: repository_type)')
+    stats_parser.add_argument('--limit', '-l', type=int, default=20,
+                            help='Maximum number of rows to show (default: 20)')
+    stats_parser.add_argument('--output', '-o', choices=['text', 'json'], default='text',
+                            help='Output format (default: text)')
+
+    # Search command
+    search_parser = subparsers.add_parser('search', help='Search commands, errors and documentation of previous runs')
+    search_parser.add_argument('query', help='Full-text query, e.g. \'"fatal error" gcc\'')
+    search_parser.add_argument('--type', choices=['all', 'commands', 'documentation'], default='all',
+                             help='What to search (default: all)')
+    search_parser.add_argument('--limit', '-l', type=int, default=20,
+                             help='Maximum number of matches to show (default: 20)')
+    search_parser.add_argument('--output', '-o', choices=['text', 'json'], default='text',
+                             help='Output format (default: text)')
+
     # Delete run command
     delete_parser = subparsers.add_parser('delete-run', help='Delete a run')
     delete_parser.add_argument('run_id', type=int, help='ID of the run to delete')
@@ -90,9 +163,105 @@ def configure_parser() -> argparse.ArgumentParser:
     cleanup_parser = subparsers.add_parser('cleanup', help='Delete old runs')
     cleanup_parser.add_argument('--days', '-d', type=int, default=30,
                              help='Delete runs older than this many days (default: 30)')
+    cleanup_parser.add_argument('--archive', metavar='PATH',
+                             help='Export the runs to a new archive before deleting them; the format '
+                                  'follows the suffix: .jsonl, .jsonl.gz or .jsonl.zst')
+    cleanup_parser.add_argument('--batch-size', type=int, default=DEFAULT_DELETE_BATCH,
+                             help=f'Runs deleted per transaction (default: {DEFAULT_DELETE_BATCH})')
+    cleanup_parser.add_argument('--no-vacuum', action='store_true',
+                             help='Keep freed space in the database file for reuse')
+    cleanup_parser.add_argument('--compact', action='store_true',
+                             help='Rebuild the database file instead of vacuuming incrementally; blocks '
+                                  'other writers, and only needed once for databases from older versions')
+
+    # Export run history command
+    export_parser = subparsers.add_parser('export', help='Export run history as JSON Lines')
+    export_parser.add_argument('--since', type=_parse_since,
+                             help='Only export runs started at or after this ISO 8601 date or time')
+    export_parser.add_argument('--file', '-f', metavar='PATH',
+                             help='Create this archive instead of writing to stdout; the format '
+                                  'follows the suffix: .jsonl, .jsonl.gz, .jsonl.zst or .parquet')
+    export_parser.add_argument('--format',
+                             help='Archive format: jsonl, jsonl.gz, jsonl.zst or parquet '
+                                  '(default: from the file suffix, or jsonl on stdout)')
+
+    # Import run history command
+    import_parser = subparsers.add_parser('import', help='Import run history from an export or cleanup archive')
+    import_parser.add_argument('archive', help="Archive to import, or '-' for stdin; compression is detected")
+    import_parser.add_argument('--batch-size', type=int, default=DEFAULT_IMPORT_BATCH,
+                             help=f'Runs inserted per transaction (default: {DEFAULT_IMPORT_BATCH})')
+    import_parser.add_argument('--allow-duplicates', action='store_true',
+                             help='Import runs even if a run with the same repository and start time exists')
+
+    # Package cache volumes command
+    cache_parser = subparsers.add_parser('cache', help='Inspect or prune package cache volumes')
+    cache_parser.add_argument('action', choices=['stats', 'prune'], help='Cache action to perform')
+    cache_parser.add_argument('--max-size', type=parse_size,
+                            help='Prune least recently used volumes down to this size (e.g. 5g)')
+    cache_parser.add_argument('--all', action='store_true', dest='prune_all',
+                            help='Prune every cache volume not in use')
+    cache_parser.add_argument('--output', '-o', choices=['text', 'json'], default='text',
+                            help='Output format (default: text)')
+
+    # Checkpoint images command
+    checkpoints_parser = subparsers.add_parser('checkpoints', help='List or garbage-collect checkpoint images')
+    checkpoints_parser.add_argument('action', choices=['list', 'gc'], help='Checkpoint action to perform')
+    checkpoints_parser.add_argument('--max-age-days', type=float, default=DEFAULT_MAX_AGE_DAYS,
+                                  help=f'Remove checkpoints older than this (default: {DEFAULT_MAX_AGE_DAYS})')
+    checkpoints_parser.add_argument('--max-size', type=parse_size, default=DEFAULT_MAX_CHECKPOINT_BYTES,
+                                  help='Remove the oldest checkpoints until the total fits this size (default: 20g)')
+    checkpoints_parser.add_argument('--output', '-o', choices=['text', 'json'], default='text',
+                                  help='Output format (default: text)')
 
     return parser
 
+def _print_install_result(result: Dict[str, Any], output: str) -> None:
+    """
+    Print the result of an install or resume.
+
+    Args:
+        result: Result dictionary returned by Nova.
+        output: Output format ("text" or "json").
+    """
+    if output == 'json':
+        print(json.dumps(result, indent=2))
+    else:
+        print("\n=== NovaSystem Installation Results ===")
+        print(f"Repository: {result['repository']}")
+        print(f"Status: {'Success' if result['success'] else 'Failed'}")
+        print(f"Message: {result['message']}")
+        print(f"Run ID: {result['run_id']}")
+
+        if result.get('resumed_from'):
+            print(f"Resumed At Command: {result['resumed_from'] + 1}")
+
+        if 'commands_executed' in result:
+            print(f"Commands Executed: {result['commands_executed']}")
+            print(f"Commands Successful: {result['commands_successful']}")
+
+        if 'execution_time' in result:
+            print(f"Execution Time: {result['execution_time']:.2f} seconds")
+
+        if 'results' in result and result['results']:
+            print("\nCommand Execution Details:")
+            for i, cmd_result in enumerate(result['results'], 1):
+                print(f"\n{i}. Command: {cmd_result['command']}")
+                print(f"   Status: {'Success' if cmd_result['successful'] else 'Failed'}")
+                print(f"   Exit Code: {cmd_result['exit_code']}")
+                print(f"   Execution Time: {cmd_result['execution_time']:.2f} seconds")
+
+                if cmd_result['output']:
+                    output_lines = cmd_result['output'].splitlines()
+                    print(f"   Output: {output_lines[0]}")
+                    if len(output_lines) > 1:
+                        print(f"           (+ {len(output_lines)-1} more lines)")
+
+                if cmd_result['error']:
+                    error_lines = cmd_result['error'].splitlines()
+                    print(f"   Error: {error_lines[0]}")
+                    if len(error_lines) > 1:
+                        print(f"          (+ {len(error_lines)-1} more lines)")
+
 def install_repository(args: argparse.Namespace) -> int:
     """
     Handle the install command.
@@ -111,7 +280,12 @@ def install_repository(args: argparse.Namespace) -> int:
         logger.info(f"Installing repository: {args.repository}")
 
         # Initialize Nova
-        nova = Nova()
+        nova = Nova(
+            backend=args.backend,
+            priority=PRIORITIES[args.priority],
+            workspace_mode=args.workspace,
+            mirror_cache=MirrorCache() if args.mirror else None
+        )
 
         # Process repository
         result = nova.process_repository(
@@ -120,46 +294,90 @@ def install_repository(args: argparse.Namespace) -> int:
             detect_type=not args.no_detect
         )
 
-        # Output result
+        _print_install_result(result, args.output)
+        return 0 if result['success'] else 1
+
+    except Exception as e:
+        logger.exception(f"Error installing repository: {str(e)}")
+        print(f"Error: {str(e)}")
+        return 1
+
+def plan_repository(args: argparse.Namespace) -> int:
+    """
+    Handle the plan command.
+
+    Args:
+        args: Command-line arguments.
+
+    Returns:
+        Exit code.
+    """
+    try:
+        # Configure logging level
+        if args.verbose:
+            logging.getLogger().setLevel(logging.DEBUG)
+
+        logger.info(f"Planning repository: {args.repository}")
+
+        # Nothing is executed, so no container backend is needed
+        nova = Nova(backend='local')
+        result = nova.plan_repository(args.repository, ref=args.ref)
+
         if args.output == 'json':
             print(json.dumps(result, indent=2))
+        elif not result['success']:
+            print(f"Error: {result['message']}")
         else:
-            print("\n=== NovaSystem Installation Results ===")
             print(f"Repository: {result['repository']}")
-            print(f"Status: {'Success' if result['success'] else 'Failed'}")
-            print(f"Message: {result['message']}")
-            print(f"Run ID: {result['run_id']}")
+            if result['repository_type']:
+                print(f"Type: {result['repository_type']}")
+            fetch = result['fetch']
+            if fetch.get('snapshot'):
+                print(f"Snapshot: extracted {fetch['extracted']} of {fetch['members']} files "
+                      f"({_format_bytes(fetch['bytes_extracted'])} of "
+                      f"{_format_bytes(fetch['bytes_streamed'])})")
+            print(f"\nPlan ({len(result['plan'])} commands):")
+            for i, entry in enumerate(result['plan']):
+                print(f"  {i+1}. [{entry['stage']}] {entry['text']}")
 
-            if 'commands_executed' in result:
-                print(f"Commands Executed: {result['commands_executed']}")
-                print(f"Commands Successful: {result['commands_successful']}")
+        return 0 if result['success'] else 1
 
-            print(f"Execution Time: {result['execution_time']:.2f} seconds")
+    except Exception as e:
+        logger.exception(f"Error planning repository: {str(e)}")
+        print(f"Error: {str(e)}")
+        return 1
 
-            if 'results' in result and result['results']:
-                print("\nCommand Execution Details:")
-                for i, cmd_result in enumerate(result['results'], 1):
-                    print(f"\n{i}. Command: {cmd_result['command']}")
-                    print(f"   Status: {'Success' if cmd_result['successful'] else 'Failed'}")
-                    print(f"   Exit Code: {cmd_result['exit_code']}")
-                    print(f"   Execution Time: {cmd_result['execution_time']:.2f} seconds")
-
-                    if cmd_result['output']:
-                        output_lines = cmd_result['output'].splitlines()
-                        print(f"   Output: {output_lines[0]}")
-                        if len(output_lines) > 1:
-                            print(f"           (+ {len(output_lines)-1} more lines)")
-
-                    if cmd_result['error']:
-                        error_lines = cmd_result['error'].splitlines()
-                        print(f"   Error: {error_lines[0]}")
-                        if len(error_lines) > 1:
-                            print(f"          (+ {len(error_lines)-1} more lines)")
+def resume_run(args: argparse.Namespace) -> int:
+    """
+    Handle the resume command.
+
+    Args:
+        args: Command-line arguments.
+
+    Returns:
+        Exit code.
+    """
+    try:
+        # Configure logging level
+        if args.verbose:
+            logging.getLogger().setLevel(logging.DEBUG)
+
+        logger.info(f"Resuming run {args.run_id}")
+
+        # Initialize Nova
+        nova = Nova(
+            backend=args.backend,
+            workspace_mode=args.workspace,
+            mirror_cache=MirrorCache() if args.mirror else None
+        )
+
+        result = nova.resume_run(args.run_id)
+        _print_install_result(result, args.output)
 
         return 0 if result['success'] else 1
 
     except Exception as e:
-        logger.exception(f"Error installing repository: {str(e)}")
+        logger.exception(f"Error resuming run: {str(e)}")
         print(f"Error: {str(e)}")
         return 1
 
@@ -187,7 +405,8 @@ def list_runs(args: argparse.Namespace) -> int:
         runs = nova.list_runs(
             limit=args.limit,
             offset=args.offset,
-            status=args.status
+            status=args.status,
+            after=args.after
         )
 
         # Output result
@@ -215,6 +434,9 @@ def list_runs(args: argparse.Namespace) -> int:
 
                     print(f"{run['id']:<4} | {repo:<30} | {run['status']:<9} | {success:<7} | {date}")
 
+                if len(runs) == args.limit:
+                    print(f"\nNext page: --after {run_cursor(runs[-1])}")
+
         return 0
 
     except Exception as e:
@@ -296,6 +518,12 @@ def show_run(args: argparse.Namespace) -> int:
                     if cmd.get('execution_time') is not None:
                         print(f"   Execution Time: {cmd['execution_time']:.2f} seconds")
 
+                    if cmd.get('timeout') is not None:
+                        print(f"   Timeout: {cmd['timeout']:.0f} seconds ({cmd.get('timeout_source') or 'unknown'})")
+
+                    if cmd.get('peak_memory_bytes') is not None or cmd.get('cpu_seconds') is not None:
+                        print(f"   Resources: {_format_resources(cmd)}")
+
                     print(f"   Timestamp: {timestamp}")
 
                     if cmd.get('output'):
@@ -325,6 +553,177 @@ def show_run(args: argparse.Namespace) -> int:
         print(f"Error: {str(e)}")
         return 1
 
+def _format_resources(usage: Dict[str, Any]) -> str:
+    """
+    Format a command's resource usage for display.
+
+    Args:
+        usage: Dictionary with resource usage columns.
+
+    Returns:
+        One-line summary.
+    """
+    def size(key: str) -> str:
+        return _format_bytes(usage[key]) if usage.get(key) is not None else '-'
+
+    cpu = f"{usage['cpu_seconds']:.2f}s" if usage.get('cpu_seconds') is not None else '-'
+    return (f"peak mem {size('peak_memory_bytes')}, cpu {cpu}, "
+            f"disk r/w {size('block_read_bytes')}/{size('block_write_bytes')}, "
+            f"net rx/tx {size('net_rx_bytes')}/{size('net_tx_bytes')}")
+
+def resource_report(args: argparse.Namespace) -> int:
+    """
+    Handle the resources command.
+
+    Args:
+        args: Command-line arguments.
+
+    Returns:
+        Exit code.
+    """
+    try:
+        # Configure logging level
+        if args.verbose:
+            logging.getLogger().setLevel(logging.DEBUG)
+
+        order_by = {
+            'memory': 'peak_memory_bytes',
+            'cpu': 'cpu_seconds',
+            'disk': 'block_write_bytes',
+            'network': 'net_rx_bytes',
+        }[args.sort]
+
+        logger.info(f"Reporting resource usage by {args.by}")
+
+        # Initialize Nova
+        nova = Nova()
+
+        rows = nova.get_resource_report(group_by=args.by, order_by=order_by, limit=args.limit)
+
+        # Output result
+        if args.output == 'json':
+            print(json.dumps(rows, indent=2))
+        else:
+            print("\n=== NovaSystem Resource Usage ===")
+            print(f"Found {len(rows)} groups with telemetry")
+
+            if rows:
+                print("\nName                           | Runs  | Max Mem    | Avg CPU  | Max Disk W | Max Net RX")
+                print("-"*95)
+
+                for row in rows:
+                    name = row['name'] or '(unknown)'
+                    if len(name) > 30:
+                        name = name[:27] + '...'
+                    max_mem = _format_bytes(row['max_peak_memory_bytes']) if row['max_peak_memory_bytes'] is not None else '-'
+                    avg_cpu = f"{row['avg_cpu_seconds']:.2f}s" if row['avg_cpu_seconds'] is not None else '-'
+                    max_disk = _format_bytes(row['max_block_write_bytes']) if row['max_block_write_bytes'] is not None else '-'
+                    max_net = _format_bytes(row['max_net_rx_bytes']) if row['max_net_rx_bytes'] is not None else '-'
+                    print(f"{name:<30} | {row['count']:<5} | {max_mem:<10} | {avg_cpu:<8} | {max_disk:<10} | {max_net}")
+
+        return 0
+
+    except Exception as e:
+        logger.exception(f"Error reporting resource usage: {str(e)}")
+        print(f"Error: {str(e)}")
+        return 1
+
+def run_stats(args: argparse.Namespace) -> int:
+    """
+    Handle the stats command.
+
+    Args:
+        args: Command-line arguments.
+
+    Returns:
+        Exit code.
+    """
+    try:
+        # Configure logging level
+        if args.verbose:
+            logging.getLogger().setLevel(logging.DEBUG)
+
+        logger.info(f"Reporting run statistics by {args.by}")
+
+        # Initialize Nova
+        nova = Nova()
+
+        rows = nova.get_stats(group_by=args.by, limit=args.limit)
+
+        # Output result
+        if args.output == 'json':
+            print(json.dumps(rows, indent=2))
+        else:
+            title = {'repository_type': 'Repository Type', 'command': 'Command', 'day': 'Day'}[args.by]
+            count_key = 'executions' if args.by == 'command' else 'runs'
+            print(f"\n=== NovaSystem Statistics by {title} ===")
+
+            if rows:
+                print(f"\n{title:<40} | {count_key.capitalize():<10} | Failed | Success | Avg Time")
+                print("-"*85)
+
+                for row in rows:
+                    name = row['name']
+                    if len(name) > 40:
+                        name = name[:37] + '...'
+                    print(f"{name:<40} | {row[count_key]:<10} | {row['failures']:<6} | "
+                          f"{row['success_rate'] * 100:>6.1f}% | {row['avg_seconds']:.2f}s")
+            else:
+                print("No finished runs recorded")
+
+        return 0
+
+    except Exception as e:
+        logger.exception(f"Error reporting run statistics: {str(e)}")
+        print(f"Error: {str(e)}")
+        return 1
+
+def search_runs(args: argparse.Namespace) -> int:
+    """
+    Handle the search command.
+
+    Args:
+        args: Command-line arguments.
+
+    Returns:
+        Exit code.
+    """
+    try:
+        # Configure logging level
+        if args.verbose:
+            logging.getLogger().setLevel(logging.DEBUG)
+
+        logger.info(f"Searching run history: {args.query}")
+
+        # Initialize Nova
+        nova = Nova()
+
+        matches = nova.search(args.query, kind=args.type, limit=args.limit)
+
+        # Output result
+        if args.output == 'json':
+            print(json.dumps(matches, indent=2))
+        else:
+            print(f"\n=== NovaSystem Search: {args.query} ===")
+            print(f"Found {len(matches)} matches")
+
+            for match in matches:
+                snippet = " ".join(match['snippet'].split())
+                if match['type'] == 'command':
+                    print(f"\nRun {match['run_id']} | command {match['id']} | {match['status']} "
+                          f"(exit {match['exit_code']})")
+                    print(f"  $ {match['command']}")
+                else:
+                    print(f"\nRun {match['run_id']} | {match['file_path']}")
+                print(f"  {snippet}")
+
+        return 0
+
+    except Exception as e:
+        logger.exception(f"Error searching run history: {str(e)}")
+        print(f"Error: {str(e)}")
+        return 1
+
 def delete_run(args: argparse.Namespace) -> int:
     """
     Handle the delete-run command.
@@ -381,9 +780,14 @@ def cleanup_runs(args: argparse.Namespace) -> int:
         nova = Nova()
 
         # Cleanup runs
-        count = nova.cleanup_old_runs(args.days)
+        count = nova.cleanup_old_runs(args.days, archive_path=args.archive, batch_size=args.batch_size)
 
         print(f"Deleted {count} runs older than {args.days} days.")
+        if args.archive:
+            print(f"Archived to {args.archive}")
+        if not args.no_vacuum:
+            released = nova.vacuum_database(compact=args.compact)
+            print(f"Released {_format_bytes(released)} of disk space.")
         return 0
 
     except Exception as e:
@@ -391,6 +795,223 @@ def cleanup_runs(args: argparse.Namespace) -> int:
         print(f"Error: {str(e)}")
         return 1
 
+def _parse_since(value: str) -> str:
+    """
+    Validate an ISO 8601 date or time given on the command line.
+
+    Args:
+        value: Date or time, e.g. "2024-01-01" or "2024-01-01T12:00:00".
+
+    Returns:
+        The value in the format run start times are stored in.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not an ISO 8601 date or time.
+    """
+    try:
+        return datetime.fromisoformat(value).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid ISO 8601 date or time: {value}")
+
+def export_runs(args: argparse.Namespace) -> int:
+    """
+    Handle the export command.
+
+    Args:
+        args: Command-line arguments.
+
+    Returns:
+        Exit code.
+    """
+    try:
+        # Configure logging level
+        if args.verbose:
+            logging.getLogger().setLevel(logging.DEBUG)
+
+        # Initialize Nova
+        nova = Nova()
+
+        if args.file:
+            count = nova.export_runs(args.file, since=args.since, format=args.format)
+        else:
+            count = nova.export_runs(since=args.since, format=args.format, fileobj=sys.stdout.buffer)
+
+        # Records may be going to stdout, so report on stderr
+        print(f"Exported {count} runs to {args.file or 'stdout'}.", file=sys.stderr)
+        return 0
+
+    except Exception as e:
+        logger.exception(f"Error exporting runs: {str(e)}")
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+
+def import_runs(args: argparse.Namespace) -> int:
+    """
+    Handle the import command.
+
+    Args:
+        args: Command-line arguments.
+
+    Returns:
+        Exit code.
+    """
+    try:
+        # Configure logging level
+        if args.verbose:
+            logging.getLogger().setLevel(logging.DEBUG)
+
+        # Initialize Nova
+        nova = Nova()
+
+        skip_existing = not args.allow_duplicates
+        if args.archive == '-':
+            counts = nova.import_runs(fileobj=sys.stdin.buffer, batch_size=args.batch_size,
+                                      skip_existing=skip_existing)
+        else:
+            counts = nova.import_runs(args.archive, batch_size=args.batch_size, skip_existing=skip_existing)
+
+        print(f"Imported {counts['runs']} runs ({counts['commands']} commands, "
+              f"{counts['documentation']} documents).")
+        if counts['skipped']:
+            print(f"Skipped {counts['skipped']} runs already present.")
+        return 0
+
+    except Exception as e:
+        logger.exception(f"Error importing runs: {str(e)}")
+        print(f"Error: {str(e)}")
+        return 1
+
+def _format_bytes(size: int) -> str:
+    """
+    Format a byte count for display.
+
+    Args:
+        size: Size in bytes.
+
+    Returns:
+        Human-readable size.
+    """
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != 'B' else f"{size} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+def cache_volumes(args: argparse.Namespace) -> int:
+    """
+    Handle the cache command.
+
+    Args:
+        args: Command-line arguments.
+
+    Returns:
+        Exit code.
+    """
+    try:
+        # Configure logging level
+        if args.verbose:
+            logging.getLogger().setLevel(logging.DEBUG)
+
+        from .docker import DockerExecutor
+        executor = DockerExecutor(image_name="novasystem/runner:latest")
+        cache_manager = executor.cache_manager
+
+        if args.action == 'prune':
+            logger.info("Pruning package cache volumes")
+            removed = cache_manager.prune(max_bytes=args.max_size, prune_all=args.prune_all)
+
+            if args.output == 'json':
+                print(json.dumps({"removed": removed}, indent=2))
+            else:
+                print(f"Removed {len(removed)} cache volumes.")
+                for name in removed:
+                    print(f"  {name}")
+            return 0
+
+        logger.info("Listing package cache volumes")
+        records = cache_manager.stats()
+
+        if args.output == 'json':
+            print(json.dumps(records, indent=2))
+        else:
+            total = sum(r['size'] for r in records)
+            print("\n=== NovaSystem Package Caches ===")
+            print(f"Found {len(records)} volumes, {_format_bytes(total)} total "
+                  f"(budget {_format_bytes(cache_manager.max_bytes)})")
+
+            if records:
+                print("\nVolume                                   | Size       | In Use | Last Used")
+                print("-"*80)
+
+                for record in records:
+                    last_used = (datetime.fromtimestamp(record['last_used']).strftime('%Y-%m-%d %H:%M')
+                                 if record['last_used'] else '-')
+                    in_use = 'Yes' if record['in_use'] else 'No'
+                    print(f"{record['name']:<40} | {_format_bytes(record['size']):<10} | {in_use:<6} | {last_used}")
+
+        return 0
+
+    except Exception as e:
+        logger.exception(f"Error managing cache volumes: {str(e)}")
+        print(f"Error: {str(e)}")
+        return 1
+
+def checkpoint_images(args: argparse.Namespace) -> int:
+    """
+    Handle the checkpoints command.
+
+    Args:
+        args: Command-line arguments.
+
+    Returns:
+        Exit code.
+    """
+    try:
+        # Configure logging level
+        if args.verbose:
+            logging.getLogger().setLevel(logging.DEBUG)
+
+        nova = Nova()
+
+        if args.action == 'gc':
+            logger.info("Garbage-collecting checkpoint images")
+            removed = nova.gc_checkpoints(max_age_days=args.max_age_days, max_bytes=args.max_size)
+
+            if args.output == 'json':
+                print(json.dumps({"removed": removed}, indent=2))
+            else:
+                print(f"Removed {len(removed)} checkpoint images.")
+                for image in removed:
+                    print(f"  {image}")
+            return 0
+
+        logger.info("Listing checkpoint images")
+        records = nova.executor.checkpoint_store.list()
+
+        if args.output == 'json':
+            print(json.dumps(records, indent=2))
+        else:
+            total = sum(r['size'] for r in records)
+            print("\n=== NovaSystem Checkpoints ===")
+            print(f"Found {len(records)} checkpoint images, {_format_bytes(total)} total")
+
+            if records:
+                print("\nImage                                    | Run    | Stage        | Size       | Created")
+                print("-"*90)
+
+                for record in records:
+                    created = datetime.fromtimestamp(record['created']).strftime('%Y-%m-%d %H:%M')
+                    run = record['run_id'] if record['run_id'] is not None else '-'
+                    print(f"{record['image']:<40} | {run:<6} | {record['stage'] or '-':<12} | "
+                          f"{_format_bytes(record['size']):<10} | {created}")
+
+        return 0
+
+    except Exception as e:
+        logger.exception(f"Error managing checkpoints: {str(e)}")
+        print(f"Error: {str(e)}")
+        return 1
+
 def main(args: Optional[List[str]] = None) -> int:
     """
     Main entry point for the CLI.
@@ -411,14 +1032,32 @@ def main(args: Optional[List[str]] = None) -> int:
     # Execute the appropriate command handler
     if parsed_args.command == 'install':
         return install_repository(parsed_args)
+    elif parsed_args.command == 'plan':
+        return plan_repository(parsed_args)
+    elif parsed_args.command == 'resume':
+        return resume_run(parsed_args)
     elif parsed_args.command == 'list-runs':
         return list_runs(parsed_args)
     elif parsed_args.command == 'show-run':
         return show_run(parsed_args)
+    elif parsed_args.command == 'resources':
+        return resource_report(parsed_args)
+    elif parsed_args.command == 'stats':
+        return run_stats(parsed_args)
+    elif parsed_args.command == 'search':
+        return search_runs(parsed_args)
     elif parsed_args.command == 'delete-run':
         return delete_run(parsed_args)
     elif parsed_args.command == 'cleanup':
         return cleanup_runs(parsed_args)
+    elif parsed_args.command == 'export':
+        return export_runs(parsed_args)
+    elif parsed_args.command == 'import':
+        return import_runs(parsed_args)
+    elif parsed_args.command == 'cache':
+        return cache_volumes(parsed_args)
+    elif parsed_args.command == 'checkpoints':
+        return checkpoint_images(parsed_args)
     else:
         parser.print_help()
         return 0
@@ -5,29 +5,680 @@ This module provides functionality for storing and retrieving repository run dat
 """
 
 import os
+import time
+import zlib
+import hashlib
 import logging
 import sqlite3
 import json
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple, Union
+from typing import List, Dict, Any, Optional, Tuple, Union, Iterable, Iterator, Callable, TypeVar, TYPE_CHECKING
 from pathlib import Path
 
+from .timeouts import normalize_command
+
+if TYPE_CHECKING:
+    from .archive import RunArchiveWriter
+
 logger = logging.getLogger(__name__)
 
+# Per-command resource telemetry columns and their SQL types
+RESOURCE_COLUMNS = {
+    "peak_memory_bytes": "INTEGER",
+    "cpu_seconds": "REAL",
+    "block_read_bytes": "INTEGER",
+    "block_write_bytes": "INTEGER",
+    "net_rx_bytes": "INTEGER",
+    "net_tx_bytes": "INTEGER",
+}
+
+# Adaptive timeout columns and their SQL types
+TIMEOUT_COLUMNS = {
+    "normalized_command": "TEXT",
+    "timeout": "REAL",
+    "timeout_source": "TEXT",
+}
+
+# Command statuses whose execution time is a usable timeout sample
+FINISHED_STATUSES = ("success", "failed", "timeout", "completed")
+
+# Group commit: buffered writes are committed after this many writes or this many seconds
+DEFAULT_COMMIT_BATCH = 100
+DEFAULT_COMMIT_INTERVAL = 0.05
+
+# Documentation blobs smaller than this are stored uncompressed
+MIN_COMPRESS_BYTES = 256
+
+# Rows fetched per round trip by the streaming iterators
+DEFAULT_FETCH_SIZE = 500
+
+# Runs read per query when exporting, and inserted per transaction when importing
+DEFAULT_EXPORT_BATCH = 100
+DEFAULT_IMPORT_BATCH = 1000
+
+# Command columns carried by exported run records, besides id and run_id
+EXPORT_COMMAND_COLUMNS = ("command", "exit_code", "output", "error", "execution_time", "status",
+                          "timestamp", "command_type", "priority", *TIMEOUT_COLUMNS, *RESOURCE_COLUMNS)
+
+# Full-text search result kinds
+SEARCH_KINDS = ("all", "commands", "documentation")
+
+# Separates start time and ID in a run cursor
+CURSOR_SEPARATOR = "/"
+
+# Retention deletes this many runs per transaction, pausing between
+# batches so other writers get the lock
+DEFAULT_DELETE_BATCH = 100
+RETENTION_PAUSE = 0.01
+
+# Free pages returned to the file system per incremental vacuum step
+VACUUM_STEP_PAGES = 1024
+
+# Time a connection waits on a locked database, and retries of what still fails as busy
+DEFAULT_BUSY_TIMEOUT = 5.0
+BUSY_RETRIES = 5
+BUSY_RETRY_DELAY = 0.05
+
+T = TypeVar("T")
+
+
+def is_busy_error(error: sqlite3.Error) -> bool:
+    """
+    Check whether an error means another connection holds a conflicting lock.
+
+    Args:
+        error: SQLite error.
+
+    Returns:
+        True for SQLITE_BUSY and SQLITE_LOCKED errors.
+    """
+    code = getattr(error, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    return isinstance(error, sqlite3.OperationalError) and "locked" in str(error)
+
+
+def retry_busy(operation: Callable[[], T], retries: int = BUSY_RETRIES,
+               delay: float = BUSY_RETRY_DELAY) -> T:
+    """
+    Run an operation, retrying with backoff while the database is busy.
+
+    busy_timeout already makes most statements wait for locks; this covers
+    the cases where SQLite returns SQLITE_BUSY immediately to avoid a deadlock.
+
+    Args:
+        operation: Callable to run.
+        retries: Maximum retries.
+        delay: Initial delay between retries (in seconds), doubled each time.
+
+    Returns:
+        The operation's result.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return operation()
+        except sqlite3.OperationalError as e:
+            if attempt == retries or not is_busy_error(e):
+                raise
+            logger.debug(f"Database busy, retrying in {delay:.2f}s: {str(e)}")
+            time.sleep(delay)
+            delay *= 2
+
+
+class ConnectionPool:
+    """
+    SQLite connections for concurrent use: one shared writer, serialized by
+    a lock, and one read connection per thread.
+
+    In WAL mode readers see the last committed state and never block the
+    writer, so threads can read while a run is logging.
+    """
+
+    def __init__(self, db_path: str, busy_timeout: float = DEFAULT_BUSY_TIMEOUT,
+                 write_lock: Optional[threading.RLock] = None):
+        """
+        Initialize the ConnectionPool.
+
+        Args:
+            db_path: Path to the SQLite database file.
+            busy_timeout: Time a statement waits on a locked database (in seconds).
+            write_lock: Lock serializing use of the writer. If None, one is created.
+        """
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self.write_lock = write_lock or threading.RLock()
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+
+        self.writer = self._open()
+        # Lets retention return freed pages with incremental_vacuum. Only takes
+        # effect on a new database, and must precede the switch to WAL
+        self.writer.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        # WAL lets readers proceed during writes; with it, NORMAL only syncs
+        # at checkpoints and stays durable across application crashes
+        retry_busy(lambda: self.writer.execute("PRAGMA journal_mode = WAL"))
+        self.writer.execute("PRAGMA synchronous = NORMAL")
+
+    @property
+    def shared(self) -> bool:
+        """
+        Whether readers must use the writer, as for in-memory databases.
+        """
+        return self.db_path == ":memory:" or self.db_path.startswith("file::memory:")
+
+    def _open(self) -> sqlite3.Connection:
+        """
+        Open a configured connection.
+        """
+        # Connections are used from the thread pool and the flusher thread,
+        # always under write_lock or by their owning thread
+        connection = sqlite3.connect(self.db_path, timeout=self.busy_timeout, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA foreign_keys = ON")
+        return connection
+
+    @contextmanager
+    def writer_connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Use the writer connection exclusively.
+
+        Yields:
+            The writer connection, with write_lock held.
+        """
+        with self.write_lock:
+            yield self.writer
+
+    @contextmanager
+    def reader_connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Use this thread's read connection.
+
+        Yields:
+            A connection reading the last committed state.
+        """
+        if self.shared:
+            with self.writer_connection() as connection:
+                yield connection
+            return
+
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._open()
+            connection.execute("PRAGMA query_only = ON")
+            self._local.connection = connection
+            with self._readers_lock:
+                self._readers.append(connection)
+        yield connection
+
+    def close(self) -> None:
+        """
+        Close all connections.
+        """
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+        for connection in readers:
+            connection.close()
+        with self.write_lock:
+            self.writer.close()
+
+def run_cursor(run: Dict[str, Any]) -> str:
+    """
+    Get the pagination cursor positioned after a run.
+
+    Args:
+        run: Run record, as returned by list_runs or iter_runs.
+
+    Returns:
+        Cursor to pass as "after" to list the runs that follow it.
+    """
+    return f"{run['start_time']}{CURSOR_SEPARATOR}{run['id']}"
+
+
+def parse_run_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    Decode a run pagination cursor.
+
+    Args:
+        cursor: Cursor from run_cursor().
+
+    Returns:
+        Tuple of start time and run ID.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    start_time, separator, run_id = cursor.rpartition(CURSOR_SEPARATOR)
+    if not separator or not start_time or not run_id.isdigit():
+        raise ValueError(f"Invalid run cursor: {cursor}")
+    return start_time, int(run_id)
+
+
+def _collapse_pending_commands(cursor: sqlite3.Cursor) -> None:
+    """
+    Collapse pending command rows into their result rows.
+
+    Runs logged before commands were updated in place have a separate
+    pending row for every executed command. A pending row followed by a
+    result row for the same command in the same run is deleted.
+    """
+    cursor.execute('''
+        DELETE FROM commands WHERE id IN (
+            SELECT id FROM (
+                SELECT id, status, LEAD(status) OVER (
+                    PARTITION BY run_id, command ORDER BY id
+                ) AS next_status
+                FROM commands
+            )
+            WHERE status = 'pending' AND next_status IS NOT NULL AND next_status != 'pending'
+        )
+    ''')
+    if cursor.rowcount > 0:
+        logger.info(f"Removed {cursor.rowcount} superseded pending command records")
+
+
+def _add_lookup_indexes(cursor: sqlite3.Cursor) -> None:
+    """
+    Index per-run lookups and time-ordered run listings.
+    """
+    # get_commands: run_id equality, ordered by id
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_commands_run ON commands (run_id, id)")
+    # get_documentation
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_documentation_run ON documentation (run_id)")
+    # list_runs filtered by status, ordered by start time
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_runs_status_start ON runs (status, start_time)")
+    # Unfiltered list_runs and delete_old_runs by start time
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_runs_start ON runs (start_time, id)")
+    # Checkpoint lookups by run
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_checkpoints_run ON checkpoints (run_id, command_index)")
+    cursor.execute("ANALYZE")
+
+
+def encode_blob(content: str) -> Tuple[str, int, Optional[str], bytes]:
+    """
+    Prepare text for the documentation blob store.
+
+    Args:
+        content: Text to store.
+
+    Returns:
+        Tuple of content hash (sha256 hex of the UTF-8 text), size in bytes,
+        compression method (None if stored raw), and stored bytes.
+    """
+    data = content.encode("utf-8", errors="surrogatepass")
+    content_hash = hashlib.sha256(data).hexdigest()
+    if len(data) >= MIN_COMPRESS_BYTES:
+        compressed = zlib.compress(data, 6)
+        if len(compressed) < len(data):
+            return content_hash, len(data), "zlib", compressed
+    return content_hash, len(data), None, data
+
+
+def decode_blob(data: bytes, compression: Optional[str]) -> str:
+    """
+    Read text from the documentation blob store.
+
+    Args:
+        data: Stored bytes.
+        compression: Compression method, or None.
+
+    Returns:
+        The original text.
+    """
+    if compression == "zlib":
+        data = zlib.decompress(data)
+    elif compression is not None:
+        raise ValueError(f"Unknown blob compression: {compression}")
+    return data.decode("utf-8", errors="surrogatepass")
+
+
+def _deduplicate_documentation(cursor: sqlite3.Cursor) -> None:
+    """
+    Move documentation content into a content-addressed blob store.
+
+    Each distinct document is stored once, compressed, in doc_blobs;
+    documentation rows reference it by hash.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS doc_blobs (
+            hash TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            compression TEXT,
+            content BLOB NOT NULL
+        )
+    ''')
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(documentation)")}
+    if "content" not in columns:
+        return
+
+    cursor.execute('''
+        CREATE TABLE documentation_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id INTEGER NOT NULL,
+            file_path TEXT NOT NULL,
+            content_hash TEXT NOT NULL REFERENCES doc_blobs(hash),
+            timestamp TIMESTAMP,
+            metadata TEXT,
+            FOREIGN KEY (run_id) REFERENCES runs(id) ON DELETE CASCADE
+        )
+    ''')
+
+    reader = cursor.connection.execute(
+        "SELECT id, run_id, file_path, content, timestamp, metadata FROM documentation ORDER BY id"
+    )
+    while True:
+        rows = reader.fetchmany(1000)
+        if not rows:
+            break
+        docs = []
+        for row in rows:
+            blob = encode_blob(row["content"])
+            cursor.execute("INSERT OR IGNORE INTO doc_blobs (hash, size, compression, content) "
+                           "VALUES (?, ?, ?, ?)", blob)
+            docs.append((row["id"], row["run_id"], row["file_path"], blob[0], row["timestamp"], row["metadata"]))
+        cursor.executemany("INSERT INTO documentation_new (id, run_id, file_path, content_hash, "
+                           "timestamp, metadata) VALUES (?, ?, ?, ?, ?, ?)", docs)
+
+    cursor.execute("DROP TABLE documentation")
+    cursor.execute("ALTER TABLE documentation_new RENAME TO documentation")
+    cursor.execute("CREATE INDEX idx_documentation_run ON documentation (run_id)")
+    # Finding remaining references when runs are deleted
+    cursor.execute("CREATE INDEX idx_documentation_hash ON documentation (content_hash)")
+
+
+def _fts5_available(cursor: sqlite3.Cursor) -> bool:
+    """
+    Check whether SQLite was built with FTS5.
+    """
+    try:
+        cursor.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        cursor.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def _add_full_text_search(cursor: sqlite3.Cursor) -> None:
+    """
+    Index command text, command errors and documentation for full-text search.
+
+    commands_fts indexes the commands table directly. doc_fts stores the
+    decoded text of each distinct documentation blob once, keyed by the
+    blob's rowid. Blobs are compressed, which plain SQL cannot undo, so
+    NovaSystem adds entries when it stores a new blob; a trigger removes
+    them, keeping the schema usable from any SQLite client.
+    """
+    if not _fts5_available(cursor):
+        logger.warning("SQLite lacks FTS5; full-text search will be unavailable")
+        return
+
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS commands_fts USING fts5(
+            command, error, content='commands', content_rowid='id'
+        )
+    ''')
+    # One statement per execute(): executescript() would commit the migration's transaction
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS commands_fts_insert AFTER INSERT ON commands BEGIN
+            INSERT INTO commands_fts (rowid, command, error) VALUES (new.id, new.command, new.error);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS commands_fts_delete AFTER DELETE ON commands BEGIN
+            INSERT INTO commands_fts (commands_fts, rowid, command, error)
+            VALUES ('delete', old.id, old.command, old.error);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS commands_fts_update AFTER UPDATE OF command, error ON commands BEGIN
+            INSERT INTO commands_fts (commands_fts, rowid, command, error)
+            VALUES ('delete', old.id, old.command, old.error);
+            INSERT INTO commands_fts (rowid, command, error) VALUES (new.id, new.command, new.error);
+        END
+    ''')
+
+    cursor.execute("CREATE VIRTUAL TABLE IF NOT EXISTS doc_fts USING fts5(content)")
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS doc_fts_delete AFTER DELETE ON doc_blobs BEGIN
+            DELETE FROM doc_fts WHERE rowid = old.rowid;
+        END
+    ''')
+
+    # Index existing history
+    cursor.execute("INSERT INTO commands_fts (commands_fts) VALUES ('rebuild')")
+    cursor.execute("DELETE FROM doc_fts")
+    blobs = cursor.connection.execute("SELECT rowid, content, compression FROM doc_blobs")
+    cursor.executemany("INSERT INTO doc_fts (rowid, content) VALUES (?, ?)",
+                       ((rowid, decode_blob(content, compression)) for rowid, content, compression in blobs))
+
+
+# Contribution of a finished run (row "new" or "old") to the run summaries
+_RUN_DURATION = "COALESCE((julianday({row}.end_time) - julianday({row}.start_time)) * 86400, 0)"
+_RUN_STATS_SQL = '''
+    INSERT INTO stats_repository_types (repository_type, runs, successes, total_seconds)
+    VALUES (COALESCE({row}.repository_type, 'unknown'), {sign}, {sign} * COALESCE({row}.success, 0),
+            {sign} * {duration})
+    ON CONFLICT (repository_type) DO UPDATE SET
+        runs = runs + excluded.runs, successes = successes + excluded.successes,
+        total_seconds = total_seconds + excluded.total_seconds;
+    INSERT INTO stats_daily (day, runs, successes, total_seconds)
+    VALUES (date({row}.start_time), {sign}, {sign} * COALESCE({row}.success, 0), {sign} * {duration})
+    ON CONFLICT (day) DO UPDATE SET
+        runs = runs + excluded.runs, successes = successes + excluded.successes,
+        total_seconds = total_seconds + excluded.total_seconds;
+'''
+
+# Contribution of a finished command to the command summary. The maximum
+# only grows: a corrected result does not lower it.
+_COMMAND_SUCCESS = "({row}.status = 'success' OR ({row}.status = 'completed' AND {row}.exit_code IS 0))"
+_COMMAND_STATS_SQL = '''
+    INSERT INTO stats_commands (normalized_command, executions, successes, timeouts,
+                                total_seconds, max_seconds, last_seen)
+    VALUES (COALESCE({row}.normalized_command, {row}.command), {sign}, {sign} * {success},
+            {sign} * ({row}.status = 'timeout'), {sign} * COALESCE({row}.execution_time, 0),
+            {max_seconds}, {row}.timestamp)
+    ON CONFLICT (normalized_command) DO UPDATE SET
+        executions = executions + excluded.executions, successes = successes + excluded.successes,
+        timeouts = timeouts + excluded.timeouts, total_seconds = total_seconds + excluded.total_seconds,
+        max_seconds = MAX(max_seconds, excluded.max_seconds),
+        last_seen = COALESCE(MAX(last_seen, excluded.last_seen), last_seen, excluded.last_seen);
+'''
+
+
+def _run_stats_sql(row: str, sign: int) -> str:
+    """
+    Build the statements adding (sign 1) or removing (sign -1) a run's contribution.
+    """
+    return _RUN_STATS_SQL.format(row=row, sign=sign, duration=_RUN_DURATION.format(row=row))
+
+
+def _command_stats_sql(row: str, sign: int) -> str:
+    """
+    Build the statements adding (sign 1) or removing (sign -1) a command's contribution.
+    """
+    max_seconds = f"COALESCE({row}.execution_time, 0)" if sign > 0 else "0"
+    return _COMMAND_STATS_SQL.format(row=row, sign=sign, max_seconds=max_seconds,
+                                     success=_COMMAND_SUCCESS.format(row=row))
+
+
+def _add_run_statistics(cursor: sqlite3.Cursor) -> None:
+    """
+    Maintain run summaries per repository type, per normalized command and per day.
+
+    Triggers keep the summaries current as runs finish and commands complete,
+    so statistics never scan history. A run counts once it has an end time,
+    a command once it has a finished status; later corrections replace their
+    earlier contribution. Deleting runs leaves the summaries untouched, so
+    they cover all history, including runs removed by retention. Runs moved
+    to an archive take their contribution with them (see
+    _retract_run_statistics()), as importing the archive adds it back.
+    """
+    # One statement per execute(): executescript() would commit the migration's transaction
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stats_repository_types (
+            repository_type TEXT PRIMARY KEY,
+            runs INTEGER NOT NULL DEFAULT 0,
+            successes INTEGER NOT NULL DEFAULT 0,
+            total_seconds REAL NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stats_commands (
+            normalized_command TEXT PRIMARY KEY,
+            executions INTEGER NOT NULL DEFAULT 0,
+            successes INTEGER NOT NULL DEFAULT 0,
+            timeouts INTEGER NOT NULL DEFAULT 0,
+            total_seconds REAL NOT NULL DEFAULT 0,
+            max_seconds REAL NOT NULL DEFAULT 0,
+            last_seen TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stats_daily (
+            day TEXT PRIMARY KEY,
+            runs INTEGER NOT NULL DEFAULT 0,
+            successes INTEGER NOT NULL DEFAULT 0,
+            total_seconds REAL NOT NULL DEFAULT 0
+        )
+    ''')
+
+    finished = ", ".join(f"'{status}'" for status in FINISHED_STATUSES)
+    run_columns = "end_time, start_time, success, repository_type"
+    command_columns = "status, exit_code, execution_time, command, normalized_command"
+    triggers = [
+        ("runs_stats_insert", "INSERT ON runs", "new.end_time IS NOT NULL", _run_stats_sql("new", 1)),
+        ("runs_stats_retract", f"UPDATE OF {run_columns} ON runs", "old.end_time IS NOT NULL",
+         _run_stats_sql("old", -1)),
+        ("runs_stats_apply", f"UPDATE OF {run_columns} ON runs", "new.end_time IS NOT NULL",
+         _run_stats_sql("new", 1)),
+        ("commands_stats_insert", "INSERT ON commands", f"new.status IN ({finished})",
+         _command_stats_sql("new", 1)),
+        ("commands_stats_retract", f"UPDATE OF {command_columns} ON commands", f"old.status IN ({finished})",
+         _command_stats_sql("old", -1)),
+        ("commands_stats_apply", f"UPDATE OF {command_columns} ON commands", f"new.status IN ({finished})",
+         _command_stats_sql("new", 1)),
+    ]
+    for name, event, condition, body in triggers:
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} WHEN {condition} BEGIN {body} END")
+
+    # Summarize existing history, replacing any earlier summary
+    cursor.execute("DELETE FROM stats_repository_types")
+    cursor.execute("DELETE FROM stats_daily")
+    cursor.execute("DELETE FROM stats_commands")
+    duration = _RUN_DURATION.format(row="runs")
+    cursor.execute(f'''
+        INSERT INTO stats_repository_types (repository_type, runs, successes, total_seconds)
+        SELECT COALESCE(repository_type, 'unknown'), COUNT(*), SUM(COALESCE(success, 0)), SUM({duration})
+        FROM runs WHERE end_time IS NOT NULL GROUP BY 1
+    ''')
+    cursor.execute(f'''
+        INSERT INTO stats_daily (day, runs, successes, total_seconds)
+        SELECT date(start_time), COUNT(*), SUM(COALESCE(success, 0)), SUM({duration})
+        FROM runs WHERE end_time IS NOT NULL GROUP BY 1
+    ''')
+    cursor.execute(f'''
+        INSERT INTO stats_commands (normalized_command, executions, successes, timeouts,
+                                    total_seconds, max_seconds, last_seen)
+        SELECT COALESCE(normalized_command, command), COUNT(*),
+               SUM({_COMMAND_SUCCESS.format(row="commands")}), SUM(status = 'timeout'),
+               SUM(COALESCE(execution_time, 0)), COALESCE(MAX(execution_time), 0), MAX(timestamp)
+        FROM commands WHERE status IN ({finished}) GROUP BY 1
+    ''')
+
+
+def _retract_run_statistics(cursor: sqlite3.Cursor, run_ids: List[int]) -> None:
+    """
+    Remove the contribution of runs and their commands from the run summaries.
+
+    The counterpart of the summary triggers, for runs leaving the database
+    for an archive. As with corrected commands, maximum times are kept.
+    """
+    placeholders = ", ".join("?" * len(run_ids))
+    duration = _RUN_DURATION.format(row="runs")
+    cursor.execute(f'''
+        INSERT INTO stats_repository_types (repository_type, runs, successes, total_seconds)
+        SELECT COALESCE(repository_type, 'unknown'), -COUNT(*), -SUM(COALESCE(success, 0)), -SUM({duration})
+        FROM runs WHERE id IN ({placeholders}) AND end_time IS NOT NULL GROUP BY 1
+        ON CONFLICT (repository_type) DO UPDATE SET
+            runs = runs + excluded.runs, successes = successes + excluded.successes,
+            total_seconds = total_seconds + excluded.total_seconds
+    ''', run_ids)
+    cursor.execute(f'''
+        INSERT INTO stats_daily (day, runs, successes, total_seconds)
+        SELECT date(start_time), -COUNT(*), -SUM(COALESCE(success, 0)), -SUM({duration})
+        FROM runs WHERE id IN ({placeholders}) AND end_time IS NOT NULL GROUP BY 1
+        ON CONFLICT (day) DO UPDATE SET
+            runs = runs + excluded.runs, successes = successes + excluded.successes,
+            total_seconds = total_seconds + excluded.total_seconds
+    ''', run_ids)
+    finished = ", ".join(f"'{status}'" for status in FINISHED_STATUSES)
+    cursor.execute(f'''
+        INSERT INTO stats_commands (normalized_command, executions, successes, timeouts,
+                                    total_seconds, max_seconds, last_seen)
+        SELECT COALESCE(normalized_command, command), -COUNT(*),
+               -SUM({_COMMAND_SUCCESS.format(row="commands")}), -SUM(status = 'timeout'),
+               -SUM(COALESCE(execution_time, 0)), 0, NULL
+        FROM commands WHERE run_id IN ({placeholders}) AND status IN ({finished}) GROUP BY 1
+        ON CONFLICT (normalized_command) DO UPDATE SET
+            executions = executions + excluded.executions, successes = successes + excluded.successes,
+            timeouts = timeouts + excluded.timeouts, total_seconds = total_seconds + excluded.total_seconds
+    ''', run_ids)
+
+
+# Schema migrations in order; PRAGMA user_version is the number applied.
+# Append only: never reorder or edit a released migration, and keep each
+# safe to re-run (IF NOT EXISTS) in case a database's version was reset.
+MIGRATIONS: List[Callable[[sqlite3.Cursor], None]] = [
+    _collapse_pending_commands,
+    _add_lookup_indexes,
+    _deduplicate_documentation,
+    _add_full_text_search,
+    _add_run_statistics,
+]
+
+
 class DatabaseManager:
     """
     Manages persistent storage of run data, logs, and documentation.
     """
 
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, commit_batch: int = DEFAULT_COMMIT_BATCH,
+                 commit_interval: float = DEFAULT_COMMIT_INTERVAL,
+                 busy_timeout: float = DEFAULT_BUSY_TIMEOUT):
         """
         Initialize the DatabaseManager.
 
+        Writes are group-committed: they are applied immediately (so they are
+        visible to this manager and return their IDs) but committed together
+        every commit_batch writes or commit_interval seconds, and whenever a
+        run finishes. A commit_batch of 1 commits every write.
+
+        The manager can be shared between threads: writes go through a single
+        writer connection, reads through per-thread connections.
+
         Args:
             db_path: Path to the SQLite database file. If None, uses the default path.
+            commit_batch: Maximum number of buffered writes.
+            commit_interval: Maximum time a write stays uncommitted (in seconds).
+            busy_timeout: Time to wait on a database locked by another process (in seconds).
         """
         self.db_path = db_path or os.environ.get("NOVASYSTEM_DB_PATH", "novasystem.db")
+        self.pool: Optional[ConnectionPool] = None
         self.connection = None
+        self.commit_batch = max(1, commit_batch)
+        self.commit_interval = commit_interval
+        self.busy_timeout = busy_timeout
+
+        # Serializes writes and commits between threads and the flusher thread
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._pending_since = 0.0
+        self._flush_event = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+        self._doc_index = False
 
         logger.info(f"Database manager initialized with path: {self.db_path}")
 
@@ -39,11 +690,9 @@ class DatabaseManager:
         Connect to the SQLite database.
         """
         try:
-            self.connection = sqlite3.connect(self.db_path)
-            # Enable foreign keys
-            self.connection.execute("PRAGMA foreign_keys = ON")
-            # Configure connection
-            self.connection.row_factory = sqlite3.Row
+            self.pool = ConnectionPool(self.db_path, self.busy_timeout, write_lock=self._lock)
+            # Writes use the pool's writer connection, under self._lock
+            self.connection = self.pool.writer
             logger.info(f"Connected to database: {self.db_path}")
         except sqlite3.Error as e:
             logger.error(f"Error connecting to database: {str(e)}")
@@ -85,10 +734,29 @@ class DatabaseManager:
                     timestamp TIMESTAMP,
                     command_type TEXT,
                     priority INTEGER,
+                    peak_memory_bytes INTEGER,
+                    cpu_seconds REAL,
+                    block_read_bytes INTEGER,
+                    block_write_bytes INTEGER,
+                    net_rx_bytes INTEGER,
+                    net_tx_bytes INTEGER,
+                    normalized_command TEXT,
+                    timeout REAL,
+                    timeout_source TEXT,
                     FOREIGN KEY (run_id) REFERENCES runs(id) ON DELETE CASCADE
                 )
             ''')
 
+            # Add columns introduced after the table was first created
+            self._ensure_columns(cursor, "commands", RESOURCE_COLUMNS)
+            self._ensure_columns(cursor, "commands", TIMEOUT_COLUMNS)
+
+            # Execution-time history lookups for adaptive timeouts
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_commands_normalized
+                ON commands (normalized_command, id)
+            ''')
+
             # Documentation table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS documentation (
@@ -102,12 +770,181 @@ class DatabaseManager:
                 )
             ''')
 
+            # Checkpoint images of partially executed runs
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS checkpoints (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_id INTEGER NOT NULL,
+                    command_index INTEGER NOT NULL,
+                    stage TEXT,
+                    image TEXT NOT NULL,
+                    created_at TIMESTAMP,
+                    FOREIGN KEY (run_id) REFERENCES runs(id) ON DELETE CASCADE
+                )
+            ''')
+
             self.connection.commit()
+            self._migrate()
+            # Without FTS5 there is no index to keep current
+            self._doc_index = self.connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'doc_fts'"
+            ).fetchone() is not None
             logger.info("Database tables created or verified")
         except sqlite3.Error as e:
             logger.error(f"Error creating database tables: {str(e)}")
             raise ValueError(f"Database initialization error: {str(e)}")
 
+    def _ensure_columns(self, cursor: sqlite3.Cursor, table: str, columns: Dict[str, str]) -> None:
+        """
+        Add any missing columns to an existing table.
+
+        Args:
+            cursor: Database cursor.
+            table: Table name.
+            columns: Mapping of column names to SQL types.
+        """
+        existing = {row["name"] for row in cursor.execute(f"PRAGMA table_info({table})")}
+        for name, sql_type in columns.items():
+            if name not in existing:
+                logger.info(f"Adding column {table}.{name}")
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {sql_type}")
+
+    def _migrate(self) -> None:
+        """
+        Apply pending schema migrations.
+
+        Each migration runs in its own immediate transaction together with
+        the user_version bump, so concurrent processes apply it only once.
+        """
+        for version in range(1, len(MIGRATIONS) + 1):
+            with self._lock:
+                retry_busy(lambda: self.connection.execute("BEGIN IMMEDIATE"))
+                try:
+                    cursor = self.connection.cursor()
+                    current = cursor.execute("PRAGMA user_version").fetchone()[0]
+                    if current >= version:
+                        self.connection.rollback()
+                        continue
+                    logger.info(f"Applying database migration {version}")
+                    MIGRATIONS[version - 1](cursor)
+                    cursor.execute(f"PRAGMA user_version = {version}")
+                    self.connection.commit()
+                except sqlite3.Error:
+                    self.connection.rollback()
+                    raise
+
+        current = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if current > len(MIGRATIONS):
+            logger.warning(f"Database schema version {current} is newer than this version "
+                           f"of NovaSystem ({len(MIGRATIONS)})")
+
+    def _commit(self, force: bool = False) -> None:
+        """
+        Commit buffered writes if the batch is full, or buffer this write.
+
+        Must be called with self._lock held, after a write.
+
+        Args:
+            force: Commit now regardless of the batch size.
+        """
+        self._pending += 1
+        if self._pending == 1:
+            self._pending_since = time.monotonic()
+
+        if force or self._pending >= self.commit_batch or self.commit_interval <= 0:
+            self._flush_locked()
+            return
+
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(target=self._flush_periodically,
+                                             name="novasystem-db-flusher", daemon=True)
+            self._flusher.start()
+
+    def _flush_locked(self) -> None:
+        """
+        Commit buffered writes. Must be called with self._lock held.
+        """
+        if self._pending and self.connection:
+            retry_busy(self.connection.commit)
+            logger.debug(f"Committed {self._pending} buffered writes")
+        self._pending = 0
+
+    def _flush_periodically(self) -> None:
+        """
+        Commit buffered writes once they are commit_interval old.
+        """
+        while not self._closed:
+            self._flush_event.wait(self.commit_interval)
+            with self._lock:
+                if self._closed:
+                    return
+                if self._pending and time.monotonic() - self._pending_since >= self.commit_interval:
+                    try:
+                        self._flush_locked()
+                    except sqlite3.Error as e:
+                        logger.error(f"Error committing buffered writes: {str(e)}")
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """
+        Get a connection for reading.
+
+        While this manager has uncommitted writes, reads go through the
+        writer so they see them; otherwise they use this thread's read
+        connection and do not wait for writers.
+
+        Yields:
+            A database connection.
+        """
+        with self._lock:
+            if self._pending:
+                yield self.connection
+                return
+        with self.pool.reader_connection() as connection:
+            yield connection
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run statements in a transaction of their own on the writer connection.
+
+        Buffered writes are committed first. The transaction commits when the
+        block exits and rolls back if it raises.
+
+        Yields:
+            The writer connection.
+        """
+        with self._lock:
+            self._flush_locked()
+            try:
+                yield self.connection
+            except BaseException:
+                self.connection.rollback()
+                raise
+            retry_busy(self.connection.commit)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Apply several writes back to back, without other threads' writes in between.
+
+        Unlike transaction(), the writes are group-committed as usual, so a
+        batch costs one lock acquisition and usually one commit.
+        """
+        with self._lock:
+            yield
+
+    def flush(self) -> None:
+        """
+        Commit all buffered writes now.
+        """
+        with self._lock:
+            try:
+                self._flush_locked()
+            except sqlite3.Error as e:
+                logger.error(f"Error committing buffered writes: {str(e)}")
+                raise ValueError(f"Database error: {str(e)}")
+
     def create_run(self, repo_url: str, repository_type: Optional[str] = None,
                   metadata: Optional[Dict[str, Any]] = None) -> int:
         """
@@ -121,29 +958,31 @@ class DatabaseManager:
         Returns:
             ID of the created run.
         """
-        try:
-            cursor = self.connection.cursor()
-
-            # Convert metadata to JSON if provided
-            metadata_json = json.dumps(metadata) if metadata else None
-
-            # Insert run record
-            cursor.execute('''
-                INSERT INTO runs (repo_url, start_time, status, repository_type, metadata)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (repo_url, datetime.now().isoformat(), 'started', repository_type, metadata_json))
-
-            self.connection.commit()
-            run_id = cursor.lastrowid
-            logger.info(f"Created run record with ID {run_id} for {repo_url}")
-            return run_id
-        except sqlite3.Error as e:
-            logger.error(f"Error creating run record: {str(e)}")
-            raise ValueError(f"Database error: {str(e)}")
+        with self._lock:
+            try:
+                cursor = self.connection.cursor()
+
+                # Convert metadata to JSON if provided
+                metadata_json = json.dumps(metadata) if metadata else None
+
+                # Insert run record
+                cursor.execute('''
+                    INSERT INTO runs (repo_url, start_time, status, repository_type, metadata)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (repo_url, datetime.now().isoformat(), 'started', repository_type, metadata_json))
+
+                self._commit()
+                run_id = cursor.lastrowid
+                logger.info(f"Created run record with ID {run_id} for {repo_url}")
+                return run_id
+            except sqlite3.Error as e:
+                logger.error(f"Error creating run record: {str(e)}")
+                raise ValueError(f"Database error: {str(e)}")
 
     def update_run(self, run_id: int, status: Optional[str] = None,
                   success: Optional[bool] = None, summary: Optional[str] = None,
-                  end_time: bool = False) -> bool:
+                  end_time: bool = False, repository_type: Optional[str] = None,
+                  metadata: Optional[Dict[str, Any]] = None) -> bool:
         """
         Update a run record.
 
@@ -153,59 +992,81 @@ class DatabaseManager:
             success: Whether the run was successful.
             summary: Summary of the run results.
             end_time: Whether to update the end_time to now.
+            repository_type: Type of repository (e.g., python, javascript).
+            metadata: Metadata keys to merge into the run's existing metadata.
 
         Returns:
             True if the update was successful, False otherwise.
         """
-        try:
-            cursor = self.connection.cursor()
-
-            # Build update query
-            query_parts = []
-            params = []
-
-            if status is not None:
-                query_parts.append("status = ?")
-                params.append(status)
-
-            if success is not None:
-                query_parts.append("success = ?")
-                params.append(success)
-
-            if summary is not None:
-                query_parts.append("summary = ?")
-                params.append(summary)
-
-            if end_time:
-                query_parts.append("end_time = ?")
-                params.append(datetime.now().isoformat())
-
-            if not query_parts:
-                logger.warning("No fields to update in run record")
+        with self._lock:
+            try:
+                cursor = self.connection.cursor()
+
+                # Build update query
+                query_parts = []
+                params = []
+
+                if status is not None:
+                    query_parts.append("status = ?")
+                    params.append(status)
+
+                if success is not None:
+                    query_parts.append("success = ?")
+                    params.append(success)
+
+                if summary is not None:
+                    query_parts.append("summary = ?")
+                    params.append(summary)
+
+                if end_time:
+                    query_parts.append("end_time = ?")
+                    params.append(datetime.now().isoformat())
+
+                if repository_type is not None:
+                    query_parts.append("repository_type = ?")
+                    params.append(repository_type)
+
+                if metadata is not None:
+                    cursor.execute("SELECT metadata FROM runs WHERE id = ?", (run_id,))
+                    row = cursor.fetchone()
+                    merged = {}
+                    if row and row["metadata"]:
+                        try:
+                            merged = json.loads(row["metadata"])
+                        except json.JSONDecodeError:
+                            logger.warning(f"Invalid metadata JSON for run {run_id}")
+                    merged.update(metadata)
+                    query_parts.append("metadata = ?")
+                    params.append(json.dumps(merged))
+
+                if not query_parts:
+                    logger.warning("No fields to update in run record")
+                    return False
+
+                # Construct and execute query
+                query = f"UPDATE runs SET {', '.join(query_parts)} WHERE id = ?"
+                params.append(run_id)
+
+                cursor.execute(query, params)
+                self._commit(force=end_time)
+
+                updated = cursor.rowcount > 0
+                if updated:
+                    logger.info(f"Updated run record {run_id}")
+                else:
+                    logger.warning(f"Run record {run_id} not found or not updated")
+
+                return updated
+            except sqlite3.Error as e:
+                logger.error(f"Error updating run record: {str(e)}")
                 return False
 
-            # Construct and execute query
-            query = f"UPDATE runs SET {', '.join(query_parts)} WHERE id = ?"
-            params.append(run_id)
-
-            cursor.execute(query, params)
-            self.connection.commit()
-
-            updated = cursor.rowcount > 0
-            if updated:
-                logger.info(f"Updated run record {run_id}")
-            else:
-                logger.warning(f"Run record {run_id} not found or not updated")
-
-            return updated
-        except sqlite3.Error as e:
-            logger.error(f"Error updating run record: {str(e)}")
-            return False
-
     def log_command(self, run_id: int, command: str, exit_code: Optional[int] = None,
                    output: Optional[str] = None, error: Optional[str] = None,
                    execution_time: Optional[float] = None, status: str = "completed",
-                   command_type: Optional[str] = None, priority: Optional[int] = None) -> int:
+                   command_type: Optional[str] = None, priority: Optional[int] = None,
+                   resource_usage: Optional[Dict[str, Any]] = None,
+                   timeout: Optional[float] = None, timeout_source: Optional[str] = None) -> int:
         """
         Log a command execution.
 
@@ -219,33 +1080,97 @@ class DatabaseManager:
             status: Status of the execution (completed, error, timeout).
             command_type: Type of command (shell, python, etc.).
             priority: Priority of the command.
+            resource_usage: Resources consumed by the command, keyed by
+                the names in RESOURCE_COLUMNS.
+            timeout: Timeout applied to the command (in seconds).
+            timeout_source: How the timeout was chosen (history, default).
 
         Returns:
             ID of the created command record.
         """
-        try:
-            cursor = self.connection.cursor()
+        with self._lock:
+            try:
+                cursor = self.connection.cursor()
+
+                usage = resource_usage or {}
+                cursor.execute(f'''
+                    INSERT INTO commands (run_id, command, exit_code, output, error,
+                                         execution_time, status, timestamp, command_type, priority,
+                                         normalized_command, timeout, timeout_source,
+                                         {", ".join(RESOURCE_COLUMNS)})
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?{", ?" * len(RESOURCE_COLUMNS)})
+                ''', (run_id, command, exit_code, output, error, execution_time,
+                     status, datetime.now().isoformat(), command_type, priority,
+                     normalize_command(command), timeout, timeout_source,
+                     *(usage.get(column) for column in RESOURCE_COLUMNS)))
+
+                self._commit()
+                command_id = cursor.lastrowid
+                logger.info(f"Logged command for run {run_id}: {command[:50]}...")
+                return command_id
+            except sqlite3.Error as e:
+                logger.error(f"Error logging command: {str(e)}")
+                raise ValueError(f"Database error: {str(e)}")
+
+    def update_command(self, command_id: int, exit_code: Optional[int] = None,
+                       output: Optional[str] = None, error: Optional[str] = None,
+                       execution_time: Optional[float] = None, status: Optional[str] = None,
+                       resource_usage: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Record the result of a command logged with log_command.
 
-            cursor.execute('''
-                INSERT INTO commands (run_id, command, exit_code, output, error,
-                                     execution_time, status, timestamp, command_type, priority)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (run_id, command, exit_code, output, error, execution_time,
-                 status, datetime.now().isoformat(), command_type, priority))
+        Args:
+            command_id: ID returned by log_command.
+            exit_code: Exit code of the command.
+            output: Standard output from the command.
+            error: Standard error from the command.
+            execution_time: Time taken to execute the command (in seconds).
+            status: Status of the execution (success, failed, timeout).
+            resource_usage: Resources consumed by the command, keyed by
+                the names in RESOURCE_COLUMNS.
 
-            self.connection.commit()
-            command_id = cursor.lastrowid
-            logger.info(f"Logged command for run {run_id}: {command[:50]}...")
-            return command_id
-        except sqlite3.Error as e:
-            logger.error(f"Error logging command: {str(e)}")
-            raise ValueError(f"Database error: {str(e)}")
+        Returns:
+            True if the command record was updated, False otherwise.
+        """
+        fields = {
+            "exit_code": exit_code,
+            "output": output,
+            "error": error,
+            "execution_time": execution_time,
+            "status": status,
+            **{column: (resource_usage or {}).get(column) for column in RESOURCE_COLUMNS},
+        }
+        fields = {name: value for name, value in fields.items() if value is not None}
+        if not fields:
+            logger.warning("No fields to update in command record")
+            return False
+
+        with self._lock:
+            try:
+                cursor = self.connection.cursor()
+
+                cursor.execute(
+                    f"UPDATE commands SET {', '.join(f'{name} = ?' for name in fields)} WHERE id = ?",
+                    (*fields.values(), command_id)
+                )
+                self._commit()
+
+                updated = cursor.rowcount > 0
+                if not updated:
+                    logger.warning(f"Command record {command_id} not found or not updated")
+                return updated
+            except sqlite3.Error as e:
+                logger.error(f"Error updating command: {str(e)}")
+                raise ValueError(f"Database error: {str(e)}")
 
     def store_documentation(self, run_id: int, file_path: str, content: str,
                           metadata: Optional[Dict[str, Any]] = None) -> int:
         """
         Store documentation content.
 
+        Content is stored once per distinct document in the blob store and
+        shared by every run that stores the same text.
+
         Args:
             run_id: ID of the run.
             file_path: Path to the documentation file.
@@ -255,24 +1180,122 @@ class DatabaseManager:
         Returns:
             ID of the created documentation record.
         """
-        try:
-            cursor = self.connection.cursor()
+        with self._lock:
+            try:
+                cursor = self.connection.cursor()
+
+                # Convert metadata to JSON if provided
+                metadata_json = json.dumps(metadata) if metadata else None
+
+                # Always insert: checking first would let another process delete
+                # the blob between the check and the documentation insert
+                blob = encode_blob(content)
+                content_hash = blob[0]
+                self._insert_blob(cursor, blob, content)
+
+                cursor.execute('''
+                    INSERT INTO documentation (run_id, file_path, content_hash, timestamp, metadata)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (run_id, file_path, content_hash, datetime.now().isoformat(), metadata_json))
+
+                self._commit()
+                doc_id = cursor.lastrowid
+                logger.info(f"Stored documentation for run {run_id}: {file_path}")
+                return doc_id
+            except sqlite3.Error as e:
+                logger.error(f"Error storing documentation: {str(e)}")
+                raise ValueError(f"Database error: {str(e)}")
+
+    def _insert_blob(self, cursor: sqlite3.Cursor, blob: Tuple[str, int, Optional[str], bytes],
+                     content: str) -> None:
+        """
+        Add a blob to the store unless present, indexing the text of a new one.
 
-            # Convert metadata to JSON if provided
-            metadata_json = json.dumps(metadata) if metadata else None
+        Args:
+            cursor: Cursor on the writer connection, in a write transaction.
+            blob: Blob as returned by encode_blob.
+            content: The blob's text.
+        """
+        cursor.execute('''
+            INSERT OR IGNORE INTO doc_blobs (hash, size, compression, content)
+            VALUES (?, ?, ?, ?)
+        ''', blob)
+        if cursor.rowcount == 1 and self._doc_index:
+            cursor.execute("INSERT INTO doc_fts (rowid, content) VALUES (?, ?)", (cursor.lastrowid, content))
+
+    @staticmethod
+    def _run_record(row: sqlite3.Row, parse_metadata: bool = True) -> Dict[str, Any]:
+        """
+        Convert a runs row to a record, decoding its metadata JSON.
 
-            cursor.execute('''
-                INSERT INTO documentation (run_id, file_path, content, timestamp, metadata)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (run_id, file_path, content, datetime.now().isoformat(), metadata_json))
+        Args:
+            row: Row from the runs table.
+            parse_metadata: Whether to decode metadata (otherwise it is left as JSON text).
 
-            self.connection.commit()
-            doc_id = cursor.lastrowid
-            logger.info(f"Stored documentation for run {run_id}: {file_path}")
-            return doc_id
-        except sqlite3.Error as e:
-            logger.error(f"Error storing documentation: {str(e)}")
-            raise ValueError(f"Database error: {str(e)}")
+        Returns:
+            Run record.
+        """
+        run_data = dict(row)
+        if parse_metadata and run_data.get("metadata"):
+            try:
+                run_data["metadata"] = json.loads(run_data["metadata"])
+            except json.JSONDecodeError:
+                logger.warning(f"Invalid metadata JSON for run {run_data['id']}")
+                run_data["metadata"] = {}
+        return run_data
+
+    @staticmethod
+    def _documentation_record(row: sqlite3.Row) -> Dict[str, Any]:
+        """
+        Convert a documentation row joined with its blob to a record.
+
+        Args:
+            row: Row with the documentation columns and the blob's content and compression.
+
+        Returns:
+            Documentation record with decoded content and metadata.
+        """
+        doc_data = dict(row)
+        doc_data["content"] = decode_blob(doc_data["content"], doc_data.pop("compression"))
+
+        # Parse metadata JSON
+        if doc_data.get("metadata"):
+            try:
+                doc_data["metadata"] = json.loads(doc_data["metadata"])
+            except json.JSONDecodeError:
+                logger.warning(f"Invalid metadata JSON for documentation {doc_data['id']}")
+                doc_data["metadata"] = {}
+        return doc_data
+
+    def _run_records(self, connection: sqlite3.Connection, run_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Get runs with their commands and documentation, for archiving.
+
+        Args:
+            connection: Connection to read with.
+            run_ids: IDs of the runs.
+
+        Returns:
+            List of records with "run", "commands" and "documentation", in run order.
+        """
+        placeholders = ", ".join("?" * len(run_ids))
+        records = {
+            row["id"]: {"run": self._run_record(row), "commands": [], "documentation": []}
+            for row in connection.execute(
+                f"SELECT * FROM runs WHERE id IN ({placeholders}) ORDER BY start_time, id", run_ids
+            )
+        }
+        for row in connection.execute(
+            f"SELECT * FROM commands WHERE run_id IN ({placeholders}) ORDER BY id", run_ids
+        ):
+            records[row["run_id"]]["commands"].append(dict(row))
+        for row in connection.execute(f'''
+            SELECT d.*, b.content, b.compression FROM documentation d
+            JOIN doc_blobs b ON b.hash = d.content_hash
+            WHERE d.run_id IN ({placeholders}) ORDER BY d.id
+        ''', run_ids):
+            records[row["run_id"]]["documentation"].append(self._documentation_record(row))
+        return list(records.values())
 
     def get_run(self, run_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -285,26 +1308,17 @@ class DatabaseManager:
             Run details as a dictionary, or None if not found.
         """
         try:
-            cursor = self.connection.cursor()
-
-            cursor.execute("SELECT * FROM runs WHERE id = ?", (run_id,))
-            row = cursor.fetchone()
+            with self.reader() as connection:
+                cursor = connection.cursor()
 
-            if not row:
-                logger.warning(f"Run {run_id} not found")
-                return None
+                cursor.execute("SELECT * FROM runs WHERE id = ?", (run_id,))
+                row = cursor.fetchone()
 
-            run_data = dict(row)
+                if not row:
+                    logger.warning(f"Run {run_id} not found")
+                    return None
 
-            # Parse metadata JSON
-            if run_data.get("metadata"):
-                try:
-                    run_data["metadata"] = json.loads(run_data["metadata"])
-                except json.JSONDecodeError:
-                    logger.warning(f"Invalid metadata JSON for run {run_id}")
-                    run_data["metadata"] = {}
-
-            return run_data
+                return self._run_record(row)
         except sqlite3.Error as e:
             logger.error(f"Error getting run: {str(e)}")
             return None
@@ -320,12 +1334,13 @@ class DatabaseManager:
             List of command records.
         """
         try:
-            cursor = self.connection.cursor()
+            with self.reader() as connection:
+                cursor = connection.cursor()
 
-            cursor.execute("SELECT * FROM commands WHERE run_id = ? ORDER BY id", (run_id,))
-            rows = cursor.fetchall()
+                cursor.execute("SELECT * FROM commands WHERE run_id = ? ORDER BY id", (run_id,))
+                rows = cursor.fetchall()
 
-            return [dict(row) for row in rows]
+                return [dict(row) for row in rows]
         except sqlite3.Error as e:
             logger.error(f"Error getting commands: {str(e)}")
             return []
@@ -341,149 +1356,842 @@ class DatabaseManager:
             List of documentation records.
         """
         try:
-            cursor = self.connection.cursor()
-
-            cursor.execute("SELECT * FROM documentation WHERE run_id = ?", (run_id,))
-            rows = cursor.fetchall()
+            with self.reader() as connection:
+                cursor = connection.cursor()
 
-            docs = []
-            for row in dict(row):
-                doc_data = dict(row)
-
-                # Parse metadata JSON
-                if doc_data.get("metadata"):
-                    try:
-                        doc_data["metadata"] = json.loads(doc_data["metadata"])
-                    except json.JSONDecodeError:
-                        logger.warning(f"Invalid metadata JSON for documentation {doc_data['id']}")
-                        doc_data["metadata"] = {}
+                cursor.execute('''
+                    SELECT d.*, b.content, b.compression FROM documentation d
+                    JOIN doc_blobs b ON b.hash = d.content_hash
+                    WHERE d.run_id = ? ORDER BY d.id
+                ''', (run_id,))
+                rows = cursor.fetchall()
 
-                docs.append(doc_data)
-
-            return docs
+                return [self._documentation_record(row) for row in rows]
         except sqlite3.Error as e:
             logger.error(f"Error getting documentation: {str(e)}")
             return []
 
+    def _runs_query(self, status: Optional[str], success: Optional[bool],
+                    after: Optional[str]) -> Tuple[str, List[Any]]:
+        """
+        Build the query listing runs newest first.
+
+        Args:
+            status: Filter by status.
+            success: Filter by success flag.
+            after: Cursor of the last run already seen.
+
+        Returns:
+            Tuple of query (without LIMIT) and parameters.
+        """
+        query = "SELECT * FROM runs"
+        params: List[Any] = []
+
+        where_clauses = []
+        if status is not None:
+            where_clauses.append("status = ?")
+            params.append(status)
+
+        if success is not None:
+            where_clauses.append("success = ?")
+            params.append(success)
+
+        if after is not None:
+            # Keyset pagination: seek past the cursor on the (start_time, id) index
+            where_clauses.append("(start_time, id) < (?, ?)")
+            params.extend(parse_run_cursor(after))
+
+        if where_clauses:
+            query += f" WHERE {' AND '.join(where_clauses)}"
+
+        query += " ORDER BY start_time DESC, id DESC"
+        return query, params
+
     def list_runs(self, limit: int = 10, offset: int = 0,
-                 status: Optional[str] = None, success: Optional[bool] = None) -> List[Dict[str, Any]]:
+                 status: Optional[str] = None, success: Optional[bool] = None,
+                 after: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        List runs with filtering and pagination.
+        List runs with filtering and pagination, newest first.
+
+        Pages are best fetched with a cursor: pass run_cursor() of the last
+        run of a page as after to get the next one. Unlike offset, this
+        costs the same for every page.
 
         Args:
             limit: Maximum number of runs to return.
             offset: Number of runs to skip.
             status: Filter by status.
             success: Filter by success flag.
+            after: Cursor of the last run already seen.
 
         Returns:
             List of run records.
+
+        Raises:
+            ValueError: If the cursor is malformed.
         """
+        query, params = self._runs_query(status, success, after)
+        query += " LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
         try:
-            cursor = self.connection.cursor()
+            with self.reader() as connection:
+                rows = connection.execute(query, params).fetchall()
+            return [self._run_record(row) for row in rows]
+        except sqlite3.Error as e:
+            logger.error(f"Error listing runs: {str(e)}")
+            return []
 
-            # Build query
-            query = "SELECT * FROM runs"
-            params = []
+    def iter_runs(self, status: Optional[str] = None, success: Optional[bool] = None,
+                  after: Optional[str] = None, parse_metadata: bool = True,
+                  fetch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Stream runs newest first, in constant memory.
 
-            where_clauses = []
-            if status is not None:
-                where_clauses.append("status = ?")
-                params.append(status)
+        Buffered writes are committed first; rows are then read from this
+        thread's read connection, so a slow consumer does not block writers.
 
-            if success is not None:
-                where_clauses.append("success = ?")
-                params.append(success)
+        Args:
+            status: Filter by status.
+            success: Filter by success flag.
+            after: Cursor of the last run already seen.
+            parse_metadata: Whether to decode metadata JSON.
+            fetch_size: Rows fetched per round trip.
 
-            if where_clauses:
-                query += f" WHERE {' AND '.join(where_clauses)}"
+        Yields:
+            Run records.
+        """
+        query, params = self._runs_query(status, success, after)
+        self.flush()
+        with self.pool.reader_connection() as connection:
+            cursor = connection.execute(query, params)
+            try:
+                while True:
+                    rows = cursor.fetchmany(fetch_size)
+                    if not rows:
+                        return
+                    for row in rows:
+                        yield self._run_record(row, parse_metadata)
+            finally:
+                cursor.close()
+
+    def iter_commands(self, run_id: Optional[int] = None, after_id: int = 0,
+                      fetch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Stream command records in ID order, in constant memory.
 
-            query += " ORDER BY start_time DESC LIMIT ? OFFSET ?"
-            params.extend([limit, offset])
+        Args:
+            run_id: Only commands of this run. If None, commands of all runs.
+            after_id: Only commands with a greater ID, to resume an export.
+            fetch_size: Rows fetched per round trip.
 
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
+        Yields:
+            Command records.
+        """
+        if run_id is None:
+            query, params = "SELECT * FROM commands WHERE id > ? ORDER BY id", [after_id]
+        else:
+            query = "SELECT * FROM commands WHERE run_id = ? AND id > ? ORDER BY id"
+            params = [run_id, after_id]
+
+        self.flush()
+        with self.pool.reader_connection() as connection:
+            cursor = connection.execute(query, params)
+            try:
+                while True:
+                    rows = cursor.fetchmany(fetch_size)
+                    if not rows:
+                        return
+                    for row in rows:
+                        yield dict(row)
+            finally:
+                cursor.close()
+
+    def iter_run_records(self, since: Optional[str] = None,
+                         batch_size: int = DEFAULT_EXPORT_BATCH) -> Iterator[Dict[str, Any]]:
+        """
+        Stream runs with their commands and documentation, oldest first, for export.
 
-            runs = []
-            for row in rows:
-                run_data = dict(row)
+        All records come from one consistent snapshot, read on this thread's
+        read connection, so writers are not blocked while they are consumed.
 
-                # Parse metadata JSON
-                if run_data.get("metadata"):
-                    try:
-                        run_data["metadata"] = json.loads(run_data["metadata"])
-                    except json.JSONDecodeError:
-                        logger.warning(f"Invalid metadata JSON for run {run_data['id']}")
-                        run_data["metadata"] = {}
+        Args:
+            since: Only runs started at or after this ISO 8601 date or time.
+            batch_size: Runs read per query.
+
+        Yields:
+            Records with "run", "commands" and "documentation".
+        """
+        query, params = "SELECT id FROM runs ORDER BY start_time, id", []
+        if since is not None:
+            query, params = "SELECT id FROM runs WHERE start_time >= ? ORDER BY start_time, id", [since]
+
+        self.flush()
+        with self.pool.reader_connection() as connection:
+            connection.execute("BEGIN")
+            cursor = connection.execute(query, params)
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        return
+                    yield from self._run_records(connection, [row[0] for row in rows])
+            finally:
+                cursor.close()
+                connection.rollback()
+
+    def import_runs(self, records: Iterable[Dict[str, Any]], batch_size: int = DEFAULT_IMPORT_BATCH,
+                    skip_existing: bool = True) -> Dict[str, int]:
+        """
+        Insert exported run records, with their commands and documentation.
+
+        Records are inserted in transactions of batch_size runs with
+        executemany, so memory use stays bounded by one batch. Runs get new
+        IDs, and their commands and documentation are attached to those.
 
-                runs.append(run_data)
+        Args:
+            records: Records as produced by iter_run_records.
+            batch_size: Runs inserted per transaction.
+            skip_existing: Skip runs whose repository URL and start time are
+                already present, so an interrupted import can be repeated.
 
-            return runs
+        Returns:
+            Counts of imported runs, commands and documentation, and skipped runs.
+
+        Raises:
+            ValueError: If a record is invalid or the database cannot be written.
+        """
+        counts = {"runs": 0, "commands": 0, "documentation": 0, "skipped": 0}
+        batch: List[Dict[str, Any]] = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                self._import_batch(batch, skip_existing, counts)
+                batch = []
+        if batch:
+            self._import_batch(batch, skip_existing, counts)
+
+        logger.info(f"Imported {counts['runs']} runs ({counts['commands']} commands, "
+                    f"{counts['documentation']} documents), skipped {counts['skipped']}")
+        return counts
+
+    def _import_batch(self, records: List[Dict[str, Any]], skip_existing: bool,
+                      counts: Dict[str, int]) -> None:
+        """
+        Insert a batch of run records in one transaction.
+
+        Args:
+            records: Records to insert.
+            skip_existing: Skip runs already present.
+            counts: Counts to update.
+        """
+        def json_text(value: Any) -> Optional[str]:
+            return value if value is None or isinstance(value, str) else json.dumps(value)
+
+        try:
+            with self.transaction() as connection:
+                if skip_existing:
+                    start_times = sorted({record["run"]["start_time"] for record in records})
+                    existing = {tuple(row) for row in connection.execute(
+                        f"SELECT repo_url, start_time FROM runs "
+                        f"WHERE start_time IN ({', '.join('?' * len(start_times))})", start_times
+                    )}
+                    new_records = [record for record in records
+                                   if (record["run"]["repo_url"], record["run"]["start_time"]) not in existing]
+                    counts["skipped"] += len(records) - len(new_records)
+                    records = new_records
+                if not records:
+                    return
+
+                # Allocate IDs past every ID ever used, as AUTOINCREMENT would
+                base_id = connection.execute('''
+                    SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'runs'), 0),
+                               COALESCE((SELECT MAX(id) FROM runs), 0))
+                ''').fetchone()[0]
+
+                runs, commands, docs, blobs = [], [], [], {}
+                for run_id, record in enumerate(records, base_id + 1):
+                    run = record["run"]
+                    runs.append((run_id, run["repo_url"], run["start_time"], run.get("end_time"), run["status"],
+                                 run.get("success"), run.get("summary"), run.get("repository_type"),
+                                 json_text(run.get("metadata"))))
+                    for command in record.get("commands") or []:
+                        values = dict(command)
+                        values["normalized_command"] = (values.get("normalized_command")
+                                                        or normalize_command(values["command"]))
+                        commands.append((run_id, *(values.get(column) for column in EXPORT_COMMAND_COLUMNS)))
+                    for doc in record.get("documentation") or []:
+                        blob = encode_blob(doc["content"])
+                        blobs[blob[0]] = (blob, doc["content"])
+                        docs.append((run_id, doc["file_path"], blob[0], doc.get("timestamp"),
+                                     json_text(doc.get("metadata"))))
+
+                connection.executemany('''
+                    INSERT INTO runs (id, repo_url, start_time, end_time, status, success, summary,
+                                      repository_type, metadata)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', runs)
+                connection.executemany(f'''
+                    INSERT INTO commands (run_id, {", ".join(EXPORT_COMMAND_COLUMNS)})
+                    VALUES (?{", ?" * len(EXPORT_COMMAND_COLUMNS)})
+                ''', commands)
+                cursor = connection.cursor()
+                for blob, content in blobs.values():
+                    self._insert_blob(cursor, blob, content)
+                connection.executemany('''
+                    INSERT INTO documentation (run_id, file_path, content_hash, timestamp, metadata)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', docs)
+
+                counts["runs"] += len(runs)
+                counts["commands"] += len(commands)
+                counts["documentation"] += len(docs)
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"Invalid run record: missing or malformed {str(e)}")
         except sqlite3.Error as e:
-            logger.error(f"Error listing runs: {str(e)}")
+            logger.error(f"Error importing runs: {str(e)}")
+            raise ValueError(f"Database error: {str(e)}")
+
+    def get_execution_times(self, normalized_command: str, limit: int = 200) -> List[float]:
+        """
+        Get recent execution times for a normalized command.
+
+        Args:
+            normalized_command: Command normalized with normalize_command().
+            limit: Maximum number of samples, most recent first.
+
+        Returns:
+            List of execution times (in seconds).
+        """
+        try:
+            with self.reader() as connection:
+                cursor = connection.cursor()
+
+                placeholders = ", ".join("?" * len(FINISHED_STATUSES))
+                cursor.execute(f'''
+                    SELECT execution_time FROM commands
+                    WHERE normalized_command = ? AND execution_time IS NOT NULL
+                      AND status IN ({placeholders})
+                    ORDER BY id DESC LIMIT ?
+                ''', (normalized_command, *FINISHED_STATUSES, limit))
+
+                return [row[0] for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            logger.error(f"Error getting execution times: {str(e)}")
             return []
 
-    def delete_run(self, run_id: int) -> bool:
+    def get_resource_report(self, group_by: str = "command", order_by: str = "peak_memory_bytes",
+                           limit: int = 20) -> List[Dict[str, Any]]:
         """
-        Delete a run and all associated records.
+        Aggregate command resource usage across runs.
 
         Args:
-            run_id: ID of the run to delete.
+            group_by: Grouping key: "command" or "repository_type".
+            order_by: Resource column to sort by (descending), from RESOURCE_COLUMNS.
+            limit: Maximum number of groups to return.
 
         Returns:
-            True if deletion was successful, False otherwise.
+            List of aggregate records with count, average and maximum values.
         """
+        group_columns = {"command": "c.command", "repository_type": "r.repository_type"}
+        if group_by not in group_columns:
+            raise ValueError(f"Invalid group_by: {group_by}")
+        if order_by not in RESOURCE_COLUMNS:
+            raise ValueError(f"Invalid order_by: {order_by}")
+
         try:
-            cursor = self.connection.cursor()
+            with self.reader() as connection:
+                cursor = connection.cursor()
 
-            cursor.execute("DELETE FROM runs WHERE id = ?", (run_id,))
-            self.connection.commit()
+                aggregates = ", ".join(
+                    f"AVG(c.{column}) AS avg_{column}, MAX(c.{column}) AS max_{column}"
+                    for column in RESOURCE_COLUMNS
+                )
+                cursor.execute(f'''
+                    SELECT {group_columns[group_by]} AS name, COUNT(*) AS count,
+                           AVG(c.execution_time) AS avg_execution_time, {aggregates}
+                    FROM commands c JOIN runs r ON r.id = c.run_id
+                    WHERE c.peak_memory_bytes IS NOT NULL OR c.cpu_seconds IS NOT NULL
+                    GROUP BY {group_columns[group_by]}
+                    ORDER BY max_{order_by} DESC
+                    LIMIT ?
+                ''', (limit,))
+
+                return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            logger.error(f"Error building resource report: {str(e)}")
+            return []
+
+    def get_stats(self, group_by: str = "repository_type", limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Get run statistics from the incrementally maintained summaries.
+
+        This reads only the summary tables, so it costs the same regardless
+        of how much history is stored.
+
+        Args:
+            group_by: "repository_type" (most failing runs first), "command"
+                (slowest on average first) or "day" (most recent first).
+            limit: Maximum number of rows to return.
+
+        Returns:
+            List of summary records with counts, success rate and average
+            and total execution time (in seconds).
 
-            deleted = cursor.rowcount > 0
-            if deleted:
-                logger.info(f"Deleted run {run_id} and all associated records")
-            else:
-                logger.warning(f"Run {run_id} not found or not deleted")
+        Raises:
+            ValueError: If group_by is invalid.
+        """
+        queries = {
+            "repository_type": '''
+                SELECT repository_type AS name, runs, successes, runs - successes AS failures,
+                       CAST(successes AS REAL) / runs AS success_rate,
+                       total_seconds / runs AS avg_seconds, total_seconds
+                FROM stats_repository_types WHERE runs > 0
+                ORDER BY failures DESC, runs DESC LIMIT ?
+            ''',
+            "command": '''
+                SELECT normalized_command AS name, executions, successes,
+                       executions - successes AS failures, timeouts,
+                       CAST(successes AS REAL) / executions AS success_rate,
+                       total_seconds / executions AS avg_seconds, max_seconds, total_seconds, last_seen
+                FROM stats_commands WHERE executions > 0
+                ORDER BY avg_seconds DESC LIMIT ?
+            ''',
+            "day": '''
+                SELECT day AS name, runs, successes, runs - successes AS failures,
+                       CAST(successes AS REAL) / runs AS success_rate,
+                       total_seconds / runs AS avg_seconds, total_seconds
+                FROM stats_daily WHERE runs > 0
+                ORDER BY day DESC LIMIT ?
+            ''',
+        }
+        if group_by not in queries:
+            raise ValueError(f"Invalid group_by: {group_by}")
 
-            return deleted
+        try:
+            with self.reader() as connection:
+                return [dict(row) for row in connection.execute(queries[group_by], (limit,))]
         except sqlite3.Error as e:
-            logger.error(f"Error deleting run: {str(e)}")
-            return False
+            logger.error(f"Error getting statistics: {str(e)}")
+            return []
+
+    def search(self, query: str, kind: str = "all", limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Search command text, command errors and documentation, best matches first.
 
-    def delete_old_runs(self, days: int) -> int:
+        The query uses FTS5 syntax (terms, "phrases", OR, NOT, prefix*). A
+        query that is not valid FTS5 syntax is searched as plain terms.
+
+        Args:
+            query: Search query.
+            kind: What to search: "all", "commands" or "documentation".
+            limit: Maximum number of results.
+
+        Returns:
+            List of matches with their run ID, a highlighted snippet and rank
+            (lower is better). Command matches include the command ID, text,
+            status and exit code; documentation matches the file path.
+
+        Raises:
+            ValueError: If kind is invalid or full-text search is unavailable.
+        """
+        if kind not in SEARCH_KINDS:
+            raise ValueError(f"Invalid search kind: {kind}")
+
+        try:
+            return self._search(query, kind, limit)
+        except sqlite3.OperationalError as e:
+            if "no such table" in str(e):
+                raise ValueError("Full-text search is unavailable: SQLite lacks FTS5")
+            if "fts5" not in str(e) and "syntax" not in str(e):
+                logger.error(f"Error searching: {str(e)}")
+                return []
+        # Treat each whitespace-separated word as a literal term
+        literal = " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+        try:
+            return self._search(literal, kind, limit) if literal else []
+        except sqlite3.Error as e:
+            logger.error(f"Error searching: {str(e)}")
+            return []
+
+    def _search(self, query: str, kind: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Run a full-text query.
+
+        Args:
+            query: FTS5 query.
+            kind: What to search: "all", "commands" or "documentation".
+            limit: Maximum number of results.
+
+        Returns:
+            List of matches, best first.
+        """
+        results = []
+        with self.reader() as connection:
+            if kind in ("all", "commands"):
+                rows = connection.execute('''
+                    SELECT c.id, c.run_id, c.command, c.status, c.exit_code,
+                           snippet(commands_fts, -1, '[', ']', '...', 16) AS snippet,
+                           bm25(commands_fts) AS rank
+                    FROM commands_fts JOIN commands c ON c.id = commands_fts.rowid
+                    WHERE commands_fts MATCH ?
+                    ORDER BY rank LIMIT ?
+                ''', (query, limit))
+                results.extend({"type": "command", **dict(row)} for row in rows)
+
+            if kind in ("all", "documentation"):
+                rows = connection.execute('''
+                    SELECT d.run_id, d.file_path, m.snippet, m.rank
+                    FROM (
+                        SELECT b.hash, snippet(doc_fts, 0, '[', ']', '...', 16) AS snippet,
+                               bm25(doc_fts) AS rank
+                        FROM doc_fts JOIN doc_blobs b ON b.rowid = doc_fts.rowid
+                        WHERE doc_fts MATCH ?
+                        ORDER BY rank LIMIT ?
+                    ) m
+                    JOIN documentation d ON d.content_hash = m.hash
+                    ORDER BY m.rank, d.run_id DESC LIMIT ?
+                ''', (query, limit, limit))
+                results.extend({"type": "documentation", **dict(row)} for row in rows)
+
+        results.sort(key=lambda match: match["rank"])
+        return results[:limit]
+
+    def add_checkpoint(self, run_id: int, command_index: int, image: str,
+                       stage: Optional[str] = None) -> int:
+        """
+        Record a checkpoint image for a run.
+
+        Args:
+            run_id: ID of the run.
+            command_index: Index in the run's plan of the last command included in the checkpoint.
+            image: Checkpoint image reference.
+            stage: Installation stage completed by the checkpoint.
+
+        Returns:
+            ID of the created checkpoint record.
+        """
+        with self._lock:
+            try:
+                cursor = self.connection.cursor()
+
+                cursor.execute('''
+                    INSERT INTO checkpoints (run_id, command_index, stage, image, created_at)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (run_id, command_index, stage, image, datetime.now().isoformat()))
+
+                self._commit()
+                logger.info(f"Recorded checkpoint {image} for run {run_id} at command {command_index}")
+                return cursor.lastrowid
+            except sqlite3.Error as e:
+                logger.error(f"Error recording checkpoint: {str(e)}")
+                raise ValueError(f"Database error: {str(e)}")
+
+    def get_checkpoints(self, run_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get checkpoint records, oldest first.
+
+        Args:
+            run_id: ID of the run. If None, checkpoints of all runs are returned.
+
+        Returns:
+            List of checkpoint records.
+        """
+        try:
+            with self.reader() as connection:
+                cursor = connection.cursor()
+
+                if run_id is None:
+                    cursor.execute("SELECT * FROM checkpoints ORDER BY id")
+                else:
+                    cursor.execute("SELECT * FROM checkpoints WHERE run_id = ? ORDER BY id", (run_id,))
+
+                return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            logger.error(f"Error getting checkpoints: {str(e)}")
+            return []
+
+    def get_latest_checkpoint(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the checkpoint covering the most commands of a run.
+
+        Args:
+            run_id: ID of the run.
+
+        Returns:
+            Checkpoint record, or None if the run has no checkpoints.
+        """
+        try:
+            with self.reader() as connection:
+                cursor = connection.cursor()
+
+                cursor.execute('''
+                    SELECT * FROM checkpoints WHERE run_id = ?
+                    ORDER BY command_index DESC, id DESC LIMIT 1
+                ''', (run_id,))
+                row = cursor.fetchone()
+
+                return dict(row) if row else None
+        except sqlite3.Error as e:
+            logger.error(f"Error getting latest checkpoint: {str(e)}")
+            return None
+
+    def delete_checkpoints(self, run_id: Optional[int] = None,
+                           images: Optional[List[str]] = None) -> int:
+        """
+        Delete checkpoint records by run or by image.
+
+        Args:
+            run_id: Delete all checkpoints of this run.
+            images: Delete checkpoints with these image references.
+
+        Returns:
+            Number of deleted records.
+        """
+        with self._lock:
+            try:
+                cursor = self.connection.cursor()
+
+                deleted = 0
+                if run_id is not None:
+                    cursor.execute("DELETE FROM checkpoints WHERE run_id = ?", (run_id,))
+                    deleted += cursor.rowcount
+                if images:
+                    cursor.executemany("DELETE FROM checkpoints WHERE image = ?", [(i,) for i in images])
+                    deleted += cursor.rowcount
+
+                self._commit()
+                return deleted
+            except sqlite3.Error as e:
+                logger.error(f"Error deleting checkpoints: {str(e)}")
+                return 0
+
+    def _delete_unreferenced_blobs(self, hashes: Optional[List[str]] = None) -> int:
+        """
+        Delete documentation blobs no longer referenced by any run.
+
+        Must be called with self._lock held.
+
+        Args:
+            hashes: Candidate blob hashes. If None, all blobs are checked.
+
+        Returns:
+            Number of deleted blobs.
+        """
+        unreferenced = "NOT EXISTS (SELECT 1 FROM documentation d WHERE d.content_hash = doc_blobs.hash)"
+        if hashes is None:
+            cursor = self.connection.execute(f"DELETE FROM doc_blobs WHERE {unreferenced}")
+            return cursor.rowcount
+        if not hashes:
+            return 0
+        cursor = self.connection.executemany(
+            f"DELETE FROM doc_blobs WHERE hash = ? AND {unreferenced}", [(h,) for h in hashes]
+        )
+        return cursor.rowcount
+
+    def delete_run(self, run_id: int) -> bool:
+        """
+        Delete a run and all associated records.
+
+        Args:
+            run_id: ID of the run to delete.
+
+        Returns:
+            True if deletion was successful, False otherwise.
+        """
+        with self._lock:
+            try:
+                cursor = self.connection.cursor()
+
+                cursor.execute("SELECT DISTINCT content_hash FROM documentation WHERE run_id = ?", (run_id,))
+                hashes = [row[0] for row in cursor.fetchall()]
+
+                cursor.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+                deleted = cursor.rowcount > 0
+                self._delete_unreferenced_blobs(hashes)
+                self._commit(force=True)
+
+                if deleted:
+                    logger.info(f"Deleted run {run_id} and all associated records")
+                else:
+                    logger.warning(f"Run {run_id} not found or not deleted")
+
+                return deleted
+            except sqlite3.Error as e:
+                logger.error(f"Error deleting run: {str(e)}")
+                return False
+
+    def delete_old_runs(self, days: int, batch_size: int = DEFAULT_DELETE_BATCH,
+                        archive: Optional["RunArchiveWriter"] = None) -> int:
         """
         Delete runs older than a specified number of days.
 
+        Runs are deleted oldest first in batches, each in a short transaction
+        of its own, so concurrent writers wait for at most one batch. With an
+        archive, each batch is written and flushed to it before it is deleted,
+        and its runs are removed from the statistics, so importing the archive
+        later does not count them twice. The archive must be incremental, so
+        runs already deleted survive if cleanup is interrupted.
+        Freed space is reused by later writes; incremental_vacuum() returns it
+        to the file system.
+
         Args:
             days: Delete runs older than this many days.
+            batch_size: Runs deleted per transaction.
+            archive: Archive to export the runs to before deleting them.
 
         Returns:
             Number of deleted runs.
+
+        Raises:
+            ValueError: If the archive format is not incremental, such as Parquet.
         """
-        try:
-            cursor = self.connection.cursor()
+        if archive is not None and not archive.incremental:
+            raise ValueError(f"Cannot archive deleted runs as {archive.format}: "
+                             f"the archive is unreadable until closed")
+        batch_size = max(1, batch_size)
+
+        # Calculate cutoff date
+        cutoff_date = datetime.now().timestamp() - (days * 24 * 60 * 60)
+        cutoff_date_str = datetime.fromtimestamp(cutoff_date).isoformat()
+
+        deleted_count = 0
+        while True:
+            with self._lock:
+                try:
+                    # Commit buffered writes, so a failed batch rolls back only itself
+                    self._flush_locked()
+                    cursor = self.connection.cursor()
+
+                    cursor.execute("SELECT id FROM runs WHERE start_time < ? ORDER BY start_time, id LIMIT ?",
+                                   (cutoff_date_str, batch_size))
+                    run_ids = [row[0] for row in cursor.fetchall()]
+                    if not run_ids:
+                        break
+
+                    if archive is not None:
+                        for record in self._run_records(self.connection, run_ids):
+                            archive.write(record)
+                        archive.flush()
+                        _retract_run_statistics(cursor, run_ids)
+
+                    placeholders = ", ".join("?" * len(run_ids))
+                    cursor.execute(f"SELECT DISTINCT content_hash FROM documentation "
+                                   f"WHERE run_id IN ({placeholders})", run_ids)
+                    hashes = [row[0] for row in cursor.fetchall()]
+
+                    cursor.execute(f"DELETE FROM runs WHERE id IN ({placeholders})", run_ids)
+                    deleted_count += cursor.rowcount
+                    self._delete_unreferenced_blobs(hashes)
+                    self._commit(force=True)
+                except sqlite3.Error as e:
+                    self.connection.rollback()
+                    logger.error(f"Error deleting old runs: {str(e)}")
+                    break
+
+            if len(run_ids) < batch_size:
+                break
+            time.sleep(RETENTION_PAUSE)
+
+        logger.info(f"Deleted {deleted_count} runs older than {days} days")
+        return deleted_count
+
+    def incremental_vacuum(self, max_pages: Optional[int] = None) -> int:
+        """
+        Return free pages to the file system.
 
-            # Calculate cutoff date
-            cutoff_date = datetime.now().timestamp() - (days * 24 * 60 * 60)
-            cutoff_date_str = datetime.fromtimestamp(cutoff_date).isoformat()
+        Pages are released in small steps, each a short transaction of its
+        own, so writers are not blocked. Databases created before incremental
+        vacuum was enabled must be converted once with compact().
 
-            cursor.execute("DELETE FROM runs WHERE start_time < ?", (cutoff_date_str,))
-            self.connection.commit()
+        Args:
+            max_pages: Maximum number of pages to release. If None, releases all.
 
-            deleted_count = cursor.rowcount
-            logger.info(f"Deleted {deleted_count} runs older than {days} days")
-            return deleted_count
+        Returns:
+            Number of bytes released.
+        """
+        released = 0
+        page_size = 0
+        try:
+            with self._lock:
+                if self.connection.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                    logger.info("Incremental vacuum is not enabled for this database; compact it once to enable it")
+                    return 0
+                page_size = self.connection.execute("PRAGMA page_size").fetchone()[0]
+
+            while max_pages is None or released < max_pages:
+                with self._lock:
+                    self._flush_locked()
+                    free = self.connection.execute("PRAGMA freelist_count").fetchone()[0]
+                    step = min(free, VACUUM_STEP_PAGES)
+                    if max_pages is not None:
+                        step = min(step, max_pages - released)
+                    if step <= 0:
+                        break
+                    # executescript steps the pragma to completion; execute()
+                    # would release a single page
+                    retry_busy(lambda: self.connection.executescript(f"PRAGMA incremental_vacuum({step})"))
+                    remaining = self.connection.execute("PRAGMA freelist_count").fetchone()[0]
+                if remaining >= free:
+                    break
+                released += free - remaining
+                time.sleep(RETENTION_PAUSE)
+
+            # The file shrinks when the WAL is checkpointed; a passive
+            # checkpoint does not wait for readers
+            with self._lock:
+                self.connection.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchall()
         except sqlite3.Error as e:
-            logger.error(f"Error deleting old runs: {str(e)}")
-            return 0
+            logger.error(f"Error vacuuming database: {str(e)}")
+
+        logger.info(f"Released {released} free database pages")
+        return released * page_size
+
+    def compact(self) -> int:
+        """
+        Rebuild the database file with VACUUM, enabling incremental vacuum.
+
+        Unlike incremental_vacuum(), this blocks all writers while the whole
+        file is rewritten; it is only needed once for older databases.
+
+        Returns:
+            Number of bytes released.
+
+        Raises:
+            ValueError: If the database cannot be rebuilt.
+        """
+        size_query = "SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()"
+        with self._lock:
+            try:
+                self._flush_locked()
+                before = self.connection.execute(size_query).fetchone()[0]
+                self.connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                retry_busy(lambda: self.connection.execute("VACUUM"))
+                self.connection.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchall()
+                after = self.connection.execute(size_query).fetchone()[0]
+                logger.info(f"Compacted database from {before} to {after} bytes")
+                return before - after
+            except sqlite3.Error as e:
+                logger.error(f"Error compacting database: {str(e)}")
+                raise ValueError(f"Database error: {str(e)}")
 
     def close(self) -> None:
         """
-        Close the database connection.
+        Commit buffered writes and close the database connection.
         """
-        if self.connection:
-            self.connection.close()
-            logger.info("Database connection closed")
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._flush_event.set()
+            if self.connection:
+                try:
+                    self._flush_locked()
+                except sqlite3.Error as e:
+                    logger.error(f"Error committing buffered writes: {str(e)}")
+                self.pool.close()
+                self.connection = None
+                logger.info("Database connection closed")
 
     def __del__(self) -> None:
         """
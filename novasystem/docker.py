@@ -9,6 +9,7 @@ import logging
 import tempfile
 import time
 import json
+import threading
 from typing import List, Dict, Any, Optional, Tuple, Union
 import shutil
 import docker
@@ -16,64 +17,152 @@ from docker.errors import DockerException, ImageNotFound, ContainerError
 import subprocess
 
 from .parser import Command, CommandType
+from .cache import CacheVolumeManager, image_family
+from .checkpoints import CheckpointStore
+from .executor import CommandResult, validate_command
+from .scheduler import ResourceScheduler, Reservation, PRIORITY_NORMAL, get_default_scheduler
+from .workspace import WorkspaceArchiveCache, get_default_archive_cache
 
 logger = logging.getLogger(__name__)
 
-class CommandResult:
-    """Result of a command execution."""
+# Exit codes of coreutils timeout(1) when the command was stopped (TERM) or killed
+TIMEOUT_EXIT_CODES = (124, 137)
 
-    def __init__(
-        self,
-        command: str,
-        exit_code: int,
-        output: str,
-        error: str,
-        execution_time: float,
-        status: str = "completed",
-    ):
+# Seconds between timeout(1) sending TERM and KILL
+TIMEOUT_KILL_GRACE = 10
+
+class ContainerStatsSampler:
+    """
+    Samples a container's resource usage while a command executes.
+
+    Cumulative counters (CPU time, block and network I/O) are measured as the
+    difference between snapshots taken before and after the command; memory
+    is the peak of the samples streamed by the Docker daemon in between.
+    """
+
+    def __init__(self, container):
         """
-        Initialize a CommandResult.
+        Initialize the ContainerStatsSampler.
 
         Args:
-            command: The executed command.
-            exit_code: Exit code of the command.
-            output: Standard output from the command.
-            error: Standard error from the command.
-            execution_time: Time taken to execute the command (in seconds).
-            status: Status of the execution (completed, error, timeout).
-        """
-        self.command = command
-        self.exit_code = exit_code
-        self.output = output
-        self.error = error
-        self.execution_time = execution_time
-        self.status = status
-
-    def is_success(self) -> bool:
-        """Check if the command execution was successful."""
-        return self.exit_code == 0 and self.status == "completed"
-
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert result to dictionary representation."""
+            container: Docker container to sample.
+        """
+        self.container = container
+        self.peak_memory = 0
+        self._baseline: Optional[Dict[str, Any]] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Take the baseline snapshot and start streaming samples.
+        """
+        self._baseline = self._snapshot()
+        self._thread = threading.Thread(target=self._run, name="novasystem-stats", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Optional[Dict[str, Any]]:
+        """
+        Stop sampling and compute the resources used since start().
+
+        Returns:
+            Resource usage dictionary, or None if no stats were available.
+        """
+        self._stop_event.set()
+        final = self._snapshot()
+        if self._thread:
+            # The stream yields roughly once per second; don't wait on it
+            self._thread.join(timeout=0.1)
+
+        if not self._baseline or not final:
+            return None
+
+        self._record_memory(final)
+        block_read, block_write = self._block_io(final)
+        base_read, base_write = self._block_io(self._baseline)
+        net_rx, net_tx = self._network_io(final)
+        base_rx, base_tx = self._network_io(self._baseline)
+
         return {
-            "command": self.command,
-            "exit_code": self.exit_code,
-            "output": self.output,
-            "error": self.error,
-            "execution_time": self.execution_time,
-            "status": self.status,
-            "success": self.is_success(),
+            "peak_memory_bytes": self.peak_memory or None,
+            "cpu_seconds": max(self._cpu_ns(final) - self._cpu_ns(self._baseline), 0) / 1e9,
+            "block_read_bytes": max(block_read - base_read, 0),
+            "block_write_bytes": max(block_write - base_write, 0),
+            "net_rx_bytes": max(net_rx - base_rx, 0),
+            "net_tx_bytes": max(net_tx - base_tx, 0),
         }
 
-    def __str__(self) -> str:
-        """String representation of the command result."""
-        status_str = "Success" if self.is_success() else f"Failed (exit code: {self.exit_code})"
-        return f"Command '{self.command}': {status_str}"
+    def _run(self) -> None:
+        """
+        Consume the daemon's stats stream until stopped.
+        """
+        try:
+            for stats in self.container.stats(stream=True, decode=True):
+                self._record_memory(stats)
+                if self._stop_event.is_set():
+                    break
+        except Exception as e:
+            logger.debug(f"Container stats stream ended: {str(e)}")
+
+    def _snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        Take a single stats snapshot without waiting for a second sample.
+
+        Returns:
+            Raw stats dictionary, or None if unavailable.
+        """
+        try:
+            stats = self.container.stats(stream=False, one_shot=True)
+            self._record_memory(stats)
+            return stats
+        except Exception as e:
+            logger.debug(f"Failed to read container stats: {str(e)}")
+            return None
+
+    def _record_memory(self, stats: Dict[str, Any]) -> None:
+        """
+        Update the peak memory from a stats sample.
+
+        Page cache is excluded so the figure approximates resident memory.
+
+        Args:
+            stats: Raw stats dictionary.
+        """
+        memory = stats.get("memory_stats") or {}
+        usage = memory.get("usage")
+        if usage is None:
+            return
+        details = memory.get("stats") or {}
+        # cgroup v2 reports inactive_file, cgroup v1 reports total_inactive_file
+        cache = details.get("inactive_file", details.get("total_inactive_file", 0))
+        self.peak_memory = max(self.peak_memory, usage - cache)
+
+    @staticmethod
+    def _cpu_ns(stats: Dict[str, Any]) -> int:
+        """Get cumulative CPU time (in nanoseconds) from a stats sample."""
+        return ((stats.get("cpu_stats") or {}).get("cpu_usage") or {}).get("total_usage", 0)
+
+    @staticmethod
+    def _block_io(stats: Dict[str, Any]) -> Tuple[int, int]:
+        """Get cumulative block bytes (read, written) from a stats sample."""
+        entries = (stats.get("blkio_stats") or {}).get("io_service_bytes_recursive") or []
+        read = sum(e.get("value", 0) for e in entries if e.get("op", "").lower() == "read")
+        write = sum(e.get("value", 0) for e in entries if e.get("op", "").lower() == "write")
+        return read, write
+
+    @staticmethod
+    def _network_io(stats: Dict[str, Any]) -> Tuple[int, int]:
+        """Get cumulative network bytes (received, sent) from a stats sample."""
+        networks = (stats.get("networks") or {}).values()
+        return (sum(n.get("rx_bytes", 0) for n in networks),
+                sum(n.get("tx_bytes", 0) for n in networks))
 
 
 class DockerExecutor:
     """
     Executes commands in isolated Docker containers.
+
+    This is the default implementation of the Executor protocol.
     """
 
     def __init__(
@@ -84,6 +173,14 @@ class DockerExecutor:
         cpu_limit: float = 1.0,
         network_mode: str = "none",
         test_mode: bool = False,
+        cache_volumes: bool = True,
+        cache_family: Optional[str] = None,
+        collect_stats: bool = True,
+        scheduler: Optional[ResourceScheduler] = None,
+        priority: int = PRIORITY_NORMAL,
+        use_scheduler: bool = True,
+        workspace_mode: str = "bind",
+        workspace_cache: Optional[WorkspaceArchiveCache] = None,
     ):
         """
         Initialize the DockerExecutor.
@@ -95,6 +192,17 @@ class DockerExecutor:
             cpu_limit: CPU limit for containers.
             network_mode: Network mode for containers (none, bridge, host).
             test_mode: Run in test mode (no actual Docker commands).
+            cache_volumes: Mount shared package-manager cache volumes into containers.
+            cache_family: Cache family for the volumes. If None, derived from the image name.
+            collect_stats: Sample container resource usage during each command.
+            scheduler: Admission scheduler shared with other executors. If None,
+                the process-wide default scheduler is used.
+            priority: Scheduling priority of this executor's containers.
+            use_scheduler: Wait for admission before starting containers.
+            workspace_mode: How the repository reaches the container: "bind" mounts it
+                read-only, "archive" streams a writable copy in with put_archive.
+            workspace_cache: Archive cache for "archive" mode. If None, the
+                process-wide default cache is used.
         """
         self.image_name = image_name
         self.timeout = timeout
@@ -102,9 +210,19 @@ class DockerExecutor:
         self.cpu_limit = cpu_limit
         self.network_mode = network_mode
         self.test_mode = test_mode
+        self.collect_stats = collect_stats
+        self.priority = priority
+        self.scheduler = (scheduler or get_default_scheduler()) if use_scheduler and not test_mode else None
+        self.reservation: Optional[Reservation] = None
+        if workspace_mode not in ("bind", "archive"):
+            raise ValueError(f"Invalid workspace mode: {workspace_mode}")
+        self.workspace_mode = workspace_mode
+        self._workspace_cache = workspace_cache
         self.client = None
         self.container = None
         self.container_id = None
+        self.cache_manager = None
+        self.checkpoint_store = None
 
         if not test_mode:
             try:
@@ -114,6 +232,14 @@ class DockerExecutor:
                 logger.error(f"Failed to initialize Docker client: {str(e)}")
                 raise ValueError(f"Docker initialization error: {str(e)}")
 
+            self.checkpoint_store = CheckpointStore(self.client)
+
+            if cache_volumes:
+                self.cache_manager = CacheVolumeManager(
+                    self.client,
+                    family=cache_family or image_family(image_name)
+                )
+
     def create_image(self) -> bool:
         """
         Create the base Docker image for NovaSystem.
@@ -150,6 +276,10 @@ RUN groupadd -r novauser && useradd --no-log-init -r -g novauser novauser
 # Create work directory
 RUN mkdir -p /app && chown novauser:novauser /app
 
+# Create package cache mount points so named volumes inherit the ownership
+RUN mkdir -p /cache/pip /cache/npm /cache/yarn /cache/cargo /cache/go \\
+    && chown -R novauser:novauser /cache
+
 # Set working directory
 WORKDIR /app
 
@@ -198,12 +328,14 @@ CMD ["/bin/bash"]
             logger.error(f"Error checking Docker image: {str(e)}")
             return False
 
-    def start_container(self, repo_dir: Optional[str] = None) -> Optional[str]:
+    def start_container(self, repo_dir: Optional[str] = None, image: Optional[str] = None) -> Optional[str]:
         """
         Start a Docker container for executing commands.
 
         Args:
             repo_dir: Path to the repository directory to mount in the container.
+            image: Checkpoint image to start from instead of the base image.
+                In "archive" mode the checkpoint already contains the workspace.
 
         Returns:
             Container ID if successful, None otherwise.
@@ -212,7 +344,11 @@ CMD ["/bin/bash"]
             self.container_id = "test-container-id"
             return self.container_id
 
-        if not self.check_image_exists():
+        if image is not None:
+            if not self.checkpoint_store.exists(image):
+                logger.error(f"Checkpoint image {image} not found")
+                return None
+        elif not self.check_image_exists():
             logger.warning(f"Docker image {self.image_name} not found.")
             success = self.create_image()
             if not success:
@@ -221,16 +357,39 @@ CMD ["/bin/bash"]
 
         # Prepare volumes to mount
         volumes = {}
+        archive_future = None
         if repo_dir and os.path.exists(repo_dir):
-            # Mount the repository directory as read-only
-            volumes[repo_dir] = {"bind": "/app/repo", "mode": "ro"}
+            if self.workspace_mode == "archive":
+                # Usually already built in the background by prepare_workspace
+                if image is None:
+                    archive_future = self.workspace_cache.prefetch(repo_dir)
+            else:
+                # Mount the repository directory as read-only
+                volumes[repo_dir] = {"bind": "/app/repo", "mode": "ro"}
+
+        environment = {}
+
+        # Wait until the host has room for this container
+        if self.scheduler:
+            self.reservation = self.scheduler.acquire(
+                self.memory_limit,
+                self.cpu_limit,
+                priority=self.priority,
+                on_preempt=self._on_preempt
+            )
 
         try:
+            # Mount the shared package-manager caches
+            if self.cache_manager:
+                volumes.update(self.cache_manager.volume_bindings())
+                environment.update(self.cache_manager.environment())
+
             # Create and start the container
             self.container = self.client.containers.run(
-                self.image_name,
+                image or self.image_name,
                 detach=True,
                 volumes=volumes,
+                environment=environment,
                 mem_limit=self.memory_limit,
                 cpu_quota=int(100000 * self.cpu_limit),
                 network_mode=self.network_mode,
@@ -240,11 +399,56 @@ CMD ["/bin/bash"]
             )
             self.container_id = self.container.id
             logger.info(f"Started Docker container {self.container_id}")
+
+            if archive_future is not None:
+                self._inject_workspace(archive_future.result())
+
             return self.container_id
-        except DockerException as e:
+        except Exception as e:
             logger.error(f"Failed to start Docker container: {str(e)}")
+            if self.container_id:
+                self.stop_container()
+            else:
+                self._release_reservation()
             return None
 
+    @property
+    def workspace_cache(self) -> WorkspaceArchiveCache:
+        """Archive cache used by the "archive" workspace mode."""
+        if self._workspace_cache is None:
+            self._workspace_cache = get_default_archive_cache()
+        return self._workspace_cache
+
+    def prepare_workspace(self, repo_dir: str) -> None:
+        """
+        Start building the repository's workspace archive in the background.
+
+        Called as soon as the repository is available so that the archive is
+        ready by the time a container starts. A no-op in "bind" mode.
+
+        Args:
+            repo_dir: Path to the repository directory.
+        """
+        if self.workspace_mode == "archive" and not self.test_mode and repo_dir:
+            self.workspace_cache.prefetch(repo_dir)
+
+    def _inject_workspace(self, archive_path: str) -> None:
+        """
+        Stream a workspace archive into the container at /app/repo.
+
+        Args:
+            archive_path: Path to the tarball.
+
+        Raises:
+            DockerException: If the archive could not be copied.
+        """
+        start_time = time.time()
+        with open(archive_path, "rb") as f:
+            if not self.container.put_archive("/app", f):
+                raise DockerException(f"Failed to copy workspace archive into {self.container_id}")
+        logger.info(f"Injected workspace archive into {self.container_id} "
+                    f"in {time.time() - start_time:.2f}s")
+
     def execute_command(self, command: Union[str, Command], timeout: Optional[int] = None) -> CommandResult:
         """
         Execute a command in the Docker container.
@@ -287,6 +491,18 @@ CMD ["/bin/bash"]
                 status="error"
             )
 
+        if self.reservation and self.reservation.preempted.is_set():
+            error_msg = "Container was preempted by higher-priority work"
+            logger.warning(error_msg)
+            return CommandResult(
+                command=command_str,
+                exit_code=-1,
+                output="",
+                error=error_msg,
+                execution_time=0,
+                status="preempted"
+            )
+
         # Validate the command for security
         if not self._validate_command(command_str):
             error_msg = f"Command validation failed: {command_str}"
@@ -316,11 +532,20 @@ CMD ["/bin/bash"]
             )
 
         # Execute the command
+        sampler = ContainerStatsSampler(container) if self.collect_stats else None
+        if sampler:
+            sampler.start()
         start_time = time.time()
         timeout_value = timeout or self.timeout
         try:
-            exec_result = container.exec_run(command_str, tty=True, demux=True, timeout=timeout_value)
+            # The Docker API has no exec timeout, so enforce it inside the container
+            exec_result = container.exec_run(
+                ["timeout", "-k", str(TIMEOUT_KILL_GRACE), str(timeout_value), "sh", "-c", command_str],
+                tty=True,
+                demux=True
+            )
             execution_time = time.time() - start_time
+            resource_usage = sampler.stop() if sampler else None
 
             stdout = exec_result.output[0] or b""
             stderr = exec_result.output[1] or b""
@@ -329,6 +554,18 @@ CMD ["/bin/bash"]
             stdout_str = stdout.decode("utf-8", errors="replace")
             stderr_str = stderr.decode("utf-8", errors="replace")
 
+            if exec_result.exit_code in TIMEOUT_EXIT_CODES and execution_time >= timeout_value:
+                logger.warning(f"Command execution timed out after {timeout_value} seconds: {command_str}")
+                return CommandResult(
+                    command=command_str,
+                    exit_code=-1,
+                    output=stdout_str,
+                    error=stderr_str + f"Command execution timed out after {timeout_value} seconds",
+                    execution_time=execution_time,
+                    status="timeout",
+                    resource_usage=resource_usage
+                )
+
             logger.info(f"Command '{command_str}' executed with exit code {exec_result.exit_code}")
 
             return CommandResult(
@@ -337,10 +574,12 @@ CMD ["/bin/bash"]
                 output=stdout_str,
                 error=stderr_str,
                 execution_time=execution_time,
-                status="completed"
+                status="completed",
+                resource_usage=resource_usage
             )
         except ContainerError as e:
             execution_time = time.time() - start_time
+            resource_usage = sampler.stop() if sampler else None
             logger.error(f"Container error executing command: {str(e)}")
             return CommandResult(
                 command=command_str,
@@ -348,10 +587,12 @@ CMD ["/bin/bash"]
                 output="",
                 error=str(e),
                 execution_time=execution_time,
-                status="error"
+                status="error",
+                resource_usage=resource_usage
             )
         except Exception as e:
             execution_time = time.time() - start_time
+            resource_usage = sampler.stop() if sampler else None
             if "timeout" in str(e).lower():
                 logger.warning(f"Command execution timed out after {timeout_value} seconds: {command_str}")
                 return CommandResult(
@@ -360,7 +601,8 @@ CMD ["/bin/bash"]
                     output="",
                     error=f"Command execution timed out after {timeout_value} seconds",
                     execution_time=execution_time,
-                    status="timeout"
+                    status="timeout",
+                    resource_usage=resource_usage
                 )
             else:
                 logger.error(f"Error executing command: {str(e)}")
@@ -370,7 +612,8 @@ CMD ["/bin/bash"]
                     output="",
                     error=str(e),
                     execution_time=execution_time,
-                    status="error"
+                    status="error",
+                    resource_usage=resource_usage
                 )
 
     def run_commands(self, repo_dir: str, commands: List[Union[str, Command]]) -> List[CommandResult]:
@@ -424,24 +667,7 @@ CMD ["/bin/bash"]
         Returns:
             True if the command is safe to execute, False otherwise.
         """
-        # List of dangerous commands or patterns
-        dangerous_patterns = [
-            "rm -rf /",
-            "rm -rf /*",
-            "> /dev/sda",
-            "mkfs",
-            ":(){:|:&};:",
-            "dd if=/dev/random",
-            "wget -O- | bash",
-            "curl | bash",
-        ]
-
-        for pattern in dangerous_patterns:
-            if pattern in command:
-                logger.warning(f"Dangerous command pattern detected: {pattern}")
-                return False
-
-        return True
+        return validate_command(command)
 
     def stop_container(self) -> bool:
         """
@@ -468,6 +694,71 @@ CMD ["/bin/bash"]
         except DockerException as e:
             logger.error(f"Error stopping Docker container: {str(e)}")
             return False
+        finally:
+            self._release_reservation()
+
+    def checkpoint(self, tag: str, labels: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """
+        Commit the running container to a checkpoint image.
+
+        Args:
+            tag: Image tag, unique per checkpoint.
+            labels: Extra image labels.
+
+        Returns:
+            Image reference to pass to start_container, or None if no checkpoint was made.
+        """
+        if self.test_mode:
+            logger.info("Test mode: Skipping checkpoint")
+            return None
+
+        if not self.container:
+            logger.warning("No container to checkpoint")
+            return None
+
+        return self.checkpoint_store.commit(self.container, tag, labels)
+
+    def remove_checkpoint(self, image: str) -> bool:
+        """
+        Delete a checkpoint image.
+
+        Args:
+            image: Image reference returned by checkpoint().
+
+        Returns:
+            True if the image was removed or did not exist.
+        """
+        if self.test_mode:
+            return True
+
+        return self.checkpoint_store.remove(image)
+
+    def _release_reservation(self) -> None:
+        """
+        Return this executor's resources to the scheduler.
+        """
+        if self.scheduler and self.reservation:
+            self.scheduler.release(self.reservation)
+        self.reservation = None
+
+    def _on_preempt(self, reservation: Reservation) -> None:
+        """
+        Give way to higher-priority work by stopping the running container.
+
+        The command in flight fails and later commands report status "preempted".
+
+        Args:
+            reservation: The preempted reservation.
+        """
+        logger.warning(f"Stopping container {self.container_id} for higher-priority work")
+        try:
+            if self.container_id:
+                self.client.containers.get(self.container_id).kill()
+        except DockerException as e:
+            logger.error(f"Error stopping preempted container: {str(e)}")
+        finally:
+            if self.scheduler:
+                self.scheduler.release(reservation)
 
     def get_installation_script(self, commands: List[Union[str, Command]]) -> str:
         """
@@ -0,0 +1,520 @@
+"""
+Command Execution Backends for NovaSystem.
+
+This module defines the Executor protocol shared by all execution backends,
+and a local backend that runs commands in a throwaway directory via subprocess.
+"""
+
+import os
+import sys
+import shutil
+import signal
+import logging
+import tempfile
+import threading
+import subprocess
+import time
+from typing import List, Dict, Any, Optional, Union, Callable, Protocol, runtime_checkable
+
+from .parser import Command
+from .cache import parse_size
+
+logger = logging.getLogger(__name__)
+
+# Callback receiving (stream name, line) for each line of output as it is produced
+OutputCallback = Callable[[str, str], None]
+
+# Dangerous commands or patterns rejected by every backend
+DANGEROUS_PATTERNS = [
+    "rm -rf /",
+    "rm -rf /*",
+    "> /dev/sda",
+    "mkfs",
+    ":(){:|:&};:",
+    "dd if=/dev/random",
+    "wget -O- | bash",
+    "curl | bash",
+]
+
+# Seconds to wait for output still buffered in a finished command's pipes
+OUTPUT_DRAIN_TIMEOUT = 2
+
+
+class CommandResult:
+    """Result of a command execution."""
+
+    def __init__(
+        self,
+        command: str,
+        exit_code: int,
+        output: str,
+        error: str,
+        execution_time: float,
+        status: str = "completed",
+        resource_usage: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize a CommandResult.
+
+        Args:
+            command: The executed command.
+            exit_code: Exit code of the command.
+            output: Standard output from the command.
+            error: Standard error from the command.
+            execution_time: Time taken to execute the command (in seconds).
+            status: Status of the execution (completed, error, timeout).
+            resource_usage: Resources consumed by the command (peak_memory_bytes,
+                cpu_seconds, block_read_bytes, block_write_bytes, net_rx_bytes,
+                net_tx_bytes), if the backend measures them.
+        """
+        self.command = command
+        self.exit_code = exit_code
+        self.output = output
+        self.error = error
+        self.execution_time = execution_time
+        self.status = status
+        self.resource_usage = resource_usage
+
+    def is_success(self) -> bool:
+        """Check if the command execution was successful."""
+        return self.exit_code == 0 and self.status == "completed"
+
+    @property
+    def successful(self) -> bool:
+        """Whether the command execution was successful."""
+        return self.is_success()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert result to dictionary representation."""
+        return {
+            "command": self.command,
+            "exit_code": self.exit_code,
+            "output": self.output,
+            "error": self.error,
+            "execution_time": self.execution_time,
+            "status": self.status,
+            "success": self.is_success(),
+            "resource_usage": self.resource_usage,
+        }
+
+    def __str__(self) -> str:
+        """String representation of the command result."""
+        status_str = "Success" if self.is_success() else f"Failed (exit code: {self.exit_code})"
+        return f"Command '{self.command}': {status_str}"
+
+
+@runtime_checkable
+class Executor(Protocol):
+    """
+    Interface implemented by command execution backends.
+
+    A backend owns one isolated environment at a time ("container"), started
+    with start_container and torn down with stop_container.
+    """
+
+    def check_image_exists(self) -> bool:
+        """Check whether the backend's base environment is available."""
+        ...
+
+    def create_image(self) -> bool:
+        """Create the backend's base environment."""
+        ...
+
+    def prepare_workspace(self, repo_dir: str) -> None:
+        """Start any background work needed before the repository can be used."""
+        ...
+
+    def start_container(self, repo_dir: Optional[str] = None, image: Optional[str] = None) -> Optional[str]:
+        """Start an isolated environment, optionally containing the repository or from a checkpoint."""
+        ...
+
+    def execute_command(self, command: Union[str, Command], timeout: Optional[int] = None) -> CommandResult:
+        """Execute a command in the isolated environment."""
+        ...
+
+    def stop_container(self) -> bool:
+        """Tear down the isolated environment."""
+        ...
+
+    def checkpoint(self, tag: str, labels: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """Snapshot the isolated environment; returns an image usable by start_container, or None."""
+        ...
+
+    def remove_checkpoint(self, image: str) -> bool:
+        """Delete a snapshot created by checkpoint."""
+        ...
+
+    def run_commands(self, repo_dir: str, commands: List[Union[str, Command]]) -> List[CommandResult]:
+        """Run a sequence of commands in a fresh environment."""
+        ...
+
+
+def validate_command(command: str) -> bool:
+    """
+    Validate a command for security concerns.
+
+    Args:
+        command: Command to validate.
+
+    Returns:
+        True if the command is safe to execute, False otherwise.
+    """
+    for pattern in DANGEROUS_PATTERNS:
+        if pattern in command:
+            logger.warning(f"Dangerous command pattern detected: {pattern}")
+            return False
+
+    return True
+
+
+def create_executor(backend: str = "docker", **kwargs) -> Executor:
+    """
+    Create an execution backend by name.
+
+    Args:
+        backend: Backend name ("docker" or "local").
+        **kwargs: Keyword arguments for the backend constructor.
+
+    Returns:
+        An Executor instance.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    if backend == "docker":
+        from .docker import DockerExecutor
+        return DockerExecutor(**kwargs)
+
+    if backend == "local":
+        # Docker-only options have no local equivalent
+        for option in ("image_name", "network_mode", "cache_volumes", "cache_family", "cpu_limit",
+                       "collect_stats", "scheduler", "priority", "use_scheduler",
+                       "workspace_mode", "workspace_cache"):
+            kwargs.pop(option, None)
+        return LocalExecutor(**kwargs)
+
+    raise ValueError(f"Unknown executor backend: {backend}")
+
+
+class LocalExecutor:
+    """
+    Executes commands on the host in a throwaway directory.
+
+    Each command runs in its own process group with CPU time, file size and
+    optional address space limits, set by ulimit in its shell. This is not a
+    security boundary like a container; it exists so commands can be run and
+    benchmarked realistically on hosts without a Docker daemon.
+    """
+
+    def __init__(
+        self,
+        timeout: int = 300,
+        memory_limit: Optional[Union[str, int]] = None,
+        cpu_time_limit: Optional[int] = None,
+        file_size_limit: Optional[Union[str, int]] = "1g",
+        work_dir: Optional[str] = None,
+        output_callback: Optional[OutputCallback] = None,
+        environment: Optional[Dict[str, str]] = None,
+        test_mode: bool = False,
+    ):
+        """
+        Initialize the LocalExecutor.
+
+        Args:
+            timeout: Wall-clock timeout for command execution (in seconds).
+            memory_limit: Address space limit per command (bytes or size string).
+                This caps virtual memory, not resident memory, so runtimes that
+                reserve large heaps up front (the JVM, Go) fail under it; off by default.
+            cpu_time_limit: CPU time limit per command (in seconds). If None, uses the timeout.
+            file_size_limit: Maximum size of any file written (bytes or size string).
+            work_dir: Parent directory for sandboxes. If None, the system temp directory is used.
+            output_callback: Called with (stream, line) as output is produced.
+            environment: Extra environment variables for commands.
+            test_mode: Accepted for interface compatibility; commands still run.
+        """
+        self.timeout = timeout
+        self.memory_limit = parse_size(memory_limit) if memory_limit else None
+        self.cpu_time_limit = cpu_time_limit or timeout
+        self.file_size_limit = parse_size(file_size_limit) if file_size_limit else None
+        self.work_dir = work_dir
+        self.output_callback = output_callback
+        self.environment = environment or {}
+        self.test_mode = test_mode
+        self.sandbox_dir: Optional[str] = None
+        self.container_id: Optional[str] = None
+
+        if os.name != "posix":
+            logger.warning("ulimit unavailable: local commands will run without limits")
+
+    def check_image_exists(self) -> bool:
+        """
+        Check if the base environment exists. Always true for the local backend.
+
+        Returns:
+            True.
+        """
+        return True
+
+    def create_image(self) -> bool:
+        """
+        Create the base environment. A no-op for the local backend.
+
+        Returns:
+            True.
+        """
+        return True
+
+    def prepare_workspace(self, repo_dir: str) -> None:
+        """
+        Prepare a repository for use. A no-op for the local backend, which copies on start.
+
+        Args:
+            repo_dir: Path to the repository directory.
+        """
+
+    def start_container(self, repo_dir: Optional[str] = None, image: Optional[str] = None) -> Optional[str]:
+        """
+        Create a throwaway sandbox directory for executing commands.
+
+        The repository, if given, is copied to "repo" inside the sandbox so
+        commands may write to it without touching the original.
+
+        Args:
+            repo_dir: Path to the repository directory to copy into the sandbox.
+            image: Checkpoint to start from. The local backend does not create
+                checkpoints, so this must be None.
+
+        Returns:
+            Sandbox path, used as the container ID.
+        """
+        if image is not None:
+            logger.error(f"Local backend cannot start from checkpoint {image}")
+            return None
+
+        try:
+            self.sandbox_dir = tempfile.mkdtemp(prefix="novasystem-local-", dir=self.work_dir)
+            if repo_dir and os.path.exists(repo_dir):
+                shutil.copytree(repo_dir, os.path.join(self.sandbox_dir, "repo"), symlinks=True)
+            self.container_id = self.sandbox_dir
+            logger.info(f"Started local sandbox {self.sandbox_dir}")
+            return self.container_id
+        except OSError as e:
+            logger.error(f"Failed to create local sandbox: {str(e)}")
+            if self.sandbox_dir:
+                shutil.rmtree(self.sandbox_dir, ignore_errors=True)
+            self.sandbox_dir = None
+            return None
+
+    def execute_command(self, command: Union[str, Command], timeout: Optional[int] = None) -> CommandResult:
+        """
+        Execute a command in the sandbox.
+
+        Args:
+            command: Command to execute.
+            timeout: Timeout for command execution (in seconds). If None, use the default.
+
+        Returns:
+            Result of the command execution.
+        """
+        command_str = command.text if isinstance(command, Command) else command
+
+        if not self.sandbox_dir:
+            error_msg = "No local sandbox started"
+            logger.error(error_msg)
+            return CommandResult(command_str, -1, "", error_msg, 0, status="error")
+
+        if not validate_command(command_str):
+            error_msg = f"Command validation failed: {command_str}"
+            logger.warning(error_msg)
+            return CommandResult(command_str, -1, "", error_msg, 0, status="error")
+
+        timeout_value = timeout or self.timeout
+        # Limits are set by the command's own shell rather than a preexec_fn,
+        # which is unsafe with threads running; every process it starts inherits them
+        script = self._limit_prefix() + command_str
+        env = dict(os.environ)
+        env.update({"HOME": self.sandbox_dir, "TMPDIR": self.sandbox_dir})
+        env.update(self.environment)
+
+        start_time = time.time()
+        try:
+            process = subprocess.Popen(
+                script,
+                shell=True,
+                cwd=self.sandbox_dir,
+                env=env,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                start_new_session=True,
+            )
+        except OSError as e:
+            logger.error(f"Error executing command: {str(e)}")
+            return CommandResult(command_str, -1, "", str(e), time.time() - start_time, status="error")
+
+        stdout_lines: List[str] = []
+        stderr_lines: List[str] = []
+        readers = [
+            threading.Thread(target=self._pump, args=(process.stdout, "stdout", stdout_lines), daemon=True),
+            threading.Thread(target=self._pump, args=(process.stderr, "stderr", stderr_lines), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        status = "completed"
+        try:
+            process.wait(timeout=timeout_value)
+        except subprocess.TimeoutExpired:
+            status = "timeout"
+            self._kill(process)
+            process.wait()
+        else:
+            # Background processes the command left behind still hold its
+            # pipes, and would keep the readers waiting past the timeout
+            self._kill(process)
+
+        drain_deadline = time.time() + OUTPUT_DRAIN_TIMEOUT
+        for reader in readers:
+            reader.join(max(0, drain_deadline - time.time()))
+            if reader.is_alive():
+                logger.warning(f"Output of '{command_str}' still open after it exited; not waiting for the rest")
+        execution_time = time.time() - start_time
+
+        stdout_str = "".join(stdout_lines)
+        stderr_str = "".join(stderr_lines)
+
+        if status == "timeout":
+            logger.warning(f"Command execution timed out after {timeout_value} seconds: {command_str}")
+            stderr_str += f"Command execution timed out after {timeout_value} seconds"
+            return CommandResult(command_str, -1, stdout_str, stderr_str, execution_time, status="timeout")
+
+        logger.info(f"Command '{command_str}' executed with exit code {process.returncode}")
+        return CommandResult(command_str, process.returncode, stdout_str, stderr_str,
+                             execution_time, status="completed")
+
+    def run_commands(self, repo_dir: str, commands: List[Union[str, Command]]) -> List[CommandResult]:
+        """
+        Run a sequence of commands in a fresh sandbox.
+
+        Args:
+            repo_dir: Path to the repository directory.
+            commands: List of commands to execute.
+
+        Returns:
+            List of command execution results.
+        """
+        if not self.start_container(repo_dir):
+            error_msg = "Failed to create local sandbox"
+            return [CommandResult(str(cmd), -1, "", error_msg, 0, status="error") for cmd in commands]
+
+        results = []
+        try:
+            for cmd in commands:
+                result = self.execute_command(cmd)
+                results.append(result)
+
+                # Stop execution if a command fails
+                if not result.is_success():
+                    logger.warning(f"Command execution failed, stopping sequence: {result}")
+                    break
+        finally:
+            self.stop_container()
+
+        return results
+
+    def stop_container(self) -> bool:
+        """
+        Remove the sandbox directory.
+
+        Returns:
+            True if a sandbox was removed, False otherwise.
+        """
+        if not self.sandbox_dir:
+            logger.warning("No local sandbox to stop")
+            return False
+
+        shutil.rmtree(self.sandbox_dir, ignore_errors=True)
+        logger.info(f"Removed local sandbox {self.sandbox_dir}")
+        self.sandbox_dir = None
+        self.container_id = None
+        return True
+
+    def checkpoint(self, tag: str, labels: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """
+        Snapshot the sandbox. Not supported by the local backend.
+
+        Args:
+            tag: Checkpoint tag.
+            labels: Checkpoint labels.
+
+        Returns:
+            None, so runs on this backend resume from the first command.
+        """
+        return None
+
+    def remove_checkpoint(self, image: str) -> bool:
+        """
+        Delete a checkpoint. A no-op for the local backend.
+
+        Args:
+            image: Checkpoint image.
+
+        Returns:
+            False.
+        """
+        return False
+
+    def _limit_prefix(self) -> str:
+        """
+        Build the ulimit line run before each command.
+
+        Returns:
+            Shell line setting the configured limits, or "" if there are none.
+        """
+        if os.name != "posix":
+            return ""
+        options = []
+        if self.cpu_time_limit:
+            options.append(f"-t {int(self.cpu_time_limit)}")
+        if self.file_size_limit:
+            # POSIX shells count file size in 512-byte blocks
+            options.append(f"-f {max(1, self.file_size_limit // 512)}")
+        if self.memory_limit:
+            options.append(f"-v {max(1, self.memory_limit // 1024)}")
+        # One limit per call, as dash accepts no more
+        return "".join(f"ulimit {option}\n" for option in options)
+
+    def _pump(self, pipe, stream: str, lines: List[str]) -> None:
+        """
+        Read a pipe line by line, collecting and forwarding output.
+
+        Args:
+            pipe: Binary pipe to read from.
+            stream: Stream name passed to the output callback.
+            lines: List receiving the decoded lines.
+        """
+        with pipe:
+            for raw_line in iter(pipe.readline, b""):
+                line = raw_line.decode("utf-8", errors="replace")
+                lines.append(line)
+                if self.output_callback:
+                    try:
+                        self.output_callback(stream, line)
+                    except Exception as e:
+                        logger.warning(f"Output callback failed: {str(e)}")
+
+    @staticmethod
+    def _kill(process: subprocess.Popen) -> None:
+        """
+        Kill a command and every process it started.
+
+        Args:
+            process: The command's process.
+        """
+        try:
+            if sys.platform != "win32":
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
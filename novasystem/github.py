@@ -0,0 +1,263 @@
+"""
+GitHub API Client for NovaSystem.
+
+This module provides a pooled, retrying GitHub API client with a persistent
+metadata cache revalidated through ETag conditional requests, so batch runs
+reuse connections and rarely spend rate limit on unchanged metadata.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_BASE = "https://api.github.com"
+DEFAULT_TTL = 3600
+DEFAULT_TIMEOUT = 10
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def create_session(retries: int = 3, backoff_factor: float = 0.5, pool_size: int = 10) -> requests.Session:
+    """
+    Create a requests session with connection pooling and retry with backoff.
+
+    Args:
+        retries: Maximum retries per request.
+        backoff_factor: Exponential backoff factor between retries (in seconds).
+        pool_size: Connections kept alive per host.
+
+    Returns:
+        Configured session.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class GitHubClient:
+    """
+    GitHub REST API client with a persistent, conditional-request cache.
+
+    Responses are cached on disk with their ETag. Within the TTL a cached
+    response is returned without a request; after it, the request is sent
+    with If-None-Match and a 304 Not Modified (which GitHub does not count
+    against the rate limit) refreshes the cached entry. If GitHub cannot be
+    reached or fails with a server error, an expired entry is used instead.
+    """
+
+    def __init__(self, api_base: Optional[str] = None, token: Optional[str] = None,
+                 cache_dir: Optional[str] = None, ttl: float = DEFAULT_TTL,
+                 timeout: float = DEFAULT_TIMEOUT, session: Optional[requests.Session] = None):
+        """
+        Initialize the GitHubClient.
+
+        Args:
+            api_base: API root URL. If None, uses NOVASYSTEM_GITHUB_API or the public API.
+            token: API token. If None, uses GITHUB_TOKEN if set.
+            cache_dir: Directory for cached responses. If None, uses ~/.novasystem/github.
+            ttl: Seconds a cached response is used without revalidation.
+            timeout: Request timeout (in seconds).
+            session: Session to use. If None, a pooled session with retries is created.
+        """
+        self.api_base = (api_base or os.environ.get("NOVASYSTEM_GITHUB_API", DEFAULT_API_BASE)).rstrip("/")
+        self.token = token or os.environ.get("GITHUB_TOKEN")
+        self.cache_dir = cache_dir or os.path.expanduser("~/.novasystem/github")
+        self.ttl = ttl
+        self.timeout = timeout
+        self.session = session or create_session()
+        self.stats = {"cached": 0, "revalidated": 0, "fetched": 0, "stale": 0}
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get_json(self, path: str) -> Any:
+        """
+        Get a JSON API resource, using the cache where possible.
+
+        Args:
+            path: Resource path relative to the API root (e.g. "/repos/owner/name").
+
+        Returns:
+            Decoded JSON response.
+
+        Raises:
+            requests.RequestException: If the request fails with a client error,
+                or fails otherwise and nothing is cached.
+        """
+        url = f"{self.api_base}/{path.lstrip('/')}"
+        # Responses depend on who asks (private repositories), so entries are per token
+        key = f"{hashlib.sha256((self.token or '').encode('utf-8')).hexdigest()} {url}"
+        cache_path = os.path.join(self.cache_dir, f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json")
+        entry = self._load_entry(cache_path)
+
+        if entry and time.time() - entry["fetched_at"] < self.ttl:
+            self._count("cached")
+            return entry["data"]
+
+        headers = self.request_headers(url, accept="application/vnd.github+json")
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            if not entry:
+                raise
+            return self._stale(entry, url, str(e))
+        if response.status_code >= 500 and entry:
+            return self._stale(entry, url, f"HTTP {response.status_code}")
+
+        if response.status_code == 304 and entry:
+            logger.debug(f"GitHub resource not modified: {url}")
+            entry["fetched_at"] = time.time()
+            self._save_entry(cache_path, entry)
+            self._count("revalidated")
+            return entry["data"]
+
+        response.raise_for_status()
+        data = response.json()
+        self._save_entry(cache_path, {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "fetched_at": time.time(),
+            "data": data,
+        })
+        self._count("fetched")
+
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.isdigit() and int(remaining) < 10:
+            logger.warning(f"GitHub API rate limit nearly exhausted ({remaining} requests left)")
+        return data
+
+    def request_headers(self, url: str, accept: Optional[str] = None) -> Dict[str, str]:
+        """
+        Build the headers for a request, authenticated if it goes to the API.
+
+        The token is only sent to URLs under the API root, so it does not
+        leak to other hosts serving tarballs.
+
+        Args:
+            url: URL to request.
+            accept: Accept header value, if any.
+
+        Returns:
+            Request headers.
+        """
+        headers = {}
+        if accept:
+            headers["Accept"] = accept
+        if self.token and (url == self.api_base or url.startswith(f"{self.api_base}/")):
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    def get_repository(self, owner: str, repo: str) -> Dict[str, Any]:
+        """
+        Get a repository's metadata.
+
+        Args:
+            owner: Repository owner.
+            repo: Repository name.
+
+        Returns:
+            Repository metadata as returned by the API.
+        """
+        return self.get_json(f"/repos/{owner}/{repo}")
+
+    def _stale(self, entry: Dict[str, Any], url: str, reason: str) -> Any:
+        """
+        Fall back to an expired cache entry when GitHub is unavailable.
+
+        Args:
+            entry: Cache entry.
+            url: Requested URL.
+            reason: Why the request failed.
+
+        Returns:
+            The cached response data.
+        """
+        logger.warning(f"GitHub request for {url} failed ({reason}); using cached response")
+        self._count("stale")
+        return entry["data"]
+
+    def _count(self, outcome: str) -> None:
+        """
+        Record the outcome of a lookup.
+        """
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def _load_entry(self, cache_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a cached response.
+
+        Args:
+            cache_path: Path of the cache entry.
+
+        Returns:
+            Cache entry, or None if missing or unreadable.
+        """
+        try:
+            with open(cache_path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable GitHub cache entry {cache_path}: {str(e)}")
+            return None
+
+    def _save_entry(self, cache_path: str, entry: Dict[str, Any]) -> None:
+        """
+        Write a cache entry atomically.
+
+        Args:
+            cache_path: Path of the cache entry.
+            entry: Entry to write.
+        """
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix=".entry-", dir=self.cache_dir)
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to write GitHub cache entry {cache_path}: {str(e)}")
+
+
+_default_client: Optional[GitHubClient] = None
+_default_lock = threading.Lock()
+
+
+def get_default_github_client() -> GitHubClient:
+    """
+    Get the process-wide GitHub client, so all handlers share one connection pool.
+
+    Returns:
+        The default GitHubClient.
+    """
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = GitHubClient()
+        return _default_client
@@ -0,0 +1,242 @@
+"""
+Ignore Rules module for NovaSystem.
+
+This module implements .gitignore matching and a pruning directory walk,
+so repository trees can be scanned without descending into ignored or
+vendored directories.
+"""
+
+import os
+import re
+import logging
+from typing import List, Dict, Iterator, Optional, Tuple, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Directories that hold third-party or generated code rather than project sources
+DEFAULT_VENDOR_DIRS = frozenset([
+    ".git", ".hg", ".svn", "node_modules", "bower_components", "vendor", "third_party",
+    ".venv", "venv", "env", "__pycache__", ".tox", ".nox", ".mypy_cache", ".pytest_cache",
+    "site-packages", "dist", "build", "target", ".gradle", ".idea", ".vscode",
+])
+
+# Compiled rule: (regex, negated, directory-only)
+Rule = Tuple["re.Pattern", bool, bool]
+
+
+def _translate(pattern: str) -> str:
+    """
+    Translate a gitignore glob into a regular expression body.
+
+    Args:
+        pattern: Glob without leading "!" or trailing "/".
+
+    Returns:
+        Regular expression source matching a relative path.
+    """
+    result = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            result.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            result.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            result.append(".*")
+            i += 2
+        elif char == "*":
+            result.append("[^/]*")
+            i += 1
+        elif char == "?":
+            result.append("[^/]")
+            i += 1
+        elif char == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                result.append(re.escape(char))
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                result.append(f"[{body}]")
+                i = end + 1
+        elif char == "\\" and i + 1 < len(pattern):
+            result.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            result.append(re.escape(char))
+            i += 1
+    return "".join(result)
+
+
+def compile_patterns(lines: Iterable[str]) -> List[Rule]:
+    """
+    Compile gitignore lines into rules.
+
+    Args:
+        lines: Lines of a .gitignore file.
+
+    Returns:
+        List of compiled rules, in file order.
+    """
+    rules = []
+    for raw_line in lines:
+        line = raw_line.rstrip("\n")
+        # Trailing spaces are ignored unless escaped
+        if not line.endswith("\\ "):
+            line = line.rstrip(" ")
+        if not line or line.startswith("#"):
+            continue
+
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        elif line.startswith("\\!") or line.startswith("\\#"):
+            line = line[1:]
+
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+
+        # Patterns with a slash before the end match relative to the .gitignore
+        anchored = "/" in line
+        line = line.lstrip("/")
+        prefix = "" if anchored else "(?:.*/)?"
+        rules.append((re.compile(f"^{prefix}{_translate(line)}$"), negated, dir_only))
+    return rules
+
+
+class IgnoreRules:
+    """
+    Evaluates .gitignore files found under a root directory.
+
+    Rules from deeper .gitignore files take precedence over shallower ones,
+    and within a file later rules win, as in git. Files inside an ignored
+    directory are ignored regardless of negations, also as in git.
+    """
+
+    def __init__(self, root: str, extra_patterns: Optional[Iterable[str]] = None,
+                 vendor_dirs: Iterable[str] = DEFAULT_VENDOR_DIRS,
+                 use_gitignore: bool = True):
+        """
+        Initialize the IgnoreRules.
+
+        Args:
+            root: Root directory of the tree.
+            extra_patterns: Additional gitignore-style patterns applied at the root.
+            vendor_dirs: Directory names always skipped, at any depth.
+            use_gitignore: Whether to read .gitignore files.
+        """
+        self.root = os.path.abspath(root)
+        self.vendor_dirs = frozenset(vendor_dirs)
+        self.use_gitignore = use_gitignore
+        self._extra = compile_patterns(extra_patterns or [])
+        self._rules: Dict[str, List[Rule]] = {}
+
+    def _rules_for(self, dir_rel: str) -> List[Rule]:
+        """
+        Load (and cache) the rules defined by the .gitignore in a directory.
+
+        Args:
+            dir_rel: Directory path relative to the root ("" for the root).
+
+        Returns:
+            Compiled rules for that directory.
+        """
+        if dir_rel not in self._rules:
+            rules: List[Rule] = []
+            if self.use_gitignore:
+                path = os.path.join(self.root, dir_rel, ".gitignore")
+                try:
+                    with open(path, "r", encoding="utf-8", errors="replace") as f:
+                        rules = compile_patterns(f)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.warning(f"Failed to read {path}: {str(e)}")
+            self._rules[dir_rel] = rules
+        return self._rules[dir_rel]
+
+    def is_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """
+        Check whether a path is ignored.
+
+        Parent directories are not checked; callers walking the tree should
+        prune ignored directories as they go (walk() does this).
+
+        Args:
+            rel_path: Path relative to the root, using "/" separators.
+            is_dir: Whether the path is a directory.
+
+        Returns:
+            True if the path is ignored.
+        """
+        rel_path = rel_path.replace(os.sep, "/").strip("/")
+        name = rel_path.rsplit("/", 1)[-1]
+        if is_dir and name in self.vendor_dirs:
+            return True
+
+        ignored = False
+        for rule_path, rules in self._applicable(rel_path):
+            for regex, negated, dir_only in rules:
+                if dir_only and not is_dir:
+                    continue
+                if regex.match(rule_path):
+                    ignored = not negated
+        return ignored
+
+    def _applicable(self, rel_path: str) -> Iterator[Tuple[str, List[Rule]]]:
+        """
+        Yield (path relative to the rule's directory, rules) from shallowest to deepest.
+        """
+        yield rel_path, self._extra
+        parts = rel_path.split("/")
+        for depth in range(len(parts)):
+            dir_rel = "/".join(parts[:depth])
+            rules = self._rules_for(dir_rel)
+            if rules:
+                yield "/".join(parts[depth:]), rules
+
+    def walk(self, max_depth: Optional[int] = None) -> Iterator[Tuple[str, os.DirEntry, int]]:
+        """
+        Walk the tree once with os.scandir, skipping ignored paths.
+
+        Args:
+            max_depth: Maximum directory depth to descend into (0 = root only).
+
+        Yields:
+            Tuples of (relative path, directory entry, depth) for every
+            non-ignored file.
+        """
+        stack = [("", 0)]
+        while stack:
+            dir_rel, depth = stack.pop()
+            try:
+                with os.scandir(os.path.join(self.root, dir_rel)) as entries:
+                    entries = sorted(entries, key=lambda e: e.name)
+            except OSError as e:
+                logger.warning(f"Failed to scan {dir_rel or self.root}: {str(e)}")
+                continue
+
+            subdirs = []
+            for entry in entries:
+                rel_path = f"{dir_rel}/{entry.name}" if dir_rel else entry.name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if self.is_ignored(rel_path, is_dir):
+                    continue
+                if is_dir:
+                    if max_depth is None or depth < max_depth:
+                        subdirs.append((rel_path, depth + 1))
+                else:
+                    yield rel_path, entry, depth
+
+            # Reverse so directories are visited in sorted order
+            stack.extend(reversed(subdirs))
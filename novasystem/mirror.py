@@ -0,0 +1,321 @@
+"""
+Repository Mirror Cache for NovaSystem.
+
+This module keeps persistent bare mirrors of remote repositories, so that
+re-testing a known repository costs an incremental fetch and a local
+worktree checkout instead of a full clone.
+"""
+
+import os
+import re
+import time
+import shutil
+import hashlib
+import logging
+import tempfile
+import subprocess
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_MIRROR_BYTES = 10 * 1024 ** 3
+
+
+def _git(*args: str, cwd: Optional[str] = None) -> str:
+    """
+    Run a git command.
+
+    Args:
+        *args: git arguments.
+        cwd: Working directory.
+
+    Returns:
+        Standard output.
+
+    Raises:
+        ValueError: If the command fails.
+    """
+    try:
+        result = subprocess.run(["git", *args], cwd=cwd, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, check=True)
+        return result.stdout.decode("utf-8", errors="replace")
+    except OSError as e:
+        raise ValueError(f"Failed to run git: {str(e)}")
+    except subprocess.CalledProcessError as e:
+        stderr = e.stderr.decode("utf-8", errors="replace").strip()
+        raise ValueError(f"git {args[0]} failed: {stderr}")
+
+
+def mirror_key(repo_url: str) -> str:
+    """
+    Derive the cache key for a remote URL.
+
+    URLs differing only in a trailing ".git" or slash share a mirror.
+
+    Args:
+        repo_url: Repository URL.
+
+    Returns:
+        Readable, filesystem-safe key.
+    """
+    normalized = repo_url.strip().rstrip("/")
+    if normalized.endswith(".git"):
+        normalized = normalized[:-4]
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "_", normalized.rsplit("/", 1)[-1])[:40] or "repo"
+    digest = hashlib.sha256(normalized.lower().encode("utf-8")).hexdigest()[:16]
+    return f"{name}-{digest}"
+
+
+class MirrorCache:
+    """
+    Persistent bare mirrors keyed by remote URL, checked out as worktrees.
+
+    Updates of a mirror and worktree changes hold an exclusive file lock on
+    that mirror, so concurrent runs of the same repository serialize their
+    fetches while runs of other repositories proceed. Mirrors are evicted
+    least recently used first when the cache exceeds its disk quota; mirrors
+    with live worktrees or held locks are never evicted.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_MIRROR_BYTES):
+        """
+        Initialize the MirrorCache.
+
+        Args:
+            cache_dir: Directory holding the mirrors. If None, uses NOVASYSTEM_MIRROR_CACHE
+                or ~/.novasystem/mirrors.
+            max_bytes: Disk quota for all mirrors.
+        """
+        self.cache_dir = cache_dir or os.environ.get(
+            "NOVASYSTEM_MIRROR_CACHE",
+            os.path.expanduser("~/.novasystem/mirrors")
+        )
+        self.max_bytes = max_bytes
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if fcntl is None:
+            logger.warning("fcntl unavailable: mirror updates are not protected against concurrent runs")
+
+    def mirror_path(self, repo_url: str) -> str:
+        """
+        Get the path of a repository's mirror.
+
+        Args:
+            repo_url: Repository URL.
+
+        Returns:
+            Path of the bare mirror (which may not exist yet).
+        """
+        return os.path.join(self.cache_dir, f"{mirror_key(repo_url)}.git")
+
+    @contextmanager
+    def _locked(self, mirror_path: str, blocking: bool = True) -> Iterator[bool]:
+        """
+        Hold the exclusive lock of a mirror.
+
+        Args:
+            mirror_path: Path of the mirror.
+            blocking: Wait for the lock. If False, yields False when it is busy.
+
+        Yields:
+            True if the lock is held.
+        """
+        if fcntl is None:
+            yield True
+            return
+
+        with open(f"{mirror_path}.lock", "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def update(self, repo_url: str) -> Dict[str, Any]:
+        """
+        Create or incrementally fetch a repository's mirror.
+
+        Args:
+            repo_url: Repository URL.
+
+        Returns:
+            Dictionary with the mirror path, whether it was created, seconds
+            taken and bytes added to the mirror.
+        """
+        mirror_path = self.mirror_path(repo_url)
+        with self._locked(mirror_path):
+            return self._update_locked(repo_url, mirror_path)
+
+    def _update_locked(self, repo_url: str, mirror_path: str) -> Dict[str, Any]:
+        """
+        Create or fetch a mirror. Must be called with the mirror's lock held.
+        """
+        start_time = time.time()
+        created = not os.path.isdir(mirror_path)
+        size_before = 0 if created else self._mirror_size(mirror_path)
+
+        if created:
+            logger.info(f"Creating mirror of {repo_url} in {mirror_path}")
+            # Clone next to the final path so a failed clone never looks like a mirror
+            temp_path = tempfile.mkdtemp(prefix=".cloning-", dir=self.cache_dir)
+            try:
+                _git("clone", "--quiet", "--mirror", repo_url, temp_path)
+                os.replace(temp_path, mirror_path)
+            finally:
+                shutil.rmtree(temp_path, ignore_errors=True)
+        else:
+            logger.info(f"Fetching updates for mirror of {repo_url}")
+            _git("--git-dir", mirror_path, "worktree", "prune")
+            _git("--git-dir", mirror_path, "fetch", "--quiet", "--prune", "origin")
+
+        os.utime(mirror_path)
+        stats = {
+            "mirror": mirror_path,
+            "created": created,
+            "seconds": time.time() - start_time,
+            "fetched_bytes": max(self._mirror_size(mirror_path) - size_before, 0),
+        }
+        logger.info(f"Mirror of {repo_url} {'created' if created else 'updated'} in "
+                    f"{stats['seconds']:.2f}s ({stats['fetched_bytes']} bytes)")
+        return stats
+
+    def checkout(self, repo_url: str, target_dir: str, ref: str = "HEAD") -> Dict[str, Any]:
+        """
+        Update a repository's mirror and check it out as a detached worktree.
+
+        The worktree shares the mirror's object store, so checkout only
+        writes the working tree. Remove it with remove_worktree().
+
+        Args:
+            repo_url: Repository URL.
+            target_dir: Directory to create the worktree in. Must not exist.
+            ref: Commit, branch or tag to check out.
+
+        Returns:
+            Statistics from update(), plus checkout_seconds.
+        """
+        mirror_path = self.mirror_path(repo_url)
+        with self._locked(mirror_path):
+            stats = self._update_locked(repo_url, mirror_path)
+
+            start_time = time.time()
+            _git("--git-dir", mirror_path, "worktree", "add", "--quiet", "--detach",
+                 os.path.abspath(target_dir), ref)
+            stats["checkout_seconds"] = time.time() - start_time
+
+        logger.info(f"Checked out {repo_url} at {ref} into {target_dir} "
+                    f"in {stats['checkout_seconds']:.2f}s")
+        self.evict(keep=mirror_path)
+        return stats
+
+    def remove_worktree(self, repo_url: str, target_dir: str) -> None:
+        """
+        Remove a worktree created by checkout().
+
+        Args:
+            repo_url: Repository URL the worktree was checked out from.
+            target_dir: Worktree directory.
+        """
+        mirror_path = self.mirror_path(repo_url)
+        with self._locked(mirror_path):
+            try:
+                _git("--git-dir", mirror_path, "worktree", "remove", "--force", os.path.abspath(target_dir))
+            except ValueError as e:
+                logger.warning(f"Failed to remove worktree {target_dir}: {str(e)}")
+                shutil.rmtree(target_dir, ignore_errors=True)
+                _git("--git-dir", mirror_path, "worktree", "prune")
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Get size and usage information for all mirrors.
+
+        Returns:
+            List of mirror records ordered from least to most recently used.
+        """
+        records = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith(".git") or not entry.is_dir():
+                continue
+            records.append({
+                "path": entry.path,
+                "size": self._mirror_size(entry.path),
+                "last_used": entry.stat().st_mtime,
+            })
+
+        records.sort(key=lambda r: r["last_used"])
+        return records
+
+    def evict(self, max_bytes: Optional[int] = None, keep: Optional[str] = None) -> List[str]:
+        """
+        Remove least recently used mirrors until the cache fits its quota.
+
+        Args:
+            max_bytes: Quota in bytes. If None, uses the cache's quota.
+            keep: Mirror that must not be removed.
+
+        Returns:
+            Paths of the removed mirrors.
+        """
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        records = self.stats()
+        total = sum(r["size"] for r in records)
+
+        removed = []
+        for record in records:
+            if total <= budget:
+                break
+            if record["path"] == keep:
+                continue
+
+            with self._locked(record["path"], blocking=False) as acquired:
+                if not acquired or self._has_worktrees(record["path"]):
+                    continue
+                shutil.rmtree(record["path"], ignore_errors=True)
+
+            logger.info(f"Evicted mirror {record['path']} ({record['size']} bytes)")
+            total -= record["size"]
+            removed.append(record["path"])
+
+        return removed
+
+    @staticmethod
+    def _has_worktrees(mirror_path: str) -> bool:
+        """
+        Check whether a mirror has live worktrees.
+        """
+        try:
+            _git("--git-dir", mirror_path, "worktree", "prune")
+        except ValueError:
+            pass
+        worktrees = os.path.join(mirror_path, "worktrees")
+        return os.path.isdir(worktrees) and bool(os.listdir(worktrees))
+
+    @staticmethod
+    def _mirror_size(mirror_path: str) -> int:
+        """
+        Get the size of a mirror's object store.
+
+        Args:
+            mirror_path: Path of the mirror.
+
+        Returns:
+            Size in bytes, or 0 if it cannot be determined.
+        """
+        try:
+            output = _git("--git-dir", mirror_path, "count-objects", "-v")
+        except ValueError:
+            return 0
+
+        sizes = dict(line.split(": ", 1) for line in output.splitlines() if ": " in line)
+        # count-objects reports sizes in KiB
+        return sum(int(sizes.get(key, 0)) for key in ("size", "size-pack", "size-garbage")) * 1024
@@ -8,18 +8,27 @@ import os
 import logging
 import tempfile
 import time
-from typing import List, Dict, Any, Optional, Tuple, Union
+from typing import List, Dict, Any, Optional, Tuple, Union, BinaryIO, TYPE_CHECKING
 from pathlib import Path
 import shutil
 import json
 
-from .repository import RepositoryHandler
+from .mirror import MirrorCache
 from .parser import DocumentationParser, Command
-from .docker import DockerExecutor, CommandResult
-from .database import DatabaseManager
+from .executor import Executor, CommandResult, create_executor
+from .database import DatabaseManager, DEFAULT_DELETE_BATCH, DEFAULT_IMPORT_BATCH
+from .timeouts import TimeoutPolicy
+from .scheduler import PRIORITY_NORMAL
+from .checkpoints import CHECKPOINT_STAGES
+
+if TYPE_CHECKING:
+    from .repository import RepositoryHandler
 
 logger = logging.getLogger(__name__)
 
+# Repository URLs that are cloned rather than used in place
+REMOTE_URL_PREFIXES = ("http://", "https://", "git://", "file://")
+
 class Nova:
     """
     Main orchestrator class for NovaSystem.
@@ -30,7 +39,12 @@ class Nova:
 
     def __init__(self, db_path: Optional[str] = None,
                 docker_image: Optional[str] = None,
-                test_mode: bool = False):
+                test_mode: bool = False,
+                backend: str = "docker",
+                executor: Optional[Executor] = None,
+                priority: int = PRIORITY_NORMAL,
+                workspace_mode: str = "bind",
+                mirror_cache: Optional[MirrorCache] = None):
         """
         Initialize the Nova system.
 
@@ -38,17 +52,89 @@ class Nova:
             db_path: Optional path to the database file.
             docker_image: Optional name for the Docker image to use.
             test_mode: Whether to run in test mode (no actual Docker execution).
+            backend: Execution backend to use ("docker" or "local").
+            executor: Optional pre-configured executor. Overrides backend.
+            priority: Scheduling priority of this run's containers.
+            workspace_mode: How the repository reaches the container ("bind" or "archive").
+            mirror_cache: Persistent mirror cache to check remote repositories out from
+                instead of cloning them for every run.
         """
-        self.repo_handler = RepositoryHandler()
-        self.doc_parser = DocumentationParser()
-        self.docker_executor = DockerExecutor(
-            image_name=docker_image or "novasystem/runner:latest",
-            test_mode=test_mode
-        )
+        # Components are built on first use, so commands that only read the
+        # database never import git or docker, or connect to the daemon
+        self._repo_handler: Optional["RepositoryHandler"] = None
+        self._doc_parser: Optional[DocumentationParser] = None
+        self._executor = executor
+        self._timeout_policy: Optional[TimeoutPolicy] = None
+        self._mirror_cache = mirror_cache
+        self._executor_options = {
+            "image_name": docker_image or "novasystem/runner:latest",
+            "test_mode": test_mode,
+            "priority": priority,
+            "workspace_mode": workspace_mode,
+        }
+        self.backend = backend
+        self.test_mode = test_mode
         self.db_manager = DatabaseManager(db_path)
+        logger.info(f"Nova system initialized (backend={backend}, test_mode={test_mode})")
 
-        self.test_mode = test_mode
-        logger.info(f"Nova system initialized (test_mode={test_mode})")
+    @property
+    def repo_handler(self) -> "RepositoryHandler":
+        """
+        Get the repository handler, creating it on first use.
+
+        Returns:
+            The RepositoryHandler.
+        """
+        if self._repo_handler is None:
+            from .repository import RepositoryHandler
+            self._repo_handler = RepositoryHandler(mirror_cache=self._mirror_cache)
+        return self._repo_handler
+
+    @property
+    def doc_parser(self) -> DocumentationParser:
+        """
+        Get the documentation parser, creating it on first use.
+
+        Returns:
+            The DocumentationParser.
+        """
+        if self._doc_parser is None:
+            self._doc_parser = DocumentationParser()
+        return self._doc_parser
+
+    @property
+    def executor(self) -> Executor:
+        """
+        Get the executor, creating it (and connecting to Docker) on first use.
+
+        Returns:
+            The executor for the configured backend.
+        """
+        if self._executor is None:
+            self._executor = create_executor(self.backend, **self._executor_options)
+        return self._executor
+
+    @property
+    def docker_executor(self) -> Executor:
+        """
+        The executor, kept for callers written against the Docker-only API.
+        """
+        return self.executor
+
+    @property
+    def timeout_policy(self) -> TimeoutPolicy:
+        """
+        Get the timeout policy, creating it on first use.
+
+        Returns:
+            The TimeoutPolicy, defaulting to the executor's timeout.
+        """
+        if self._timeout_policy is None:
+            self._timeout_policy = TimeoutPolicy(
+                self.db_manager,
+                default_timeout=getattr(self.executor, "timeout", 300)
+            )
+        return self._timeout_policy
 
     def process_repository(self, repo_url: str,
                           mount_local: bool = False,
@@ -73,10 +159,10 @@ class Nova:
             repo_type = None  # Will be detected later
             run_id = self.db_manager.create_run(repo_url)
 
-            # Clone repository
+            # Clone repository; only documentation and manifests until execution needs the tree
             logger.info(f"Processing repository: {repo_url}")
-            if repo_url.startswith(("http://", "https://", "git://")):
-                temp_dir = self.repo_handler.clone_repository(repo_url)
+            if repo_url.startswith(REMOTE_URL_PREFIXES):
+                temp_dir = self.repo_handler.clone_repository(repo_url, sparse=True)
                 repo_path = temp_dir
                 is_local = False
             else:
@@ -84,46 +170,23 @@ class Nova:
                 repo_path = repo_url
                 is_local = True
 
+            # Start preparing the container workspace while documentation is parsed
+            if is_local:
+                self.executor.prepare_workspace(repo_path)
+
             # Auto-detect repository type if requested
             if detect_type:
                 repo_type = self._detect_repository_type(repo_path)
                 if repo_type:
                     logger.info(f"Detected repository type: {repo_type}")
-                    self.db_manager.update_run(run_id, metadata={"repository_type": repo_type})
-
-            # Find documentation files
-            doc_files = self.repo_handler.find_documentation_files(repo_path)
-            logger.info(f"Found {len(doc_files)} documentation files")
-
-            all_docs_content = []
-            all_commands = []
-
-            # Process each documentation file
-            for doc_file in doc_files:
-                relative_path = os.path.relpath(doc_file, repo_path)
-                logger.info(f"Processing documentation file: {relative_path}")
-
-                # Read documentation content
-                doc_content = self.repo_handler.read_documentation_content(doc_file)
-                all_docs_content.append(doc_content)
+                    self.db_manager.update_run(run_id, repository_type=repo_type)
 
-                # Store documentation in database
-                self.db_manager.store_documentation(
-                    run_id,
-                    relative_path,
-                    doc_content,
-                    metadata={"file_size": len(doc_content)}
-                )
-
-                # Extract installation commands
-                commands = self.doc_parser.get_installation_commands(doc_content)
-                if commands:
-                    logger.info(f"Extracted {len(commands)} commands from {relative_path}")
-                    all_commands.extend(commands)
+            plan = self._build_plan(repo_path, run_id)
 
             # If no commands found
-            if not all_commands:
+            if not plan:
                 logger.warning("No installation commands found in documentation")
+                self._record_clone_stats(run_id, temp_dir)
                 self.db_manager.update_run(
                     run_id,
                     status="completed",
@@ -139,52 +202,310 @@ class Nova:
                     "execution_time": time.time() - start_time
                 }
 
-            # Prioritize and deduplicate commands
-            unique_commands = self.doc_parser.deduplicate_commands(all_commands)
-            prioritized_commands = self.doc_parser.prioritize_commands(unique_commands)
+            # Store the plan so a failed run can be resumed
+            mount = mount_local or is_local
+            self.db_manager.update_run(run_id, metadata={"plan": plan, "mount": mount})
+
+            # Execution in a mounted workspace needs the full working tree
+            if mount and not is_local:
+                self.repo_handler.materialize(repo_path)
+                self.executor.prepare_workspace(repo_path)
+            self._record_clone_stats(run_id, temp_dir)
+
+            return self._run_plan(run_id, repo_url, plan, repo_path if mount else None,
+                                  start_time=start_time)
+
+        except Exception as e:
+            logger.exception(f"Error processing repository: {str(e)}")
+
+            # Update run record if created
+            if run_id:
+                self.db_manager.update_run(
+                    run_id,
+                    status="error",
+                    success=False,
+                    summary=f"Error: {str(e)}",
+                    end_time=True
+                )
+
+            return {
+                "success": False,
+                "message": f"Error processing repository: {str(e)}",
+                "run_id": run_id,
+                "repository": repo_url,
+                "execution_time": time.time() - start_time
+            }
 
-            logger.info(f"Prepared {len(prioritized_commands)} unique commands for execution")
+        finally:
+            # Clean up temporary directory if created
+            if temp_dir and os.path.exists(temp_dir):
+                self.repo_handler.cleanup(temp_dir)
+
+    def plan_repository(self, repo_url: str, ref: str = "HEAD") -> Dict[str, Any]:
+        """
+        Extract the installation plan for a repository without executing it.
+
+        GitHub repositories and tarballs are read from an archive snapshot,
+        extracting only documentation and manifests in memory; other git
+        URLs use a sparse clone.
+
+        Args:
+            repo_url: Repository URL, tarball URL or path, or local directory.
+            ref: Branch, tag or commit to plan for GitHub repositories.
+
+        Returns:
+            A dictionary with the planned commands.
+        """
+        start_time = time.time()
+        temp_dir = None
+
+        try:
+            if os.path.isdir(repo_url):
+                repo_path = repo_url
+            elif self.repo_handler.is_snapshot_source(repo_url):
+                temp_dir = self.repo_handler.fetch_snapshot(repo_url, ref)
+                repo_path = temp_dir
+            else:
+                temp_dir = self.repo_handler.clone_repository(repo_url, sparse=True)
+                repo_path = temp_dir
+
+            plan = self._build_plan(repo_path)
+            return {
+                "success": True,
+                "repository": repo_url,
+                "repository_type": self._detect_repository_type(repo_path),
+                "plan": plan,
+                "fetch": self.repo_handler.get_clone_stats(temp_dir) if temp_dir else {},
+                "execution_time": time.time() - start_time
+            }
+
+        except Exception as e:
+            logger.exception(f"Error planning repository: {str(e)}")
+            return {
+                "success": False,
+                "message": f"Error planning repository: {str(e)}",
+                "repository": repo_url,
+                "execution_time": time.time() - start_time
+            }
+
+        finally:
+            if temp_dir and os.path.exists(temp_dir):
+                self.repo_handler.cleanup(temp_dir)
+
+    def _build_plan(self, repo_path: str, run_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Extract, deduplicate and order installation commands from a repository's documentation.
+
+        Args:
+            repo_path: Path to the repository (or a partial tree of its documentation).
+            run_id: If given, documentation is stored under this run.
+
+        Returns:
+            The plan: command dictionaries with their installation stage.
+        """
+        doc_files = self.repo_handler.find_documentation_files(repo_path)
+        logger.info(f"Found {len(doc_files)} documentation files")
+
+        all_commands = []
+        for doc_file in doc_files:
+            relative_path = os.path.relpath(doc_file, repo_path)
+            logger.info(f"Processing documentation file: {relative_path}")
+
+            doc_content = self.repo_handler.read_documentation_content(doc_file)
+            if run_id is not None:
+                self.db_manager.store_documentation(
+                    run_id,
+                    relative_path,
+                    doc_content,
+                    metadata={"file_size": len(doc_content)}
+                )
+
+            commands = self.doc_parser.get_installation_commands(doc_content, relative_path)
+            if commands:
+                logger.info(f"Extracted {len(commands)} commands from {relative_path}")
+                all_commands.extend(commands)
+
+        unique_commands = self.doc_parser.deduplicate_commands(all_commands)
+        prioritized_commands = self.doc_parser.prioritize_commands(unique_commands)
+        logger.info(f"Prepared {len(prioritized_commands)} unique commands for execution")
+
+        return [
+            {**cmd.to_dict(), "stage": self.doc_parser.classify_stage(cmd)}
+            for cmd in prioritized_commands
+        ]
+
+    def resume_run(self, run_id: int) -> Dict[str, Any]:
+        """
+        Resume a failed run from its last checkpoint.
+
+        The remaining commands of the run's stored plan are executed in a
+        container started from the latest checkpoint image. Runs without a
+        usable checkpoint are restarted from the first command.
+
+        Args:
+            run_id: ID of the run to resume.
+
+        Returns:
+            A dictionary with the results of the resumed execution.
+        """
+        start_time = time.time()
+        temp_dir = None
+
+        run = self.db_manager.get_run(run_id)
+        if not run:
+            return {"success": False, "message": f"Run ID {run_id} not found", "run_id": run_id}
+
+        repo_url = run["repo_url"]
+        plan = (run.get("metadata") or {}).get("plan")
+        if not plan:
+            return {
+                "success": False,
+                "message": f"Run {run_id} has no stored command plan and cannot be resumed",
+                "run_id": run_id,
+                "repository": repo_url
+            }
+        if run.get("success"):
+            return {
+                "success": False,
+                "message": f"Run {run_id} already completed successfully",
+                "run_id": run_id,
+                "repository": repo_url
+            }
 
-            # Check if Docker image exists, create if needed
-            if not self.docker_executor.check_image_exists():
-                logger.info("Docker image not found, creating...")
-                self.docker_executor.create_image()
+        try:
+            checkpoint = self.db_manager.get_latest_checkpoint(run_id)
+            start_index = checkpoint["command_index"] + 1 if checkpoint else 0
+            image = checkpoint["image"] if checkpoint else None
+            logger.info(f"Resuming run {run_id} at command {start_index + 1} of {len(plan)}"
+                        + (f" from checkpoint {image}" if image else ""))
+            self.db_manager.update_run(run_id, status="resumed")
+
+            # The repository is only needed again if it is mounted into the container
+            repo_path = None
+            if run["metadata"].get("mount"):
+                if repo_url.startswith(REMOTE_URL_PREFIXES):
+                    temp_dir = self.repo_handler.clone_repository(repo_url)
+                    repo_path = temp_dir
+                else:
+                    repo_path = repo_url
+                self.executor.prepare_workspace(repo_path)
+
+            return self._run_plan(run_id, repo_url, plan, repo_path, start_index=start_index,
+                                  image=image, start_time=start_time)
 
-            # Start Docker container
-            container_id = self.docker_executor.start_container(
-                repo_path if mount_local or is_local else None
+        except Exception as e:
+            logger.exception(f"Error resuming run {run_id}: {str(e)}")
+            self.db_manager.update_run(
+                run_id,
+                status="error",
+                success=False,
+                summary=f"Error: {str(e)}",
+                end_time=True
             )
-            logger.info(f"Started Docker container: {container_id}")
+            return {
+                "success": False,
+                "message": f"Error resuming run: {str(e)}",
+                "run_id": run_id,
+                "repository": repo_url,
+                "execution_time": time.time() - start_time
+            }
+
+        finally:
+            if temp_dir and os.path.exists(temp_dir):
+                self.repo_handler.cleanup(temp_dir)
+
+    def _record_clone_stats(self, run_id: int, repo_dir: Optional[str]) -> None:
+        """
+        Store the clone's transfer statistics in the run metadata.
+
+        Args:
+            run_id: ID of the run.
+            repo_dir: Directory of the clone, or None for local repositories.
+        """
+        stats = self.repo_handler.get_clone_stats(repo_dir) if repo_dir else {}
+        if not stats:
+            return
+
+        if stats["sparse"] and not stats["materialized"]:
+            logger.info(f"Sparse clone avoided downloading {stats['files_deferred']} files")
+        self.db_manager.update_run(run_id, metadata={"clone": stats})
+
+    def _run_plan(self, run_id: int, repo_url: str, plan: List[Dict[str, Any]],
+                  repo_path: Optional[str], start_index: int = 0,
+                  image: Optional[str] = None,
+                  start_time: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Execute a run's command plan in a container and record the outcome.
+
+        After the last command of each checkpointed stage succeeds, the
+        container is checkpointed so a later failure can be resumed from there.
+
+        Args:
+            run_id: ID of the run.
+            repo_url: URL of the repository.
+            plan: Commands as stored in the run metadata (Command dicts with a "stage").
+            repo_path: Repository to make available in the container, or None.
+            start_index: Index of the first plan entry to execute.
+            image: Checkpoint image to start the container from.
+            start_time: Time processing started, for reporting.
+
+        Returns:
+            A dictionary with the results of the execution.
+        """
+        start_time = start_time or time.time()
+
+        # Check if the execution environment exists, create if needed
+        if image is None and not self.executor.check_image_exists():
+            logger.info("Execution image not found, creating...")
+            self.executor.create_image()
+
+        # Start execution container
+        container_id = self.executor.start_container(repo_path, image=image)
+        if container_id is None and image is not None:
+            logger.warning(f"Could not start from checkpoint {image}, restarting from the first command")
+            start_index, image = 0, None
+            container_id = self.executor.start_container(repo_path)
+        if container_id is None:
+            raise RuntimeError("Failed to start execution container")
+        logger.info(f"Started execution container: {container_id}")
+
+        # Execute commands
+        results = []
+        all_success = True
+
+        try:
+            for index in range(start_index, len(plan)):
+                cmd = Command.from_dict(plan[index])
+                stage = plan[index].get("stage")
 
-            # Execute commands
-            results = []
-            all_success = True
+                # Choose a timeout from the command's execution history
+                timeout, timeout_source = self.timeout_policy.timeout_for(cmd.text)
 
-            for cmd in prioritized_commands:
                 # Log in database before execution
-                self.db_manager.log_command(
+                command_id = self.db_manager.log_command(
                     run_id,
                     cmd.text,
                     command_type=cmd.command_type.value if cmd.command_type else None,
                     priority=cmd.priority,
-                    status="pending"
+                    status="pending",
+                    timeout=timeout,
+                    timeout_source=timeout_source
                 )
 
                 # Execute command
-                logger.info(f"Executing command: {cmd.text}")
-                result = self.docker_executor.execute_command(cmd.text)
+                logger.info(f"Executing command: {cmd.text} (timeout {timeout}s from {timeout_source})")
+                result = self.executor.execute_command(cmd.text, timeout=timeout)
 
-                # Log result in database
-                self.db_manager.log_command(
-                    run_id,
-                    cmd.text,
+                # Record the result on the same row
+                self.db_manager.update_command(
+                    command_id,
                     exit_code=result.exit_code,
                     output=result.output,
                     error=result.error,
                     execution_time=result.execution_time,
-                    status="success" if result.successful else "failed",
-                    command_type=cmd.command_type.value if cmd.command_type else None,
-                    priority=cmd.priority
+                    status="success" if result.successful else
+                           "timeout" if result.status == "timeout" else "failed",
+                    resource_usage=result.resource_usage
                 )
 
                 # Add to results list
@@ -194,7 +515,10 @@ class Nova:
                     "output": result.output,
                     "error": result.error,
                     "execution_time": result.execution_time,
-                    "successful": result.successful
+                    "successful": result.successful,
+                    "resource_usage": result.resource_usage,
+                    "timeout": timeout,
+                    "timeout_source": timeout_source
                 })
 
                 # If command failed, stop execution
@@ -203,72 +527,87 @@ class Nova:
                     logger.warning(f"Command failed: {cmd.text}, exit code: {result.exit_code}")
                     break
 
-            # Stop Docker container
-            self.docker_executor.stop_container()
-
-            # Generate summary
-            successful_count = sum(1 for r in results if r["successful"])
-            summary = (
-                f"Executed {len(results)} commands, "
-                f"{successful_count} successful, "
-                f"{len(results) - successful_count} failed. "
-            )
-
-            if all_success:
-                summary += "Installation completed successfully."
-            else:
-                summary += "Installation failed."
+                # Checkpoint at the end of each expensive stage
+                next_stage = plan[index + 1].get("stage") if index + 1 < len(plan) else None
+                if stage in CHECKPOINT_STAGES and next_stage is not None and next_stage != stage:
+                    self._checkpoint(run_id, index, stage)
+        finally:
+            # Stop execution container
+            self.executor.stop_container()
+
+        # Generate summary
+        successful_count = sum(1 for r in results if r["successful"])
+        summary = (
+            f"Executed {len(results)} commands, "
+            f"{successful_count} successful, "
+            f"{len(results) - successful_count} failed. "
+        )
+        if start_index:
+            summary = f"Resumed at command {start_index + 1} of {len(plan)}. " + summary
+
+        if all_success:
+            summary += "Installation completed successfully."
+            self._remove_checkpoints(run_id)
+        else:
+            summary += "Installation failed."
+
+        # Update run record
+        self.db_manager.update_run(
+            run_id,
+            status="completed",
+            success=all_success,
+            summary=summary,
+            end_time=True
+        )
 
-            # Update run record
-            self.db_manager.update_run(
-                run_id,
-                status="completed",
-                success=all_success,
-                summary=summary,
-                end_time=True
-            )
+        # Prepare result
+        execution_time = time.time() - start_time
+        logger.info(f"Repository processing completed in {execution_time:.2f} seconds")
+        return {
+            "success": all_success,
+            "message": summary,
+            "run_id": run_id,
+            "repository": repo_url,
+            "resumed_from": start_index,
+            "commands_executed": len(results),
+            "commands_successful": successful_count,
+            "execution_time": execution_time,
+            "results": results
+        }
 
-            # Prepare result
-            execution_time = time.time() - start_time
-            result = {
-                "success": all_success,
-                "message": summary,
-                "run_id": run_id,
-                "repository": repo_url,
-                "commands_executed": len(results),
-                "commands_successful": successful_count,
-                "execution_time": execution_time,
-                "results": results
-            }
+    def _checkpoint(self, run_id: int, index: int, stage: str) -> None:
+        """
+        Checkpoint the container after a plan entry, superseding earlier checkpoints.
 
-            logger.info(f"Repository processing completed in {execution_time:.2f} seconds")
-            return result
+        Args:
+            run_id: ID of the run.
+            index: Index of the last executed plan entry.
+            stage: Stage completed by that entry.
+        """
+        previous = self.db_manager.get_checkpoints(run_id)
+        image = self.executor.checkpoint(
+            f"run-{run_id}-{index}",
+            labels={"novasystem.run_id": str(run_id), "novasystem.stage": stage}
+        )
+        if image is None:
+            return
 
-        except Exception as e:
-            logger.exception(f"Error processing repository: {str(e)}")
+        superseded = [c["image"] for c in previous if c["image"] != image]
+        for old_image in superseded:
+            self.executor.remove_checkpoint(old_image)
+        self.db_manager.delete_checkpoints(images=superseded + [image])
+        self.db_manager.add_checkpoint(run_id, index, image, stage=stage)
 
-            # Update run record if created
-            if run_id:
-                self.db_manager.update_run(
-                    run_id,
-                    status="error",
-                    success=False,
-                    summary=f"Error: {str(e)}",
-                    end_time=True
-                )
-
-            return {
-                "success": False,
-                "message": f"Error processing repository: {str(e)}",
-                "run_id": run_id,
-                "repository": repo_url,
-                "execution_time": time.time() - start_time
-            }
+    def _remove_checkpoints(self, run_id: int) -> None:
+        """
+        Delete all checkpoints of a run.
 
-        finally:
-            # Clean up temporary directory if created
-            if temp_dir and os.path.exists(temp_dir):
-                self.repo_handler.cleanup(temp_dir)
+        Args:
+            run_id: ID of the run.
+        """
+        for checkpoint in self.db_manager.get_checkpoints(run_id):
+            self.executor.remove_checkpoint(checkpoint["image"])
+        self.db_manager.delete_checkpoints(run_id=run_id)
 
     def _detect_repository_type(self, repo_path: str) -> Optional[str]:
         """
@@ -348,19 +687,82 @@ class Nova:
         }
 
     def list_runs(self, limit: int = 10, offset: int = 0,
-                status: Optional[str] = None) -> List[Dict[str, Any]]:
+                status: Optional[str] = None, after: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        List previous runs.
+        List previous runs, newest first.
 
         Args:
             limit: Maximum number of runs to return.
             offset: Number of runs to skip.
             status: Filter by status.
+            after: Cursor of the last run already seen (see database.run_cursor).
 
         Returns:
             List of run records.
         """
-        return self.db_manager.list_runs(limit, offset, status)
+        return self.db_manager.list_runs(limit, offset, status, after=after)
+
+    def get_resource_report(self, group_by: str = "command", order_by: str = "peak_memory_bytes",
+                           limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Aggregate command resource usage across previous runs.
+
+        Args:
+            group_by: Grouping key: "command" or "repository_type".
+            order_by: Resource column to sort by.
+            limit: Maximum number of groups to return.
+
+        Returns:
+            List of aggregate records.
+        """
+        return self.db_manager.get_resource_report(group_by, order_by, limit)
+
+    def get_stats(self, group_by: str = "repository_type", limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Get success rates and execution times across previous runs.
+
+        Args:
+            group_by: "repository_type", "command" or "day".
+            limit: Maximum number of rows to return.
+
+        Returns:
+            List of summary records.
+        """
+        return self.db_manager.get_stats(group_by, limit)
+
+    def search(self, query: str, kind: str = "all", limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Search command text, errors and documentation across previous runs.
+
+        Args:
+            query: Full-text query.
+            kind: What to search: "all", "commands" or "documentation".
+            limit: Maximum number of results.
+
+        Returns:
+            List of matches, best first.
+        """
+        return self.db_manager.search(query, kind, limit)
+
+    def gc_checkpoints(self, max_age_days: Optional[float] = None,
+                       max_bytes: Optional[int] = None) -> List[str]:
+        """
+        Garbage-collect checkpoint images by age and total size.
+
+        Args:
+            max_age_days: Remove checkpoints older than this.
+            max_bytes: Remove the oldest checkpoints until the total fits this size.
+
+        Returns:
+            References of the removed images.
+        """
+        store = getattr(self.executor, "checkpoint_store", None)
+        if store is None:
+            return []
+
+        removed = store.gc(max_age_days=max_age_days, max_bytes=max_bytes)
+        self.db_manager.delete_checkpoints(images=removed)
+        return removed
 
     def delete_run(self, run_id: int) -> bool:
         """
@@ -372,25 +774,99 @@ class Nova:
         Returns:
             True if deletion was successful, False otherwise.
         """
+        self._remove_checkpoints(run_id)
         return self.db_manager.delete_run(run_id)
 
-    def cleanup_old_runs(self, days: int = 30) -> int:
+    def cleanup_old_runs(self, days: int = 30, archive_path: Optional[str] = None,
+                         batch_size: int = DEFAULT_DELETE_BATCH) -> int:
         """
         Delete runs older than a specified number of days.
 
         Args:
             days: Delete runs older than this many days.
+            archive_path: Archive file to export the runs to before deleting them
+                (.jsonl, .jsonl.gz or .jsonl.zst).
+            batch_size: Runs deleted per transaction.
 
         Returns:
             Number of deleted runs.
+
+        Raises:
+            ValueError: If the archive cannot be created or is Parquet, which
+                cannot be read back if cleanup is interrupted.
+        """
+        if archive_path is None:
+            return self.db_manager.delete_old_runs(days, batch_size)
+
+        from .archive import INCREMENTAL_FORMATS, RunArchiveWriter, archive_format
+        if archive_format(archive_path) not in INCREMENTAL_FORMATS:
+            raise ValueError(f"Cannot archive deleted runs to {archive_path}: "
+                             f"use .jsonl, .jsonl.gz or .jsonl.zst")
+        with RunArchiveWriter(archive_path) as archive:
+            return self.db_manager.delete_old_runs(days, batch_size, archive=archive)
+
+    def export_runs(self, path: Optional[str] = None, since: Optional[str] = None,
+                    format: Optional[str] = None, fileobj: Optional[BinaryIO] = None) -> int:
+        """
+        Export run history, with commands and documentation, to an archive.
+
+        Args:
+            path: Archive file to create (.jsonl, .jsonl.gz, .jsonl.zst or .parquet).
+            since: Only export runs started at or after this ISO 8601 date or time.
+            format: Archive format, if not chosen from the file name.
+            fileobj: Binary stream to write to instead of a file.
+
+        Returns:
+            Number of exported runs.
+        """
+        from .archive import RunArchiveWriter
+        with RunArchiveWriter(path, format=format, fileobj=fileobj) as archive:
+            for record in self.db_manager.iter_run_records(since):
+                archive.write(record)
+            return archive.count
+
+    def import_runs(self, path: Optional[str] = None, fileobj: Optional[BinaryIO] = None,
+                    batch_size: int = DEFAULT_IMPORT_BATCH, skip_existing: bool = True) -> Dict[str, int]:
+        """
+        Import run history from an archive written by export_runs or cleanup_old_runs.
+
+        Args:
+            path: Archive file to read; its format is detected from the content.
+            fileobj: Binary stream to read instead of a file.
+            batch_size: Runs inserted per transaction.
+            skip_existing: Skip runs already present (same repository URL and start time).
+
+        Returns:
+            Counts of imported runs, commands and documentation, and skipped runs.
+        """
+        from .archive import RunArchiveReader
+        with RunArchiveReader(path, fileobj=fileobj) as archive:
+            return self.db_manager.import_runs(archive, batch_size, skip_existing)
+
+    def vacuum_database(self, compact: bool = False) -> int:
+        """
+        Return space freed by deleted runs to the file system.
+
+        Args:
+            compact: Rebuild the whole database file, blocking writers meanwhile,
+                instead of releasing free pages incrementally.
+
+        Returns:
+            Number of bytes released.
         """
-        return self.db_manager.delete_old_runs(days)
+        if compact:
+            return self.db_manager.compact()
+        return self.db_manager.incremental_vacuum()
 
     def close(self) -> None:
         """
         Close all resources.
         """
-        self.db_manager.close()
+        # Only what was created needs closing; __init__ may also have failed part way
+        if getattr(self, "_repo_handler", None) is not None:
+            self._repo_handler.cleanup()
+        if getattr(self, "db_manager", None) is not None:
+            self.db_manager.close()
 
     def __del__(self) -> None:
         """
@@ -13,6 +13,9 @@ from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Installation stages in execution order
+INSTALLATION_STAGES = ['prepare', 'install_deps', 'build', 'configure', 'run']
+
 class CommandSource(Enum):
     """Source of an extracted command."""
     CODE_BLOCK = "code_block"
@@ -134,7 +137,7 @@ class DocumentationParser:
             commands.extend(llm_commands)
 
         # Deduplicate commands
-        unique_commands = self._deduplicate_commands(commands)
+        unique_commands = self.deduplicate_commands(commands)
 
         return unique_commands
 
@@ -481,7 +484,7 @@ class DocumentationParser:
         # Ensure priority is in range [1, 100]
         return max(1, min(100, priority))
 
-    def _deduplicate_commands(self, commands: List[Command]) -> List[Command]:
+    def deduplicate_commands(self, commands: List[Command]) -> List[Command]:
         """
         Remove duplicate commands.
 
@@ -523,6 +526,38 @@ class DocumentationParser:
 
         return ordered_commands
 
+    def classify_stage(self, command: Command) -> str:
+        """
+        Classify a command into an installation stage.
+
+        Args:
+            command: Command to classify.
+
+        Returns:
+            One of INSTALLATION_STAGES.
+        """
+        text = command.text.lower()
+
+        if any(keyword in text for keyword in ['cd', 'mkdir', 'git clone', 'wget', 'curl']):
+            return 'prepare'
+        elif any(keyword in text for keyword in ['pip install', 'npm install', 'apt-get', 'apt', 'yum']):
+            return 'install_deps'
+        elif any(keyword in text for keyword in ['make', 'build', 'compile']):
+            return 'build'
+        elif any(keyword in text for keyword in ['config', 'configure', './', 'init']):
+            return 'configure'
+        elif any(keyword in text for keyword in ['run', 'start', 'serve']):
+            return 'run'
+
+        # If can't classify, put in the stage based on priority
+        if command.priority >= 80:
+            return 'install_deps'
+        elif command.priority >= 60:
+            return 'build'
+        elif command.priority >= 40:
+            return 'configure'
+        return 'run'
+
     def _reorder_for_logic(self, commands: List[Command]) -> List[Command]:
         """
         Reorder commands based on logical dependencies and execution order.
@@ -537,43 +572,15 @@ class DocumentationParser:
         # would build a dependency graph and perform topological sorting
 
         # Define stages of installation
-        stages = {
-            'prepare': [],   # cd, mkdir, git clone, etc.
-            'install_deps': [],  # pip install, npm install, etc.
-            'build': [],     # make, build, etc.
-            'configure': [], # config, setup, etc.
-            'run': []        # start, run, etc.
-        }
+        stages = {stage: [] for stage in INSTALLATION_STAGES}
 
         # Classify commands into stages
         for cmd in commands:
-            text = cmd.text.lower()
-
-            if any(keyword in text for keyword in ['cd', 'mkdir', 'git clone', 'wget', 'curl']):
-                stages['prepare'].append(cmd)
-            elif any(keyword in text for keyword in ['pip install', 'npm install', 'apt-get', 'apt', 'yum']):
-                stages['install_deps'].append(cmd)
-            elif any(keyword in text for keyword in ['make', 'build', 'compile']):
-                stages['build'].append(cmd)
-            elif any(keyword in text for keyword in ['config', 'configure', './', 'init']):
-                stages['configure'].append(cmd)
-            elif any(keyword in text for keyword in ['run', 'start', 'serve']):
-                stages['run'].append(cmd)
-            else:
-                # If can't classify, put in the stage based on priority
-                priority = cmd.priority
-                if priority >= 80:
-                    stages['install_deps'].append(cmd)
-                elif priority >= 60:
-                    stages['build'].append(cmd)
-                elif priority >= 40:
-                    stages['configure'].append(cmd)
-                else:
-                    stages['run'].append(cmd)
+            stages[self.classify_stage(cmd)].append(cmd)
 
         # Flatten stages back into a single list, preserving priority ordering within stages
         result = []
-        for stage in ['prepare', 'install_deps', 'build', 'configure', 'run']:
+        for stage in INSTALLATION_STAGES:
             stage_commands = sorted(stages[stage], key=lambda x: x.priority, reverse=True)
             result.extend(stage_commands)
 
@@ -0,0 +1,377 @@
+"""
+Workspace Reclamation for NovaSystem.
+
+This module deletes finished workspaces on a background thread, so runs do
+not wait on removing large trees. A workspace is first renamed aside (which
+is atomic and immediate) and then removed asynchronously. The reclaimer also
+enforces a disk quota across work directories and, at startup, recovers
+work directories left behind by crashed runs.
+"""
+
+import os
+import sys
+import time
+import uuid
+import queue
+import shutil
+import logging
+import tempfile
+import threading
+from typing import List, Dict, Any, Optional, Set
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+WORK_DIR_PREFIX = "novasystem-"
+OWNER_FILE = ".novasystem-owner"
+RECLAIM_PREFIX = ".reclaim-"
+DEFAULT_MAX_WORKSPACE_BYTES = 20 * 1024 ** 3
+
+
+def directory_size(path: str, exclude: Optional[str] = None) -> int:
+    """
+    Get the total size of the files under a directory.
+
+    Args:
+        path: Directory to measure.
+        exclude: Name of a top-level entry to skip.
+
+    Returns:
+        Size in bytes.
+    """
+    total = 0
+    for root, dirs, files in os.walk(path):
+        if exclude and root == path and exclude in dirs:
+            dirs.remove(exclude)
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _pid_alive(pid: int) -> bool:
+    """
+    Check whether a process exists.
+
+    Args:
+        pid: Process ID.
+
+    Returns:
+        True if the process exists.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class WorkspaceReclaimer:
+    """
+    Background deleter and quota keeper for workspace directories.
+
+    Work directories are created under a shared root, each holding an owner
+    file that its process keeps locked. A work directory whose owner file can
+    be locked (or, without fcntl, whose owner process is gone) is an orphan.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize the WorkspaceReclaimer.
+
+        Args:
+            root: Directory holding work directories. If None, uses
+                NOVASYSTEM_WORK_ROOT or a "novasystem" directory under the temp dir.
+            max_bytes: Disk quota across work directories. If None, uses
+                NOVASYSTEM_WORK_QUOTA (in bytes) or 20 GiB.
+        """
+        self.root = os.path.abspath(root or os.environ.get(
+            "NOVASYSTEM_WORK_ROOT", os.path.join(tempfile.gettempdir(), "novasystem")
+        ))
+        if max_bytes is None:
+            max_bytes = int(os.environ.get("NOVASYSTEM_WORK_QUOTA", DEFAULT_MAX_WORKSPACE_BYTES))
+        self.max_bytes = max_bytes
+        self.stats = {"reclaimed": 0, "failed": 0, "orphans": 0, "evicted": 0}
+
+        # Directories to delete; None requests a quota check
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._owned: Dict[str, Any] = {}
+        self._active: Set[str] = set()
+        self._thread: Optional[threading.Thread] = None
+
+        os.makedirs(self.root, exist_ok=True)
+
+    def create_work_dir(self) -> str:
+        """
+        Create a work directory under the root, owned by this process.
+
+        Returns:
+            Path of the new work directory.
+        """
+        work_dir = tempfile.mkdtemp(prefix=WORK_DIR_PREFIX, dir=self.root)
+        owner_file = open(os.path.join(work_dir, OWNER_FILE), "w")
+        owner_file.write(f"{os.getpid()}\n")
+        owner_file.flush()
+        if fcntl is not None:
+            fcntl.flock(owner_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        with self._lock:
+            self._owned[work_dir] = owner_file
+        return work_dir
+
+    def activate(self, path: str) -> None:
+        """
+        Mark a workspace as in use, protecting it from quota eviction.
+
+        Args:
+            path: Workspace directory.
+        """
+        with self._lock:
+            self._active.add(os.path.abspath(path))
+
+    def reclaim(self, path: str) -> bool:
+        """
+        Delete a workspace in the background.
+
+        The directory is renamed aside immediately, so its path can be reused
+        at once; the contents are removed by the reclaimer thread.
+
+        Args:
+            path: Directory to delete.
+
+        Returns:
+            True if the directory was queued for deletion.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            self._active.discard(path)
+            owner_file = self._owned.pop(path, None)
+        if owner_file is not None:
+            owner_file.close()
+
+        if not os.path.isdir(path):
+            return False
+
+        parent, name = os.path.split(path)
+        trash = os.path.join(parent, f"{RECLAIM_PREFIX}{name}-{uuid.uuid4().hex[:8]}")
+        try:
+            os.rename(path, trash)
+        except OSError as e:
+            logger.warning(f"Failed to move {path} aside, deleting in place: {str(e)}")
+            trash = path
+
+        self._enqueue(trash)
+        return True
+
+    def recover_orphans(self) -> List[str]:
+        """
+        Reclaim work directories left behind by runs that are no longer alive,
+        and finish deletions interrupted by a crash.
+
+        Returns:
+            Paths queued for deletion.
+        """
+        recovered = []
+        for name in self._list_root():
+            path = os.path.join(self.root, name)
+            if name.startswith(RECLAIM_PREFIX):
+                self._enqueue(path)
+                recovered.append(path)
+            elif name.startswith(WORK_DIR_PREFIX) and self._is_orphan(path):
+                logger.info(f"Recovering orphaned work directory: {path}")
+                if self.reclaim(path):
+                    recovered.append(path)
+
+        with self._lock:
+            self.stats["orphans"] += len(recovered)
+        return recovered
+
+    def enforce_quota(self, max_bytes: Optional[int] = None) -> List[str]:
+        """
+        Reclaim inactive workspaces, least recently modified first, until the
+        work directories fit in the quota.
+
+        Only this process's inactive workspaces and orphaned work directories
+        are candidates; other live runs are never touched.
+
+        Args:
+            max_bytes: Quota to enforce. If None, uses the configured quota.
+
+        Returns:
+            Paths queued for deletion.
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+
+        total = 0
+        candidates = []
+        for name in self._list_root():
+            path = os.path.join(self.root, name)
+            if name.startswith(RECLAIM_PREFIX):
+                continue
+            with self._lock:
+                owned = path in self._owned
+                active = set(self._active)
+            if owned:
+                for entry in os.scandir(path):
+                    if entry.is_dir(follow_symlinks=False) and not entry.name.startswith(RECLAIM_PREFIX):
+                        size = directory_size(entry.path)
+                        total += size
+                        if entry.path not in active:
+                            candidates.append((entry.stat().st_mtime, size, entry.path))
+            else:
+                size = directory_size(path)
+                total += size
+                if name.startswith(WORK_DIR_PREFIX) and self._is_orphan(path):
+                    candidates.append((os.stat(path).st_mtime, size, path))
+
+        evicted = []
+        for _, size, path in sorted(candidates):
+            if total <= max_bytes:
+                break
+            logger.info(f"Evicting workspace over quota: {path}")
+            if self.reclaim(path):
+                evicted.append(path)
+                total -= size
+
+        if total > max_bytes:
+            logger.warning(f"Workspaces use {total} bytes, over the {max_bytes} byte quota, "
+                           f"but nothing else can be evicted")
+        with self._lock:
+            self.stats["evicted"] += len(evicted)
+        return evicted
+
+    def request_quota_check(self) -> None:
+        """
+        Enforce the quota on the reclaimer thread, since measuring workspaces walks them.
+        """
+        self._enqueue(None)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for queued deletions to finish.
+
+        Args:
+            timeout: Maximum time to wait (in seconds). If None, waits indefinitely.
+
+        Returns:
+            True if the queue drained in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _enqueue(self, path: Optional[str]) -> None:
+        """
+        Queue a directory for deletion, starting the reclaimer thread if needed.
+
+        Args:
+            path: Directory to delete, or None to enforce the quota.
+        """
+        if sys.is_finalizing():
+            # No new threads can start during interpreter shutdown; directories
+            # already moved aside are removed by the next recover_orphans
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="novasystem-reclaimer",
+                                                daemon=True)
+                self._thread.start()
+        self._queue.put(path)
+
+    def _worker(self) -> None:
+        """
+        Delete queued directories.
+        """
+        while True:
+            path = self._queue.get()
+            if path is None:
+                try:
+                    self.enforce_quota()
+                except OSError as e:
+                    logger.warning(f"Failed to enforce workspace quota: {str(e)}")
+                self._queue.task_done()
+                continue
+            try:
+                shutil.rmtree(path)
+                outcome = "reclaimed"
+            except FileNotFoundError:
+                outcome = "reclaimed"
+            except OSError as e:
+                # Anything left under a reclaim name is retried by recover_orphans
+                logger.warning(f"Failed to delete workspace {path}: {str(e)}")
+                outcome = "failed"
+            with self._lock:
+                self.stats[outcome] += 1
+            self._queue.task_done()
+
+    def _list_root(self) -> List[str]:
+        """
+        List the entries of the root directory.
+        """
+        try:
+            return sorted(os.listdir(self.root))
+        except FileNotFoundError:
+            return []
+
+    def _is_orphan(self, work_dir: str) -> bool:
+        """
+        Check whether a work directory's owner process is gone.
+
+        Args:
+            work_dir: Work directory.
+
+        Returns:
+            True if no live process owns it.
+        """
+        with self._lock:
+            if work_dir in self._owned:
+                return False
+
+        owner_path = os.path.join(work_dir, OWNER_FILE)
+        try:
+            with open(owner_path, "r+") as owner_file:
+                if fcntl is not None:
+                    try:
+                        fcntl.flock(owner_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except OSError:
+                        return False
+                    fcntl.flock(owner_file, fcntl.LOCK_UN)
+                    return True
+                pid = owner_file.read().strip()
+                return not (pid.isdigit() and _pid_alive(int(pid)))
+        except FileNotFoundError:
+            # Not created by a reclaimer; leave it alone
+            return False
+        except OSError as e:
+            logger.warning(f"Failed to check owner of {work_dir}: {str(e)}")
+            return False
+
+
+_default_reclaimer: Optional[WorkspaceReclaimer] = None
+_default_lock = threading.Lock()
+
+
+def get_default_reclaimer() -> WorkspaceReclaimer:
+    """
+    Get the process-wide reclaimer, recovering orphaned work directories on first use.
+
+    Returns:
+        The default WorkspaceReclaimer.
+    """
+    global _default_reclaimer
+    with _default_lock:
+        if _default_reclaimer is None:
+            _default_reclaimer = WorkspaceReclaimer()
+            _default_reclaimer.recover_orphans()
+        return _default_reclaimer
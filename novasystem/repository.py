@@ -6,40 +6,141 @@ finding documentation files, and extracting relevant information.
 """
 
 import os
+import re
+import time
 import logging
+import tarfile
 import tempfile
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 from pathlib import Path
 import git
 import requests
 from urllib.parse import urlparse
 
+from .mirror import MirrorCache
+from .ignore import IgnoreRules, compile_patterns
+from .github import GitHubClient, get_default_github_client
+from .reclaimer import WorkspaceReclaimer, directory_size, get_default_reclaimer
+
 logger = logging.getLogger(__name__)
 
+# Paths checked out by a sparse clone: enough for documentation discovery,
+# command parsing and repository type detection (gitignore-style patterns)
+SPARSE_PATTERNS = [
+    "*.md", "*.markdown", "*.rst", "*.txt", "*.adoc",
+    "README*", "INSTALL*", "SETUP*", "/docs/", "/doc/",
+    "package.json", "setup.py", "setup.cfg", "pyproject.toml", "Pipfile",
+    "Gemfile", "pom.xml", "build.gradle", "go.mod", "Cargo.toml", "composer.json",
+    "*.csproj", "*.fsproj", "*.vbproj", "Dockerfile", "docker-compose.yml",
+    "docker-compose.yaml", "Makefile", ".gitignore",
+]
+
+# Compiled SPARSE_PATTERNS, for filtering snapshot tarball members
+_SPARSE_RULES = compile_patterns(SPARSE_PATTERNS)
+
+# Largest single file extracted from a snapshot
+DEFAULT_MAX_SNAPSHOT_FILE_BYTES = 1024 * 1024
+SNAPSHOT_SUFFIXES = (".tar.gz", ".tgz", ".tar")
+
+
+def _is_sparse_path(rel_path: str) -> bool:
+    """
+    Check whether a path is selected by SPARSE_PATTERNS.
+
+    Args:
+        rel_path: Path relative to the repository root, using "/" separators.
+
+    Returns:
+        True if the path or one of its parent directories matches.
+    """
+    parts = rel_path.split("/")
+    for depth in range(1, len(parts) + 1):
+        prefix = "/".join(parts[:depth])
+        is_dir = depth < len(parts)
+        for regex, negated, dir_only in _SPARSE_RULES:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(prefix):
+                return True
+    return False
+
+# Documentation discovery: candidate extensions, filename relevance to
+# installation (first match wins) and heading keywords
+DOC_EXTENSIONS = {".md", ".markdown", ".rst", ".txt", ".adoc", ""}
+DOC_NAME_SCORES = [
+    (re.compile(r"^install"), 100),
+    (re.compile(r"^(setup|getting[-_ ]?started|quick[-_ ]?start|usage)"), 80),
+    (re.compile(r"^readme"), 70),
+    (re.compile(r"^(build|building|compil)"), 60),
+    (re.compile(r"^(contributing|develop|hacking)"), 40),
+]
+# Documentation that never holds installation steps
+DOC_EXCLUDE = re.compile(r"^(changelog|changes|history|news|license|licence|copying|authors|"
+                         r"code[-_]of[-_]conduct|security|codeowners)")
+DOC_DIR_NAMES = {"docs", "doc", "documentation", "wiki"}
+HEADING_KEYWORDS = re.compile(
+    r"\b(install|setup|set up|getting started|quick ?start|build|requirements|"
+    r"prerequisites|dependencies)",
+    re.IGNORECASE
+)
+# reStructuredText and setext heading underlines
+UNDERLINE_PATTERN = re.compile(r"^([=\-~^*#])\1{2,}\s*$")
+
+DEFAULT_MAX_DOC_FILES = 10
+DEFAULT_MAX_DOC_BYTES = 1024 * 1024
+DEFAULT_MAX_DOC_DEPTH = 4
+# Bytes read from each shortlisted candidate to look for headings
+HEADING_SCAN_BYTES = 8192
+
+
 class RepositoryHandler:
     """
     Handles Git repository operations including cloning, file discovery, and content extraction.
     """
 
-    def __init__(self, work_dir: Optional[str] = None):
+    def __init__(self, work_dir: Optional[str] = None, mirror_cache: Optional[MirrorCache] = None,
+                 github_client: Optional[GitHubClient] = None,
+                 reclaimer: Optional[WorkspaceReclaimer] = None):
         """
         Initialize the RepositoryHandler.
 
         Args:
-            work_dir: Directory to clone repositories into. If None, a temporary directory is used.
+            work_dir: Directory to clone repositories into. If None, a work
+                directory owned by this process is created under the reclaimer's root.
+            mirror_cache: Mirror cache to check repositories out from instead of cloning.
+            github_client: GitHub API client. If None, the process-wide client is used.
+            reclaimer: Workspace reclaimer. If None, the process-wide reclaimer is used.
         """
-        self.work_dir = work_dir or tempfile.mkdtemp(prefix="novasystem-")
+        self.reclaimer = reclaimer or get_default_reclaimer()
+        # Only a work directory we created is ever deleted as a whole
+        self.owns_work_dir = work_dir is None
+        self.work_dir = work_dir or self.reclaimer.create_work_dir()
+        self.mirror_cache = mirror_cache
+        self._github_client = github_client
         self.repo_dir: Optional[str] = None
         self.repo_url: Optional[str] = None
+        self.clone_stats: Dict[str, Dict[str, Any]] = {}
+        # Worktree directories checked out from the mirror cache, by repository URL
+        self.worktrees: Dict[str, str] = {}
 
         logger.info(f"Repository handler initialized with work directory: {self.work_dir}")
 
-    def clone_repository(self, repo_url: str) -> str:
+    def clone_repository(self, repo_url: str, sparse: bool = False) -> str:
         """
         Clone a Git repository.
 
+        A sparse clone fetches only the latest commit, without file contents
+        outside SPARSE_PATTERNS (--depth 1 --filter=blob:none). That is enough
+        for documentation discovery and parsing; call materialize() to check
+        out the full working tree before executing commands.
+
+        With a mirror cache, the repository is instead fetched into its
+        persistent mirror and checked out as a worktree, which is already
+        complete, so sparse is ignored.
+
         Args:
             repo_url: URL of the repository to clone.
+            sparse: Whether to clone only documentation and manifest files.
 
         Returns:
             Path to the cloned repository directory.
@@ -51,10 +152,15 @@ class RepositoryHandler:
 
         # Parse URL to get repository name
         parsed_url = urlparse(repo_url)
-        if not parsed_url.netloc or not parsed_url.path:
+        path_parts = parsed_url.path.strip('/').split('/')
+        if parsed_url.scheme == 'file':
+            # Local repositories, e.g. mirrors and test fixtures
+            if not parsed_url.path.strip('/'):
+                raise ValueError(f"Invalid repository URL: {repo_url}")
+            path_parts = ['local'] + path_parts
+        elif not parsed_url.netloc or not parsed_url.path:
             raise ValueError(f"Invalid repository URL: {repo_url}")
 
-        path_parts = parsed_url.path.strip('/').split('/')
         if len(path_parts) < 2:
             raise ValueError(f"Invalid GitHub repository URL format: {repo_url}")
 
@@ -62,24 +168,310 @@ class RepositoryHandler:
         if repo_name.endswith('.git'):
             repo_name = repo_name[:-4]
 
-        # Create target directory
+        # Create target directory, making room for it in the background
         target_dir = os.path.join(self.work_dir, f"{repo_owner}_{repo_name}")
+        existed = os.path.exists(target_dir)
+        self.reclaimer.activate(target_dir)
+        self.reclaimer.request_quota_check()
 
         try:
-            logger.info(f"Cloning repository {repo_url} into {target_dir}")
-
-            # Clone the repository
-            git.Repo.clone_from(repo_url, target_dir)
+            logger.info(f"Cloning repository {repo_url} into {target_dir}"
+                        + (" (sparse)" if sparse else ""))
+            start_time = time.time()
+
+            if self.mirror_cache:
+                mirror_stats = self.mirror_cache.checkout(repo_url, target_dir)
+                self.worktrees[target_dir] = repo_url
+                sparse = False
+            elif sparse:
+                repo = git.Repo.clone_from(repo_url, target_dir, depth=1, filter="blob:none",
+                                           no_checkout=True)
+                repo.git.sparse_checkout("set", "--no-cone", *SPARSE_PATTERNS)
+                repo.git.checkout()
+            else:
+                # Clone the repository
+                git.Repo.clone_from(repo_url, target_dir)
             self.repo_dir = target_dir
 
-            logger.info(f"Repository cloned successfully to {target_dir}")
+            stats = self._measure_clone(target_dir)
+            stats["sparse"] = sparse
+            stats["seconds"] = time.time() - start_time
+            stats["materialized"] = not sparse
+            if self.mirror_cache:
+                stats.update(
+                    mirror=mirror_stats["mirror"],
+                    mirror_created=mirror_stats["created"],
+                    fetch_seconds=mirror_stats["seconds"],
+                    checkout_seconds=mirror_stats["checkout_seconds"],
+                    transfer_bytes=mirror_stats["fetched_bytes"]
+                )
+            self.clone_stats[target_dir] = stats
+
+            logger.info(f"Repository cloned successfully to {target_dir} in {stats['seconds']:.2f}s "
+                        f"({stats['transfer_bytes']} bytes fetched, "
+                        f"{stats['files_deferred']} files deferred)")
             return target_dir
 
-        except git.GitCommandError as e:
+        except (git.GitCommandError, ValueError) as e:
+            if not existed and target_dir not in self.worktrees:
+                # Remove the partial clone
+                self.reclaimer.reclaim(target_dir)
             error_msg = f"Failed to clone repository {repo_url}: {str(e)}"
             logger.error(error_msg)
             raise ValueError(error_msg)
 
+    def materialize(self, repo_dir: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Check out the full working tree of a sparse clone.
+
+        Missing file contents are fetched from the remote. A no-op for full
+        clones and trees that were already materialized.
+
+        Args:
+            repo_dir: Repository directory. If None, uses the last cloned repository.
+
+        Returns:
+            Clone statistics for the repository, including the bytes and
+            seconds spent materializing.
+
+        Raises:
+            ValueError: If the working tree cannot be checked out.
+        """
+        repo_dir = repo_dir or self.repo_dir
+        stats = self.clone_stats.get(repo_dir)
+        if stats is None or stats["materialized"]:
+            return stats or {}
+
+        try:
+            start_time = time.time()
+            git.Repo(repo_dir).git.sparse_checkout("disable")
+        except git.GitCommandError as e:
+            error_msg = f"Failed to materialize repository {repo_dir}: {str(e)}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        full = self._measure_clone(repo_dir)
+        stats.update({
+            "materialized": True,
+            "materialize_seconds": time.time() - start_time,
+            "materialize_bytes": full["transfer_bytes"] - stats["transfer_bytes"],
+            "full_checkout_bytes": full["checkout_bytes"],
+        })
+        logger.info(f"Materialized {stats['files_deferred']} deferred files in {repo_dir} in "
+                    f"{stats['materialize_seconds']:.2f}s ({stats['materialize_bytes']} bytes fetched)")
+        return stats
+
+    def get_clone_stats(self, repo_dir: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get transfer statistics for a cloned repository.
+
+        For a sparse clone that was never materialized, "files_deferred"
+        files were never downloaded. Once materialized, "materialize_bytes"
+        and "materialize_seconds" are the cost that a run which stops after
+        parsing avoids.
+
+        Args:
+            repo_dir: Repository directory. If None, uses the last cloned repository.
+
+        Returns:
+            Dictionary of statistics, empty if the directory was not cloned by this handler.
+        """
+        return dict(self.clone_stats.get(repo_dir or self.repo_dir, {}))
+
+    @staticmethod
+    def _measure_clone(repo_dir: str) -> Dict[str, Any]:
+        """
+        Measure the object store, working tree and deferred files of a clone.
+
+        Args:
+            repo_dir: Repository directory.
+
+        Returns:
+            Dictionary with transfer_bytes, checkout_bytes, files_checked_out and files_deferred.
+        """
+        # Entries with the skip-worktree bit ("S") are outside the sparse checkout
+        tags = [line[:1] for line in git.Repo(repo_dir).git.ls_files("-t").splitlines()]
+        deferred = tags.count("S")
+        return {
+            "transfer_bytes": directory_size(os.path.join(repo_dir, ".git", "objects")),
+            "checkout_bytes": directory_size(repo_dir, exclude=".git"),
+            "files_checked_out": len(tags) - deferred,
+            "files_deferred": deferred,
+        }
+
+    def iter_snapshot_files(self, source: str, ref: str = "HEAD",
+                            strip_components: Optional[int] = None,
+                            max_file_bytes: int = DEFAULT_MAX_SNAPSHOT_FILE_BYTES,
+                            stats: Optional[Dict[str, Any]] = None) -> Iterator[Tuple[str, bytes]]:
+        """
+        Stream a repository snapshot tarball, yielding only docs and manifests.
+
+        The tarball is read sequentially from the network or a local file.
+        Members outside SPARSE_PATTERNS are skipped as they stream past and
+        are never written anywhere.
+
+        Args:
+            source: GitHub repository URL, tarball URL, or local tarball path.
+            ref: Branch, tag or commit for GitHub repository URLs.
+            strip_components: Leading path components to strip from member names,
+                as with tar --strip-components. If None, strips the
+                "owner-repo-sha/" directory of GitHub tarballs and nothing otherwise.
+            max_file_bytes: Larger matching files are skipped.
+            stats: Optional dictionary updated with member and byte counts.
+
+        Yields:
+            Tuples of (path relative to the repository root, file content).
+
+        Raises:
+            ValueError: If the snapshot cannot be fetched or read.
+        """
+        stats = stats if stats is not None else {}
+        stats.update(members=0, extracted=0, bytes_streamed=0, bytes_extracted=0)
+
+        response = None
+        try:
+            if os.path.isfile(source):
+                fileobj = open(source, "rb")
+                url = None
+            else:
+                url = self._snapshot_url(source, ref)
+                response = self.github_client.session.get(url, stream=True,
+                                                          headers=self.github_client.request_headers(url),
+                                                          timeout=self.github_client.timeout)
+                response.raise_for_status()
+                response.raw.decode_content = True
+                fileobj = response.raw
+
+            if strip_components is None:
+                strip_components = 1 if url and url.startswith(f"{self.github_client.api_base}/repos/") else 0
+
+            with fileobj, tarfile.open(fileobj=fileobj, mode="r|*") as tar:
+                for member in tar:
+                    stats["members"] += 1
+                    stats["bytes_streamed"] += member.size
+                    parts = [p for p in member.name.split("/") if p not in ("", ".")]
+                    rel_path = "/".join(parts[strip_components:])
+
+                    if not member.isfile() or not rel_path or member.size > max_file_bytes:
+                        continue
+                    if rel_path.startswith("/") or ".." in rel_path.split("/"):
+                        logger.warning(f"Skipping unsafe snapshot member: {member.name}")
+                        continue
+                    if not _is_sparse_path(rel_path):
+                        continue
+
+                    content = tar.extractfile(member).read()
+                    stats["extracted"] += 1
+                    stats["bytes_extracted"] += len(content)
+                    yield rel_path, content
+        except (requests.RequestException, tarfile.TarError, OSError) as e:
+            error_msg = f"Failed to read repository snapshot {source}: {str(e)}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        finally:
+            if response is not None:
+                response.close()
+
+    def fetch_snapshot(self, source: str, ref: str = "HEAD",
+                       strip_components: Optional[int] = None,
+                       max_file_bytes: int = DEFAULT_MAX_SNAPSHOT_FILE_BYTES) -> str:
+        """
+        Extract the docs and manifests of a repository snapshot into a directory.
+
+        Much cheaper than cloning when only documentation is needed, since
+        no git objects are transferred and other files never touch the disk.
+
+        Args:
+            source: GitHub repository URL, tarball URL, or local tarball path.
+            ref: Branch, tag or commit for GitHub repository URLs.
+            strip_components: Leading path components to strip (see iter_snapshot_files).
+            max_file_bytes: Larger matching files are skipped.
+
+        Returns:
+            Path of the extracted partial tree, inside the work directory.
+
+        Raises:
+            ValueError: If the snapshot cannot be fetched or read.
+        """
+        start_time = time.time()
+        os.makedirs(self.work_dir, exist_ok=True)
+        target_dir = tempfile.mkdtemp(prefix="snapshot-", dir=self.work_dir)
+        self.reclaimer.activate(target_dir)
+        stats: Dict[str, Any] = {}
+
+        try:
+            for rel_path, content in self.iter_snapshot_files(source, ref, strip_components,
+                                                              max_file_bytes, stats):
+                path = os.path.join(target_dir, *rel_path.split("/"))
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(content)
+        except ValueError:
+            self.reclaimer.reclaim(target_dir)
+            raise
+
+        stats.update(snapshot=True, sparse=True, materialized=False, seconds=time.time() - start_time,
+                     files_deferred=stats["members"] - stats["extracted"])
+        self.clone_stats[target_dir] = stats
+        self.repo_dir = target_dir
+        logger.info(f"Extracted {stats['extracted']} of {stats['members']} snapshot members "
+                    f"({stats['bytes_extracted']} of {stats['bytes_streamed']} bytes) "
+                    f"from {source} in {stats['seconds']:.2f}s")
+        return target_dir
+
+    @staticmethod
+    def is_snapshot_source(source: str) -> bool:
+        """
+        Check whether a source can be read as an archive snapshot.
+
+        Args:
+            source: Repository URL, tarball URL, or local path.
+
+        Returns:
+            True for local tarballs, tarball URLs and GitHub repository URLs.
+        """
+        if os.path.isfile(source):
+            return True
+        parsed_url = urlparse(source)
+        if parsed_url.scheme not in ("http", "https"):
+            return False
+        return source.endswith(SNAPSHOT_SUFFIXES) or 'github.com' in parsed_url.netloc
+
+    def _snapshot_url(self, source: str, ref: str) -> str:
+        """
+        Get the tarball URL for a snapshot source.
+
+        Args:
+            source: GitHub repository URL or tarball URL.
+            ref: Branch, tag or commit for GitHub repository URLs.
+
+        Returns:
+            URL to download.
+
+        Raises:
+            ValueError: If the source is neither.
+        """
+        parsed_url = urlparse(source)
+        if parsed_url.scheme not in ("http", "https"):
+            raise ValueError(f"Not a tarball path or URL: {source}")
+        if source.endswith(SNAPSHOT_SUFFIXES) or 'github.com' not in parsed_url.netloc:
+            return source
+
+        path_parts = parsed_url.path.strip('/').split('/')
+        if len(path_parts) < 2:
+            raise ValueError(f"Invalid GitHub repository URL format: {source}")
+        owner, repo = path_parts[0], path_parts[1]
+        if repo.endswith('.git'):
+            repo = repo[:-4]
+        return f"{self.github_client.api_base}/repos/{owner}/{repo}/tarball/{ref}"
+
+    @property
+    def github_client(self) -> GitHubClient:
+        """GitHub API client shared across handlers unless one was given."""
+        if self._github_client is None:
+            self._github_client = get_default_github_client()
+        return self._github_client
+
     def validate_github_repository(self, repo_url: str) -> Dict[str, Any]:
         """
         Validate that a GitHub repository exists and is accessible.
@@ -107,12 +499,8 @@ class RepositoryHandler:
             repo = repo[:-4]
 
         # Call GitHub API to validate repository
-        api_url = f"https://api.github.com/repos/{owner}/{repo}"
-
         try:
-            response = requests.get(api_url)
-            response.raise_for_status()
-            repo_data = response.json()
+            repo_data = self.github_client.get_repository(owner, repo)
 
             return {
                 "owner": owner,
@@ -174,6 +562,125 @@ class RepositoryHandler:
         logger.error(error_msg)
         raise ValueError(error_msg)
 
+    def find_documentation_files(self, repo_dir: Optional[str] = None,
+                                 max_files: int = DEFAULT_MAX_DOC_FILES,
+                                 max_total_bytes: int = DEFAULT_MAX_DOC_BYTES,
+                                 max_depth: int = DEFAULT_MAX_DOC_DEPTH) -> List[str]:
+        """
+        Find documentation files likely to contain installation instructions.
+
+        The tree is walked once with os.scandir, skipping .gitignore'd and
+        vendored directories. Candidates are ranked by filename, directory
+        and depth; the best few are then re-ranked by the installation
+        keywords in their headings. The result is capped by file count and
+        total size so parse cost stays bounded on large repositories.
+
+        Args:
+            repo_dir: Repository directory. If None, uses the last cloned repository.
+            max_files: Maximum number of files to return.
+            max_total_bytes: Maximum combined size of the returned files.
+            max_depth: Maximum directory depth searched (0 = repository root only).
+
+        Returns:
+            Paths of documentation files, most relevant first.
+
+        Raises:
+            ValueError: If repo_dir is not specified and no repository has been cloned.
+        """
+        if repo_dir is None:
+            if self.repo_dir is None:
+                raise ValueError("No repository directory specified and no repository has been cloned")
+            repo_dir = self.repo_dir
+
+        start_time = time.time()
+        candidates = []
+        for rel_path, entry, depth in IgnoreRules(repo_dir).walk(max_depth=max_depth):
+            score = self._score_documentation_path(rel_path, depth)
+            if score is None:
+                continue
+            try:
+                size = entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
+            if size == 0:
+                continue
+            candidates.append([score, rel_path, entry.path, size])
+
+        # Headings are only read for a shortlist, bounding I/O on huge repositories
+        candidates.sort(key=lambda c: (-c[0], c[1]))
+        for candidate in candidates[:max_files * 3]:
+            candidate[0] += self._score_documentation_headings(candidate[2])
+        candidates.sort(key=lambda c: (-c[0], c[1]))
+
+        selected = []
+        total_bytes = 0
+        for score, rel_path, path, size in candidates:
+            if len(selected) >= max_files:
+                break
+            if total_bytes + size > max_total_bytes:
+                logger.debug(f"Skipping {rel_path} ({size} bytes): documentation byte budget exhausted")
+                continue
+            selected.append(path)
+            total_bytes += size
+
+        logger.info(f"Found {len(selected)} documentation files ({total_bytes} bytes) out of "
+                    f"{len(candidates)} candidates in {time.time() - start_time:.2f}s")
+        return selected
+
+    @staticmethod
+    def _score_documentation_path(rel_path: str, depth: int) -> Optional[int]:
+        """
+        Score a path by its likely relevance to installation.
+
+        Args:
+            rel_path: Path relative to the repository root.
+            depth: Directory depth of the file.
+
+        Returns:
+            Score, or None if the file is not documentation.
+        """
+        name = rel_path.rsplit("/", 1)[-1].lower()
+        stem, ext = os.path.splitext(name)
+        if ext not in DOC_EXTENSIONS or DOC_EXCLUDE.match(stem):
+            return None
+
+        name_score = next((score for pattern, score in DOC_NAME_SCORES if pattern.match(stem)), None)
+        if name_score is None:
+            # Extensionless files are only documentation if they have a known name
+            if not ext or ext == ".txt":
+                return None
+            name_score = 10
+
+        parents = rel_path.lower().split("/")[:-1]
+        score = name_score - 10 * depth
+        if any(parent in DOC_DIR_NAMES for parent in parents):
+            score += 15
+        return score
+
+    @staticmethod
+    def _score_documentation_headings(path: str) -> int:
+        """
+        Score a file by the installation keywords in its headings.
+
+        Args:
+            path: Path to the file.
+
+        Returns:
+            Bonus score (0-30).
+        """
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                head = f.read(HEADING_SCAN_BYTES)
+        except OSError:
+            return 0
+
+        lines = head.splitlines()
+        headings = [line for line in lines if line.startswith("#")]
+        headings.extend(lines[i - 1] for i in range(1, len(lines)) if UNDERLINE_PATTERN.match(lines[i]))
+
+        matches = {m.group(1).lower() for line in headings for m in HEADING_KEYWORDS.finditer(line)}
+        return min(15 * len(matches), 30)
+
     def find_configuration_files(self, repo_dir: Optional[str] = None) -> Dict[str, str]:
         """
         Find configuration files in the repository (requirements.txt, package.json, etc.).
@@ -246,17 +753,58 @@ class RepositoryHandler:
             logger.error(error_msg)
             raise ValueError(error_msg)
 
-    def cleanup(self):
+    def read_documentation_content(self, doc_file: str, max_bytes: Optional[int] = None) -> str:
         """
-        Clean up temporary directories created by the repository handler.
+        Read the content of a documentation file, tolerating bad encodings.
+
+        Args:
+            doc_file: Path to the documentation file.
+            max_bytes: Maximum number of bytes to read. If None, reads the whole file.
+
+        Returns:
+            Content of the documentation file.
+
+        Raises:
+            ValueError: If the file cannot be read.
+        """
+        try:
+            with open(doc_file, 'rb') as f:
+                data = f.read() if max_bytes is None else f.read(max_bytes)
+            return data.decode('utf-8', errors='replace')
+        except OSError as e:
+            error_msg = f"Failed to read documentation file {doc_file}: {str(e)}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+    def cleanup(self, repo_dir: Optional[str] = None):
         """
-        # Only clean up if we created a temporary directory
-        if self.work_dir.startswith(tempfile.gettempdir()) and os.path.exists(self.work_dir):
+        Clean up directories created by the repository handler.
+
+        Directories are moved aside at once and deleted in the background
+        by the workspace reclaimer.
+
+        Args:
+            repo_dir: A single cloned repository to remove. If None, all
+                repositories are removed, along with the work directory if
+                the handler created it.
+        """
+        if repo_dir is not None:
+            self.clone_stats.pop(repo_dir, None)
+            if repo_dir in self.worktrees:
+                # Unregister the worktree so its mirror can be evicted later
+                self.mirror_cache.remove_worktree(self.worktrees.pop(repo_dir), repo_dir)
+            elif os.path.abspath(repo_dir).startswith(os.path.abspath(self.work_dir) + os.sep):
+                self.reclaimer.reclaim(repo_dir)
+            return
+
+        for worktree, url in list(self.worktrees.items()):
+            self.mirror_cache.remove_worktree(url, worktree)
+        self.worktrees.clear()
+
+        if self.owns_work_dir:
             logger.info(f"Cleaning up repository handler work directory: {self.work_dir}")
-            try:
-                # This is a bit dangerous, so we add some checks
-                if self.work_dir.startswith(tempfile.gettempdir()) and "novasystem" in self.work_dir:
-                    import shutil
-                    shutil.rmtree(self.work_dir)
-            except Exception as e:
-                logger.warning(f"Failed to clean up work directory: {str(e)}")
\ No newline at end of file
+            self.reclaimer.reclaim(self.work_dir)
+        else:
+            for path in list(self.clone_stats):
+                self.reclaimer.reclaim(path)
+        self.clone_stats.clear()
@@ -0,0 +1,447 @@
+"""
+Resource Scheduler for NovaSystem.
+
+This module provides host-level admission control for execution containers,
+so concurrent runs are queued and packed against a memory and CPU budget
+instead of oversubscribing the host. Reservations are recorded in a ledger
+file shared by every NovaSystem process on the host, so separate installs
+admit against one budget.
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import itertools
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Callable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from .cache import parse_size
+
+logger = logging.getLogger(__name__)
+
+# Waiting requests re-check the ledger this often, since other processes
+# cannot wake them when they release
+LEDGER_POLL_INTERVAL = 0.2
+
+# Priority classes; higher values are admitted first
+PRIORITY_BATCH = 0
+PRIORITY_NORMAL = 50
+PRIORITY_INTERACTIVE = 100
+
+PRIORITIES = {
+    "batch": PRIORITY_BATCH,
+    "normal": PRIORITY_NORMAL,
+    "interactive": PRIORITY_INTERACTIVE,
+}
+
+
+class Reservation:
+    """Resources granted to one container by the scheduler."""
+
+    def __init__(self, reservation_id: int, memory: int, cpu: float, priority: int,
+                 on_preempt: Optional[Callable[["Reservation"], None]] = None):
+        """
+        Initialize a Reservation.
+
+        Args:
+            reservation_id: Unique ID of the reservation.
+            memory: Reserved memory (in bytes).
+            cpu: Reserved CPUs.
+            priority: Priority class of the work.
+            on_preempt: Called when higher-priority work needs the resources back.
+                Work without a callback is never preempted.
+        """
+        self.id = reservation_id
+        self.memory = memory
+        self.cpu = cpu
+        self.priority = priority
+        self.on_preempt = on_preempt
+        self.requested_at = time.time()
+        self.granted_at: Optional[float] = None
+        self.preempted = threading.Event()
+
+    def __repr__(self) -> str:
+        return (f"Reservation(id={self.id}, memory={self.memory}, cpu={self.cpu}, "
+                f"priority={self.priority})")
+
+
+def _host_memory() -> int:
+    """
+    Get the physical memory of the host.
+
+    Returns:
+        Memory in bytes, or 4 GiB if it cannot be determined.
+    """
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return 4 * 1024 ** 3
+
+
+def _process_alive(pid: int) -> bool:
+    """
+    Check whether a process is still running.
+
+    Args:
+        pid: Process ID.
+
+    Returns:
+        True if the process exists.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ResourceScheduler:
+    """
+    Admits work against a memory and CPU budget.
+
+    Waiting requests are considered in priority order, then arrival order.
+    A request that fits is admitted even if an earlier request of the same
+    priority does not (bin packing), but lower-priority work never overtakes
+    a blocked higher-priority request. When higher-priority work is blocked,
+    preemptible lower-priority reservations are asked to give way.
+
+    The budget is shared through the ledger with other schedulers on the
+    host, in this process or others; priorities and preemption apply among
+    the requests of this scheduler. Reservations of processes that exited
+    are dropped from the ledger.
+    """
+
+    def __init__(self, memory_budget: Optional[Any] = None, cpu_budget: Optional[float] = None,
+                 preempt_below: int = PRIORITY_NORMAL, ledger_path: Optional[str] = None):
+        """
+        Initialize the ResourceScheduler.
+
+        Args:
+            memory_budget: Total memory to commit (bytes or size string). If None,
+                read from NOVASYSTEM_MEMORY_BUDGET or 80% of host memory.
+            cpu_budget: Total CPUs to commit. If None, read from NOVASYSTEM_CPU_BUDGET
+                or the host CPU count.
+            preempt_below: Reservations with a priority below this may be preempted.
+            ledger_path: File recording the reservations of all schedulers on the
+                host. If None, uses NOVASYSTEM_SCHEDULER_LEDGER or
+                ~/.novasystem/scheduler.json.
+        """
+        if memory_budget is None:
+            memory_budget = os.environ.get("NOVASYSTEM_MEMORY_BUDGET") or int(_host_memory() * 0.8)
+        if cpu_budget is None:
+            cpu_budget = float(os.environ.get("NOVASYSTEM_CPU_BUDGET") or os.cpu_count() or 1)
+
+        self.memory_budget = parse_size(memory_budget)
+        self.cpu_budget = float(cpu_budget)
+        self.preempt_below = preempt_below
+        self.ledger_path = ledger_path or os.environ.get(
+            "NOVASYSTEM_SCHEDULER_LEDGER",
+            os.path.expanduser("~/.novasystem/scheduler.json")
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(self.ledger_path)), exist_ok=True)
+        if fcntl is None:
+            logger.warning("fcntl unavailable: the scheduler budget is not shared between processes")
+
+        # Identifies this scheduler's entries in the ledger
+        self._owner = f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+        self._condition = threading.Condition()
+        self._ids = itertools.count(1)
+        self._active: Dict[int, Reservation] = {}
+        self._waiting: List[Reservation] = []
+        self._admitted: set = set()
+
+    def acquire(self, memory: Any, cpu: float, priority: int = PRIORITY_NORMAL,
+                timeout: Optional[float] = None,
+                on_preempt: Optional[Callable[[Reservation], None]] = None) -> Reservation:
+        """
+        Block until the requested resources can be committed.
+
+        Requests larger than the whole budget are admitted only when nothing
+        else is running.
+
+        Args:
+            memory: Memory to reserve (bytes or size string).
+            cpu: CPUs to reserve.
+            priority: Priority class of the work.
+            timeout: Maximum time to wait (in seconds). If None, wait indefinitely.
+            on_preempt: Callback asking the holder to release early.
+
+        Returns:
+            The granted reservation.
+
+        Raises:
+            TimeoutError: If the resources were not available within the timeout.
+        """
+        reservation = Reservation(next(self._ids), parse_size(memory), float(cpu), priority, on_preempt)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._condition:
+            self._waiting.append(reservation)
+            self._waiting.sort(key=lambda r: (-r.priority, r.id))
+            if reservation.memory > self.memory_budget or reservation.cpu > self.cpu_budget:
+                logger.warning(f"{reservation} exceeds the scheduler budget; it will run alone")
+
+            try:
+                while True:
+                    self._schedule()
+                    if reservation.id in self._admitted:
+                        self._admitted.discard(reservation.id)
+                        break
+
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"Timed out waiting for resources for {reservation}")
+                    self._condition.wait(LEDGER_POLL_INTERVAL if remaining is None
+                                         else min(remaining, LEDGER_POLL_INTERVAL))
+            except BaseException:
+                if reservation in self._waiting:
+                    self._waiting.remove(reservation)
+                elif reservation.id in self._active:
+                    self._admitted.discard(reservation.id)
+                    self._release_locked(reservation)
+                self._condition.notify_all()
+                raise
+
+        logger.info(f"Admitted {reservation} after waiting "
+                    f"{reservation.granted_at - reservation.requested_at:.2f}s")
+        return reservation
+
+    def release(self, reservation: Reservation) -> None:
+        """
+        Return a reservation's resources to the budget.
+
+        Args:
+            reservation: Reservation returned by acquire().
+        """
+        with self._condition:
+            if reservation.id in self._active:
+                self._release_locked(reservation)
+                self._condition.notify_all()
+
+    @contextmanager
+    def reserve(self, memory: Any, cpu: float, priority: int = PRIORITY_NORMAL,
+                timeout: Optional[float] = None,
+                on_preempt: Optional[Callable[[Reservation], None]] = None) -> Iterator[Reservation]:
+        """
+        Context manager that acquires a reservation and releases it on exit.
+
+        Args:
+            memory: Memory to reserve (bytes or size string).
+            cpu: CPUs to reserve.
+            priority: Priority class of the work.
+            timeout: Maximum time to wait (in seconds).
+            on_preempt: Callback asking the holder to release early.
+
+        Yields:
+            The granted reservation.
+        """
+        reservation = self.acquire(memory, cpu, priority, timeout, on_preempt)
+        try:
+            yield reservation
+        finally:
+            self.release(reservation)
+
+    def usage(self) -> Dict[str, Any]:
+        """
+        Get the current commitment against the budget.
+
+        Returns:
+            Dictionary with resources committed on the host and budgeted, and
+            this scheduler's active and waiting requests.
+        """
+        with self._condition:
+            with self._ledger() as entries:
+                memory_used, cpu_used = self._committed(entries)
+            return {
+                "memory_committed": memory_used,
+                "memory_budget": self.memory_budget,
+                "cpu_committed": cpu_used,
+                "cpu_budget": self.cpu_budget,
+                "active": len(self._active),
+                "waiting": len(self._waiting),
+            }
+
+    @contextmanager
+    def _ledger(self) -> Iterator[Dict[str, Dict[str, Any]]]:
+        """
+        Hold the ledger lock and edit the host's reservations.
+
+        Entries of exited processes are dropped. Changes made to the yielded
+        mapping are written back when the block exits.
+
+        Yields:
+            Mapping of reservation keys to entries with pid, memory, cpu and priority.
+        """
+        with open(f"{self.ledger_path}.lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(self.ledger_path, "r") as f:
+                        stored = json.load(f)
+                except (OSError, ValueError):
+                    stored = {}
+                entries = {key: entry for key, entry in stored.items()
+                           if entry.get("pid") == os.getpid() or _process_alive(entry.get("pid", 0))}
+
+                yield entries
+                if entries != stored:
+                    fd, temp_path = tempfile.mkstemp(prefix=".scheduler-",
+                                                     dir=os.path.dirname(os.path.abspath(self.ledger_path)))
+                    with os.fdopen(fd, "w") as f:
+                        json.dump(entries, f)
+                    os.replace(temp_path, self.ledger_path)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _ledger_key(self, reservation: Reservation) -> str:
+        """
+        Get the ledger key of one of this scheduler's reservations.
+        """
+        return f"{self._owner}:{reservation.id}"
+
+    def _committed(self, entries: Dict[str, Dict[str, Any]]) -> tuple:
+        """
+        Sum the resources committed on the host.
+
+        Args:
+            entries: Ledger entries, including this scheduler's.
+
+        Returns:
+            Tuple of committed memory (in bytes) and CPUs.
+        """
+        return (sum(entry["memory"] for entry in entries.values()),
+                sum(entry["cpu"] for entry in entries.values()))
+
+    def _release_locked(self, reservation: Reservation) -> None:
+        """
+        Release a reservation. Must be called with the condition held.
+
+        Args:
+            reservation: Active reservation.
+        """
+        del self._active[reservation.id]
+        with self._ledger() as entries:
+            entries.pop(self._ledger_key(reservation), None)
+        logger.debug(f"Released {reservation}")
+
+    def _fits(self, reservation: Reservation, memory_used: int, cpu_used: float) -> bool:
+        """
+        Check whether a reservation fits alongside the given commitment.
+        """
+        if memory_used == 0 and cpu_used == 0:
+            # An idle host always admits one request, even an oversized one
+            return True
+        return (memory_used + reservation.memory <= self.memory_budget
+                and cpu_used + reservation.cpu <= self.cpu_budget + 1e-9)
+
+    def _schedule(self) -> None:
+        """
+        Admit waiting requests that fit, and preempt for blocked ones.
+        Must be called with the condition held.
+        """
+        if not self._waiting:
+            return
+
+        # Admission decisions and ledger entries must be made under one lock,
+        # or two processes could both claim the last of the budget
+        with self._ledger() as entries:
+            memory_used, cpu_used = self._committed(entries)
+            blocked_priority = None
+
+            for reservation in list(self._waiting):
+                if blocked_priority is not None and reservation.priority < blocked_priority:
+                    break
+
+                if self._fits(reservation, memory_used, cpu_used):
+                    self._waiting.remove(reservation)
+                    reservation.granted_at = time.time()
+                    self._active[reservation.id] = reservation
+                    self._admitted.add(reservation.id)
+                    entries[self._ledger_key(reservation)] = {
+                        "pid": os.getpid(), "memory": reservation.memory,
+                        "cpu": reservation.cpu, "priority": reservation.priority,
+                    }
+                    memory_used += reservation.memory
+                    cpu_used += reservation.cpu
+                    continue
+
+                if blocked_priority is None:
+                    blocked_priority = reservation.priority
+                    self._preempt_for(reservation, memory_used, cpu_used)
+
+        if self._admitted:
+            self._condition.notify_all()
+
+    def _preempt_for(self, blocked: Reservation, memory_used: int, cpu_used: float) -> None:
+        """
+        Ask lower-priority reservations to give way to a blocked request.
+
+        Only preempts if doing so would actually make room. Must be called
+        with the condition held.
+
+        Args:
+            blocked: The highest-priority request that does not fit.
+            memory_used: Currently committed memory.
+            cpu_used: Currently committed CPUs.
+        """
+        candidates = sorted(
+            (r for r in self._active.values()
+             if r.priority < min(blocked.priority, self.preempt_below)
+             and r.on_preempt and not r.preempted.is_set()),
+            key=lambda r: (r.priority, -r.id)
+        )
+        # Resources already being given back by earlier preemptions
+        pending = [r for r in self._active.values() if r.preempted.is_set()]
+        memory_used -= sum(r.memory for r in pending)
+        cpu_used -= sum(r.cpu for r in pending)
+
+        victims = []
+        for candidate in candidates:
+            if self._fits(blocked, memory_used, cpu_used):
+                break
+            victims.append(candidate)
+            memory_used -= candidate.memory
+            cpu_used -= candidate.cpu
+
+        if not victims or not self._fits(blocked, memory_used, cpu_used):
+            return
+
+        for victim in victims:
+            logger.warning(f"Preempting {victim} for {blocked}")
+            victim.preempted.set()
+            # Run the callback outside the lock; it will usually call release()
+            threading.Thread(target=victim.on_preempt, args=(victim,),
+                             name="novasystem-preempt", daemon=True).start()
+
+
+_default_scheduler: Optional[ResourceScheduler] = None
+_default_lock = threading.Lock()
+
+
+def get_default_scheduler() -> ResourceScheduler:
+    """
+    Get the process-wide scheduler shared by all executors.
+
+    Schedulers in other processes share its budget through the ledger.
+
+    Returns:
+        The default ResourceScheduler.
+    """
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = ResourceScheduler()
+        return _default_scheduler
@@ -0,0 +1,129 @@
+"""
+Adaptive Command Timeouts for NovaSystem.
+
+This module derives per-command timeouts from the execution times of
+previous runs of the same (normalized) command.
+"""
+
+import re
+import math
+import logging
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Patterns replaced by placeholders so that trivially different invocations
+# of the same command share a history. Applied in order.
+_NORMALIZE_PATTERNS = [
+    (re.compile(r"[a-z][a-z0-9+.-]*://\S+", re.IGNORECASE), "<url>"),
+    (re.compile(r"(?<![\w.-])(?:/[\w.@+-]+){2,}/?"), "<path>"),
+    (re.compile(r"\b[0-9a-f]{12,64}\b", re.IGNORECASE), "<hash>"),
+    (re.compile(r"(==|>=|<=|~=|!=|@|>|<)\s*v?\d+(?:\.[\w*]+)*"), r"\1<version>"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def normalize_command(command: str) -> str:
+    """
+    Normalize a command so equivalent invocations compare equal.
+
+    URLs, absolute paths, hashes and version pins are replaced by placeholders
+    and whitespace is collapsed.
+
+    Args:
+        command: Command text.
+
+    Returns:
+        Normalized command text.
+    """
+    normalized = command.strip()
+    for pattern, replacement in _NORMALIZE_PATTERNS:
+        normalized = pattern.sub(replacement, normalized)
+    return normalized
+
+
+def percentile(values: List[float], quantile: float) -> float:
+    """
+    Compute a percentile using linear interpolation between closest ranks.
+
+    Args:
+        values: Sample values (need not be sorted).
+        quantile: Quantile between 0 and 1.
+
+    Returns:
+        The interpolated percentile.
+    """
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * quantile
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return ordered[lower]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class TimeoutPolicy:
+    """
+    Chooses a timeout for each command from its execution-time history.
+
+    The timeout is the chosen percentile of recent execution times multiplied
+    by a safety factor and clamped between a floor and a ceiling. Commands
+    with too little history get the cold-start default. Timed-out executions
+    count as samples at their timeout value, so a command that keeps hitting
+    its limit has its timeout raised on the next run.
+    """
+
+    SOURCE_HISTORY = "history"
+    SOURCE_DEFAULT = "default"
+
+    def __init__(self, db_manager, default_timeout: int = 300,
+                 quantile: float = 0.99, safety_factor: float = 3.0,
+                 floor: int = 30, ceiling: int = 3600,
+                 min_samples: int = 5, history_size: int = 200):
+        """
+        Initialize the TimeoutPolicy.
+
+        Args:
+            db_manager: DatabaseManager providing execution-time history.
+            default_timeout: Timeout for commands without enough history (in seconds).
+            quantile: Percentile of the history to use, between 0 and 1.
+            safety_factor: Multiplier applied to the percentile.
+            floor: Minimum timeout (in seconds).
+            ceiling: Maximum timeout (in seconds).
+            min_samples: Samples required before history is trusted.
+            history_size: Number of most recent samples considered.
+        """
+        if floor > ceiling:
+            raise ValueError(f"Timeout floor {floor} exceeds ceiling {ceiling}")
+
+        self.db_manager = db_manager
+        self.default_timeout = default_timeout
+        self.quantile = quantile
+        self.safety_factor = safety_factor
+        self.floor = floor
+        self.ceiling = ceiling
+        self.min_samples = min_samples
+        self.history_size = history_size
+
+    def timeout_for(self, command: str, normalized: Optional[str] = None) -> Tuple[int, str]:
+        """
+        Choose a timeout for a command.
+
+        Args:
+            command: Command text.
+            normalized: Pre-computed normalized command, if available.
+
+        Returns:
+            Tuple of (timeout in seconds, source), where source is "history" or "default".
+        """
+        normalized = normalized or normalize_command(command)
+        samples = self.db_manager.get_execution_times(normalized, limit=self.history_size)
+
+        if len(samples) < self.min_samples:
+            logger.debug(f"Using default timeout for '{normalized}' ({len(samples)} samples)")
+            return self.default_timeout, self.SOURCE_DEFAULT
+
+        estimate = percentile(samples, self.quantile) * self.safety_factor
+        timeout = int(math.ceil(min(max(estimate, self.floor), self.ceiling)))
+        logger.debug(f"Timeout for '{normalized}': {timeout}s from {len(samples)} samples")
+        return timeout, self.SOURCE_HISTORY
@@ -0,0 +1,288 @@
+"""
+Workspace Archive module for NovaSystem.
+
+This module builds .gitignore-filtered tarballs of repositories for streaming
+into containers with put_archive, caching them by commit so each commit is
+archived only once.
+"""
+
+import os
+import time
+import hashlib
+import logging
+import tarfile
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
+
+from .ignore import IgnoreRules
+
+logger = logging.getLogger(__name__)
+
+# Directory name the repository is extracted to inside the archive
+ARCHIVE_ROOT = "repo"
+
+DEFAULT_MAX_CACHE_BYTES = 2 * 1024 ** 3
+
+
+def _git(repo_dir: str, *args: str) -> Optional[bytes]:
+    """
+    Run a git command in a repository.
+
+    Args:
+        repo_dir: Repository directory.
+        *args: git arguments.
+
+    Returns:
+        Standard output, or None if git failed or is unavailable.
+    """
+    try:
+        result = subprocess.run(["git", "-C", repo_dir, *args], stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, check=True)
+        return result.stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def list_workspace_files(repo_dir: str) -> List[str]:
+    """
+    List the files that belong in a workspace archive.
+
+    Uses git's own view of tracked and untracked-but-not-ignored files when
+    the directory is a git work tree, and the .gitignore rules otherwise.
+
+    Args:
+        repo_dir: Repository directory.
+
+    Returns:
+        Sorted relative paths.
+    """
+    output = _git(repo_dir, "ls-files", "-z", "--cached", "--others", "--exclude-standard")
+    if output is not None:
+        paths = {p for p in output.decode("utf-8", errors="surrogateescape").split("\0") if p}
+        # Tracked files deleted from the work tree are still listed
+        return sorted(p for p in paths if os.path.lexists(os.path.join(repo_dir, p)))
+
+    rules = IgnoreRules(repo_dir, vendor_dirs=[".git"])
+    return sorted(rel_path for rel_path, _, _ in rules.walk())
+
+
+def _writable(tarinfo: tarfile.TarInfo) -> tarfile.TarInfo:
+    """
+    Make archive members writable by the unprivileged container user.
+
+    The container user's numeric IDs are unknown when the archive is built, so
+    permissions are widened instead of changing ownership.
+    """
+    tarinfo.uid = tarinfo.gid = 0
+    tarinfo.uname = tarinfo.gname = ""
+    if tarinfo.isdir():
+        tarinfo.mode |= 0o777
+    elif tarinfo.isfile():
+        tarinfo.mode |= 0o666
+    return tarinfo
+
+
+class WorkspaceArchiveCache:
+    """
+    Builds and caches workspace tarballs.
+
+    Clean git work trees are keyed by commit SHA. Dirty trees and plain
+    directories are keyed by a fingerprint of file paths, sizes and
+    modification times, so unchanged trees still hit the cache. Builds run on
+    a background thread pool and concurrent requests for the same key share a
+    single build.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+                 max_workers: int = 2):
+        """
+        Initialize the WorkspaceArchiveCache.
+
+        Args:
+            cache_dir: Directory for cached tarballs. If None, uses NOVASYSTEM_WORKSPACE_CACHE
+                or ~/.novasystem/workspaces.
+            max_bytes: Total size of cached tarballs kept after each build.
+            max_workers: Number of background build threads.
+        """
+        self.cache_dir = cache_dir or os.environ.get(
+            "NOVASYSTEM_WORKSPACE_CACHE",
+            os.path.expanduser("~/.novasystem/workspaces")
+        )
+        self.max_bytes = max_bytes
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="novasystem-workspace")
+        self._lock = threading.Lock()
+        self._builds: Dict[str, Future] = {}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def cache_key(self, repo_dir: str) -> Tuple[str, Optional[List[str]]]:
+        """
+        Compute the cache key for a repository.
+
+        Args:
+            repo_dir: Repository directory.
+
+        Returns:
+            Tuple of (key, file list if it had to be computed).
+        """
+        sha = _git(repo_dir, "rev-parse", "--verify", "HEAD")
+        status = _git(repo_dir, "status", "--porcelain") if sha else None
+        if sha and status is not None and not status.strip():
+            return f"commit-{sha.decode().strip()}", None
+
+        files = list_workspace_files(repo_dir)
+        digest = hashlib.sha256()
+        for rel_path in files:
+            try:
+                stat = os.lstat(os.path.join(repo_dir, rel_path))
+            except OSError:
+                continue
+            digest.update(f"{rel_path}\0{stat.st_size}\0{stat.st_mtime_ns}\0{stat.st_mode}\n".encode(
+                "utf-8", errors="surrogateescape"))
+        return f"tree-{digest.hexdigest()}", files
+
+    def prefetch(self, repo_dir: str) -> Future:
+        """
+        Start building a repository's archive in the background.
+
+        Args:
+            repo_dir: Repository directory.
+
+        Returns:
+            Future resolving to the archive path.
+        """
+        key, files = self.cache_key(repo_dir)
+        archive_path = os.path.join(self.cache_dir, f"{key}.tar")
+
+        with self._lock:
+            build = self._builds.get(key)
+            if build is not None and not self._is_stale(build):
+                return build
+
+            if os.path.exists(archive_path):
+                os.utime(archive_path)
+                build = Future()
+                build.set_result(archive_path)
+            else:
+                logger.info(f"Building workspace archive {key} for {repo_dir}")
+                build = self._pool.submit(self._build, repo_dir, archive_path, files)
+            self._builds[key] = build
+            return build
+
+    @staticmethod
+    def _is_stale(build: Future) -> bool:
+        """
+        Check whether a finished build failed or its archive has since been evicted.
+        """
+        if not build.done():
+            return False
+        return build.exception() is not None or not os.path.exists(build.result())
+
+    def get_archive(self, repo_dir: str, timeout: Optional[float] = None) -> str:
+        """
+        Get a repository's archive, building it if necessary.
+
+        Args:
+            repo_dir: Repository directory.
+            timeout: Maximum time to wait for a build (in seconds).
+
+        Returns:
+            Path to the tarball.
+        """
+        return self.prefetch(repo_dir).result(timeout=timeout)
+
+    def _build(self, repo_dir: str, archive_path: str, files: Optional[List[str]]) -> str:
+        """
+        Write a repository archive atomically.
+
+        Args:
+            repo_dir: Repository directory.
+            archive_path: Destination path.
+            files: Files to include, or None to list them.
+
+        Returns:
+            The archive path.
+        """
+        start_time = time.time()
+        if files is None:
+            files = list_workspace_files(repo_dir)
+
+        fd, temp_path = tempfile.mkstemp(prefix=".building-", suffix=".tar", dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as f, tarfile.open(fileobj=f, mode="w") as tar:
+                tar.add(repo_dir, arcname=ARCHIVE_ROOT, recursive=False, filter=_writable)
+                added_dirs = set()
+                for rel_path in files:
+                    # Add parent directories explicitly so their modes are widened too
+                    parts = rel_path.split("/")[:-1]
+                    for depth in range(1, len(parts) + 1):
+                        parent = "/".join(parts[:depth])
+                        if parent not in added_dirs:
+                            added_dirs.add(parent)
+                            tar.add(os.path.join(repo_dir, parent), arcname=f"{ARCHIVE_ROOT}/{parent}",
+                                    recursive=False, filter=_writable)
+                    tar.add(os.path.join(repo_dir, rel_path), arcname=f"{ARCHIVE_ROOT}/{rel_path}",
+                            recursive=False, filter=_writable)
+            os.replace(temp_path, archive_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+        logger.info(f"Built workspace archive {archive_path} ({len(files)} files, "
+                    f"{os.path.getsize(archive_path)} bytes) in {time.time() - start_time:.2f}s")
+        self._prune(keep=archive_path)
+        return archive_path
+
+    def _prune(self, keep: str) -> None:
+        """
+        Delete least recently used archives beyond the size budget.
+
+        Args:
+            keep: Archive that must not be deleted.
+        """
+        archives = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".tar") and not entry.name.startswith("."):
+                stat = entry.stat()
+                archives.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in archives)
+        for _, size, path in sorted(archives):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.unlink(path)
+                total -= size
+                logger.info(f"Evicted workspace archive {path}")
+            except OSError as e:
+                logger.warning(f"Failed to evict workspace archive {path}: {str(e)}")
+
+    def close(self) -> None:
+        """
+        Stop the background build threads.
+        """
+        self._pool.shutdown(wait=False)
+
+
+_default_cache: Optional[WorkspaceArchiveCache] = None
+_default_lock = threading.Lock()
+
+
+def get_default_archive_cache() -> WorkspaceArchiveCache:
+    """
+    Get the process-wide workspace archive cache.
+
+    Returns:
+        The default WorkspaceArchiveCache.
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = WorkspaceArchiveCache()
+        return _default_cache
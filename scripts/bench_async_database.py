@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Async Database Benchmark
+
+This script runs many concurrent asyncio writers, each logging a run with
+its commands, once calling the blocking DatabaseManager from the event loop
+and once through AsyncDatabaseManager. It reports write throughput and how
+long the event loop stalled, measured by a ticker coroutine.
+
+Usage:
+    python scripts/bench_async_database.py --writers 50 --commands 200
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from novasystem.async_database import AsyncDatabaseManager
+from novasystem.database import DatabaseManager
+
+TICK = 0.001
+
+async def ticker(lags: list, stop: asyncio.Event) -> None:
+    """Sleep in short ticks and record how late each wake-up is."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(TICK)
+        lags.append(loop.time() - start - TICK)
+
+async def blocking_writer(db: DatabaseManager, index: int, commands: int) -> None:
+    """Log a run by calling the blocking manager from the event loop."""
+    run_id = db.create_run(f"https://github.com/example/project-{index}")
+    for step in range(commands):
+        command_id = db.log_command(run_id, f"step {step}", status="pending")
+        db.update_command(command_id, exit_code=0, execution_time=0.01, status="success")
+        await asyncio.sleep(0)
+    db.update_run(run_id, status="completed", success=True, end_time=True)
+
+async def async_writer(db: AsyncDatabaseManager, index: int, commands: int) -> None:
+    """Log a run through the async manager."""
+    run_id = await db.create_run(f"https://github.com/example/project-{index}")
+    for step in range(commands):
+        command_id = await db.log_command(run_id, f"step {step}", status="pending")
+        await db.update_command(command_id, exit_code=0, execution_time=0.01, status="success")
+    await db.update_run(run_id, status="completed", success=True, end_time=True)
+
+async def run(label: str, db, writer, writers: int, commands: int) -> None:
+    """Run concurrent writers with a ticker and print the results."""
+    lags: list = []
+    stop = asyncio.Event()
+    tick_task = asyncio.ensure_future(ticker(lags, stop))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(writer(db, i, commands) for i in range(writers)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick_task
+
+    writes = writers * (2 * commands + 2)
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99)] if lags else 0.0
+    print(f"{label:<24} {elapsed:7.2f} s  {writes / elapsed:9.0f} writes/s  "
+          f"loop lag median {statistics.median(lags or [0]) * 1000:6.2f} ms  "
+          f"p99 {p99 * 1000:7.2f} ms  max {max(lags or [0]) * 1000:7.2f} ms  ({len(lags)} ticks)")
+
+async def main_async(args: argparse.Namespace, directory: str) -> None:
+    """Benchmark both managers on separate databases."""
+    db = DatabaseManager(os.path.join(directory, "blocking.db"), commit_batch=args.batch_size)
+    await run("DatabaseManager (sync)", db, blocking_writer, args.writers, args.commands)
+    db.close()
+
+    async with AsyncDatabaseManager(os.path.join(directory, "async.db"), batch_size=args.batch_size) as db:
+        await run("AsyncDatabaseManager", db, async_writer, args.writers, args.commands)
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark concurrent asyncio database writers")
+    parser.add_argument("--writers", type=int, default=50, help="Concurrent writer coroutines")
+    parser.add_argument("--commands", type=int, default=200, help="Commands logged per writer")
+    parser.add_argument("--batch-size", type=int, default=100, help="Writes per group commit")
+    parser.add_argument("--dir", help="Directory for the databases (default: a temporary directory)")
+    args = parser.parse_args()
+
+    directory = args.dir or tempfile.mkdtemp(prefix="novasystem-bench-")
+    os.makedirs(directory, exist_ok=True)
+    print(f"{args.writers} writers x {args.commands} commands")
+    asyncio.run(main_async(args, directory))
+    if not args.dir:
+        shutil.rmtree(directory)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Database Query Benchmark
+
+This script fills a scratch database with synthetic run history and times
+the DatabaseManager lookups that grow with history, so the effect of the
+schema indexes can be measured at realistic sizes.
+
+Usage:
+    python scripts/bench_database.py --commands 1000000
+    python scripts/bench_database.py --commands 1000000 --drop-indexes
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from novasystem.database import DatabaseManager, encode_blob, run_cursor
+
+COMMANDS = ["pip install -e .", "npm install", "make", "make test", "python setup.py build",
+            "cargo build --release", "go build ./...", "pytest -q"]
+STATUSES = ["completed", "completed", "completed", "error", "started"]
+INDEXES = ["idx_commands_run", "idx_documentation_run", "idx_runs_status_start", "idx_runs_start"]
+
+def populate(db: DatabaseManager, runs: int, commands_per_run: int) -> None:
+    """Insert synthetic runs, commands and documentation in bulk."""
+    rng = random.Random(42)
+    start = datetime.now() - timedelta(days=365)
+    with db.transaction() as connection:
+        connection.executemany(
+            "INSERT INTO runs (id, repo_url, start_time, status, success) VALUES (?, ?, ?, ?, ?)",
+            ((i, f"https://github.com/example/project-{i % 500}",
+              (start + timedelta(seconds=i * 30)).isoformat(), rng.choice(STATUSES), rng.random() < 0.7)
+             for i in range(1, runs + 1))
+        )
+        connection.executemany(
+            "INSERT INTO commands (run_id, command, exit_code, output, execution_time, status) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            ((run_id, rng.choice(COMMANDS), 0, "ok", rng.random() * 10, "success")
+             for run_id in range(1, runs + 1) for _ in range(commands_per_run))
+        )
+        readme = encode_blob("# Project\n\npip install -e .\n")
+        connection.execute("INSERT INTO doc_blobs (hash, size, compression, content) VALUES (?, ?, ?, ?)",
+                           readme)
+        connection.executemany(
+            "INSERT INTO documentation (run_id, file_path, content_hash) VALUES (?, ?, ?)",
+            ((run_id, "README.md", readme[0]) for run_id in range(1, runs + 1))
+        )
+
+def measure(label: str, operation, repeat: int) -> None:
+    """Time an operation and print latency percentiles."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    print(f"{label:<28} median {statistics.median(times) * 1000:8.3f} ms   "
+          f"p95 {times[int(len(times) * 0.95) - 1] * 1000:8.3f} ms")
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark run-history queries")
+    parser.add_argument("--commands", type=int, default=1000000,
+                        help="Total command rows (default: 1000000)")
+    parser.add_argument("--commands-per-run", type=int, default=20,
+                        help="Command rows per run (default: 20)")
+    parser.add_argument("--repeat", type=int, default=50, help="Samples per query (default: 50)")
+    parser.add_argument("--drop-indexes", action="store_true",
+                        help="Drop the lookup indexes to measure the unindexed baseline")
+    parser.add_argument("--db", help="Database path (default: a temporary file)")
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(prefix="novasystem-bench-"), "bench.db")
+    db = DatabaseManager(path)
+    runs = max(1, args.commands // args.commands_per_run)
+
+    start = time.perf_counter()
+    populate(db, runs, args.commands_per_run)
+    print(f"Populated {runs} runs / {runs * args.commands_per_run} commands "
+          f"in {time.perf_counter() - start:.1f} s ({os.path.getsize(path) / 1024 ** 2:.0f} MiB)")
+
+    if args.drop_indexes:
+        with db.transaction() as connection:
+            for index in INDEXES:
+                connection.execute(f"DROP INDEX IF EXISTS {index}")
+        print("Lookup indexes dropped")
+
+    rng = random.Random(7)
+    cutoff = (datetime.now() - timedelta(days=400)).isoformat()
+    measure("get_commands(run_id)", lambda: db.get_commands(rng.randint(1, runs)), args.repeat)
+    measure("get_documentation(run_id)", lambda: db.get_documentation(rng.randint(1, runs)), args.repeat)
+    measure("list_runs()", lambda: db.list_runs(limit=20), args.repeat)
+    measure("list_runs(status)", lambda: db.list_runs(limit=20, status="error"), args.repeat)
+    deep = runs - 40
+    cursor = run_cursor(db.list_runs(limit=1, offset=deep - 1)[0])
+    measure("list_runs(deep offset)", lambda: db.list_runs(limit=20, offset=deep), args.repeat)
+    measure("list_runs(deep cursor)", lambda: db.list_runs(limit=20, after=cursor), args.repeat)
+    measure("old runs lookup", lambda: db.connection.execute(
+        "SELECT id FROM runs WHERE start_time < ?", (cutoff,)).fetchall(), args.repeat)
+
+    db.close()
+    if not args.db:
+        os.remove(path)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
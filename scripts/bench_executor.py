@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Executor Throughput Benchmark
+
+This script runs real shell commands concurrently through the local
+subprocess backend and reports throughput, so execution overhead can be
+measured on hosts without a Docker daemon.
+
+Usage:
+    python scripts/bench_executor.py --workers 16 --commands 200
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from novasystem.executor import LocalExecutor
+
+def run_batch(command: str, count: int) -> list:
+    """Run a command count times in one sandbox and return execution times."""
+    executor = LocalExecutor(timeout=60)
+    executor.start_container()
+    try:
+        times = []
+        for _ in range(count):
+            result = executor.execute_command(command)
+            if not result.is_success():
+                raise RuntimeError(f"Command failed: {result.error.strip()}")
+            times.append(result.execution_time)
+        return times
+    finally:
+        executor.stop_container()
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the local executor backend")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent sandboxes (default: 8)")
+    parser.add_argument("--commands", type=int, default=200, help="Total commands to run (default: 200)")
+    parser.add_argument("--command", default="python3 -c 'print(sum(range(10000)))'",
+                        help="Command to execute")
+    args = parser.parse_args()
+
+    per_worker = max(1, args.commands // args.workers)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        batches = list(pool.map(lambda _: run_batch(args.command, per_worker), range(args.workers)))
+    elapsed = time.perf_counter() - start
+
+    times = [t for batch in batches for t in batch]
+    print(f"Commands:   {len(times)} across {args.workers} workers")
+    print(f"Wall time:  {elapsed:.2f} s")
+    print(f"Throughput: {len(times) / elapsed:.1f} commands/s")
+    print(f"Latency:    median {statistics.median(times) * 1000:.1f} ms, "
+          f"max {max(times) * 1000:.1f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+CLI Startup Benchmark
+
+This script times fresh interpreter processes importing the package and
+running database-only CLI commands against a temporary database, and
+reports which heavy dependencies each one loaded.
+
+Usage:
+    python scripts/bench_startup.py --repeat 20
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Dependencies that database-only commands should not need
+HEAVY_MODULES = ("git", "docker", "requests", "pyarrow", "zstandard")
+
+CASES = [
+    ("import novasystem", ["-c", "import novasystem"]),
+    ("import novasystem.cli", ["-c", "import novasystem.cli"]),
+    ("novasystem --help", ["-m", "novasystem", "--help"]),
+    ("novasystem list-runs", ["-m", "novasystem", "list-runs"]),
+    ("novasystem stats", ["-m", "novasystem", "stats"]),
+]
+
+def time_process(args: list, env: dict, cwd: str) -> tuple:
+    """Run a Python process and return its wall time in seconds and exit status."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, *args], env=env, cwd=cwd,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start, result.returncode
+
+def loaded_modules(args: list, env: dict, cwd: str) -> list:
+    """Return the heavy modules a command imports."""
+    if args[0] == "-m":
+        run = (f"sys.argv = {['novasystem', *args[2:]]!r}\n"
+               "try:\n"
+               "    runpy.run_module('novasystem', run_name='__main__', alter_sys=True)\n"
+               "except SystemExit:\n"
+               "    pass\n")
+    else:
+        run = args[1] + "\n"
+    check = ("import os, runpy, sys\n"
+             "sys.stdout = open(os.devnull, 'w')\n"
+             + run +
+             f"sys.__stdout__.write(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n")
+    result = subprocess.run([sys.executable, "-c", check], env=env, cwd=cwd,
+                            capture_output=True, text=True)
+    return result.stdout.split()
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark CLI startup time")
+    parser.add_argument("--repeat", type=int, default=10, help="Processes started per case")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="novasystem-bench-")
+    env = dict(os.environ, PYTHONPATH=str(ROOT), NOVASYSTEM_DB_PATH=os.path.join(directory, "runs.db"))
+    try:
+        baseline = statistics.median(time_process(["-c", "pass"], env, directory)[0]
+                                     for _ in range(args.repeat))
+        print(f"{'python -c pass':<24} {baseline * 1000:7.1f} ms")
+        for label, case in CASES:
+            results = [time_process(case, env, directory) for _ in range(args.repeat)]
+            median = statistics.median(elapsed for elapsed, _ in results)
+            failed = max(status for _, status in results)
+            heavy = loaded_modules(case, env, directory)
+            print(f"{label:<24} {median * 1000:7.1f} ms  (+{(median - baseline) * 1000:6.1f} ms)  "
+                  f"loads: {', '.join(heavy) or '-'}" + (f"  [exit status {failed}]" if failed else ""))
+    finally:
+        shutil.rmtree(directory)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
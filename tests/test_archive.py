@@ -0,0 +1,61 @@
+"""
+Tests for NovaSystem run history archives
+-----------------------------------------
+"""
+
+import io
+
+import pytest
+
+from novasystem.archive import RunArchiveReader, RunArchiveWriter
+
+# Archive formats and the optional package each needs
+FORMATS = [("jsonl", None), ("jsonl.gz", None), ("jsonl.zst", "zstandard"), ("parquet", "pyarrow")]
+
+RECORDS = [
+    {
+        "run": {"id": i, "repo_url": f"https://github.com/example/project-{i}",
+                "start_time": f"2024-01-0{i}T00:00:00", "end_time": f"2024-01-0{i}T00:01:00",
+                "status": "completed", "success": True, "summary": None,
+                "repository_type": "python", "metadata": '{"index": %d}' % i},
+        "commands": [{"id": i, "run_id": i, "command": "pip install -e .", "exit_code": 0,
+                      "execution_time": 1.5, "status": "success"}],
+        "documentation": [{"id": i, "run_id": i, "file_path": "README.md",
+                           "content": "# Project\n" * 100, "metadata": {"size": 1000}}],
+    }
+    for i in range(1, 4)
+]
+
+
+@pytest.mark.parametrize("format, package", FORMATS)
+def test_archive_round_trip(tmp_path, format, package):
+    if package:
+        pytest.importorskip(package)
+    path = str(tmp_path / f"runs.{format}")
+
+    with RunArchiveWriter(path) as archive:
+        assert archive.format == format
+        for record in RECORDS:
+            archive.write(record)
+    assert archive.count == len(RECORDS)
+
+    with RunArchiveReader(path) as archive:
+        assert archive.format == format
+        assert list(archive) == RECORDS
+
+
+@pytest.mark.parametrize("format, package", FORMATS)
+def test_archive_round_trip_through_streams(format, package):
+    if package:
+        pytest.importorskip(package)
+    stream = io.BytesIO()
+
+    with RunArchiveWriter(fileobj=stream, format=format) as archive:
+        for record in RECORDS:
+            archive.write(record)
+    assert not stream.closed
+
+    stream.seek(0)
+    with RunArchiveReader(fileobj=stream) as archive:
+        assert list(archive) == RECORDS
+    assert not stream.closed
@@ -0,0 +1,71 @@
+"""
+Tests for NovaSystem AsyncDatabaseManager
+-----------------------------------------
+"""
+
+import asyncio
+
+import pytest
+
+from novasystem.async_database import AsyncDatabaseManager
+
+
+def test_concurrent_coroutines_log_runs(tmp_path):
+    async def install(db, i):
+        run_id = await db.create_run(f"https://github.com/example/project-{i}", repository_type="python")
+        for step in range(5):
+            command_id = await db.log_command(run_id, f"step {step}", status="pending")
+            await db.update_command(command_id, exit_code=0, execution_time=0.1, status="success")
+        await db.update_run(run_id, status="completed", success=True, end_time=True)
+        return run_id
+
+    async def scenario():
+        async with AsyncDatabaseManager(str(tmp_path / "runs.db"), batch_size=8) as db:
+            run_ids = await asyncio.gather(*(install(db, i) for i in range(20)))
+            commands = await db.get_commands(run_ids[0])
+            runs = [run async for run in db.iter_runs(page_size=6)]
+            stats = await db.get_stats()
+        return run_ids, commands, runs, stats
+
+    run_ids, commands, runs, stats = asyncio.run(scenario())
+
+    assert sorted(run_ids) == list(range(1, 21))
+    assert [(c["command"], c["status"]) for c in commands] == [(f"step {i}", "success") for i in range(5)]
+    assert sorted(run["id"] for run in runs) == run_ids and len(runs) == 20
+    assert stats[0]["runs"] == 20
+
+
+def test_cancelled_writes_are_dropped(tmp_path):
+    async def scenario():
+        async with AsyncDatabaseManager(str(tmp_path / "runs.db")) as db:
+            run_id = await db.create_run("https://github.com/example/project")
+
+            # Hold the write lock so queued writes wait
+            with db.db_manager.batch():
+                first = asyncio.ensure_future(db.log_command(run_id, "kept 1"))
+                await asyncio.sleep(0.05)
+                dropped = asyncio.ensure_future(db.log_command(run_id, "dropped"))
+                kept = asyncio.ensure_future(db.log_command(run_id, "kept 2"))
+                await asyncio.sleep(0)
+                dropped.cancel()
+                # Cancellation reaches the queued write on the next loop iterations
+                await asyncio.sleep(0.01)
+
+            await asyncio.gather(first, kept)
+            with pytest.raises(asyncio.CancelledError):
+                await dropped
+            return [c["command"] for c in await db.get_commands(run_id)]
+
+    assert asyncio.run(scenario()) == ["kept 1", "kept 2"]
+
+
+def test_errors_propagate_and_closed_manager_rejects_calls(tmp_path):
+    async def scenario():
+        db = AsyncDatabaseManager(str(tmp_path / "runs.db"))
+        with pytest.raises(ValueError):
+            await db.log_command(999, "no such run")
+        await db.close()
+        with pytest.raises(ValueError):
+            await db.create_run("https://github.com/example/project")
+
+    asyncio.run(scenario())
@@ -0,0 +1,114 @@
+"""
+Tests for NovaSystem package cache volumes
+------------------------------------------
+"""
+
+import pytest
+from docker.errors import NotFound
+
+from novasystem.cache import CacheVolumeManager, image_family, parse_size
+
+
+class FakeVolume:
+    """Minimal stand-in for a docker Volume."""
+
+    def __init__(self, client, name, labels):
+        self.client = client
+        self.name = name
+        self.labels = labels
+
+    def remove(self):
+        del self.client.volumes.store[self.name]
+
+
+class FakeVolumes:
+    """Minimal stand-in for DockerClient.volumes."""
+
+    def __init__(self, client):
+        self.client = client
+        self.store = {}
+
+    def get(self, name):
+        if name not in self.store:
+            raise NotFound(name)
+        return self.store[name]
+
+    def create(self, name, labels=None):
+        self.store[name] = FakeVolume(self.client, name, labels or {})
+        return self.store[name]
+
+
+class FakeClient:
+    """Docker client exposing only what CacheVolumeManager uses."""
+
+    def __init__(self):
+        self.volumes = FakeVolumes(self)
+        self.sizes = {}
+        self.in_use = set()
+
+    def df(self):
+        return {"Volumes": [
+            {"Name": v.name, "Labels": v.labels,
+             "UsageData": {"Size": self.sizes.get(v.name, 0),
+                           "RefCount": 1 if v.name in self.in_use else 0}}
+            for v in self.volumes.store.values()
+        ]}
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return CacheVolumeManager(FakeClient(), family="runner", managers=["pip", "npm", "go"],
+                              index_path=str(tmp_path / "index.json"), max_bytes=100)
+
+
+def test_parse_size():
+    assert parse_size("512") == 512
+    assert parse_size("1k") == 1024
+    assert parse_size("1g") == 1024 ** 3
+    assert parse_size("1.5m") == int(1.5 * 1024 ** 2)
+    assert parse_size("2GiB") == 2 * 1024 ** 3
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_image_family():
+    assert image_family("novasystem/runner:latest") == "novasystem-runner"
+    assert image_family("registry:5000/runner") == "registry-5000-runner"
+    assert image_family("python@sha256:abc") == "python"
+
+
+def test_volume_bindings_create_volumes(manager):
+    bindings = manager.volume_bindings()
+
+    assert bindings["novasystem-cache-runner-pip"] == {"bind": "/cache/pip", "mode": "rw"}
+    assert set(manager.client.volumes.store) == set(bindings)
+    assert manager.environment()["PIP_CACHE_DIR"] == "/cache/pip"
+    assert manager.environment()["GOMODCACHE"] == "/cache/go/mod"
+
+
+def test_prune_removes_least_recently_used(manager):
+    client = manager.client
+    manager.volume_bindings()
+    manager._save_index({"novasystem-cache-runner-pip": 1.0,
+                         "novasystem-cache-runner-npm": 2.0,
+                         "novasystem-cache-runner-go": 3.0})
+
+    client.sizes = {"novasystem-cache-runner-pip": 60,
+                    "novasystem-cache-runner-npm": 60,
+                    "novasystem-cache-runner-go": 60}
+    client.in_use = {"novasystem-cache-runner-pip"}
+
+    removed = manager.prune()
+
+    # pip is least recently used but mounted, so npm and go are evicted instead
+    assert removed == ["novasystem-cache-runner-npm", "novasystem-cache-runner-go"]
+    assert list(client.volumes.store) == ["novasystem-cache-runner-pip"]
+    assert "novasystem-cache-runner-npm" not in manager._load_index()
+
+
+def test_prune_all_ignores_budget(manager):
+    manager.volume_bindings()
+
+    assert manager.prune() == []
+    assert len(manager.prune(prune_all=True)) == 3
+    assert manager.client.volumes.store == {}
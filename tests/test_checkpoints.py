@@ -0,0 +1,162 @@
+"""
+Tests for NovaSystem container checkpointing and resume
+-------------------------------------------------------
+"""
+
+import time
+
+import pytest
+from docker.errors import ImageNotFound
+
+from novasystem.checkpoints import CHECKPOINT_LABEL, CheckpointStore
+from novasystem.executor import CommandResult
+from novasystem.nova import Nova
+from novasystem.parser import Command, CommandSource, CommandType
+
+
+class FakeImages:
+    """Minimal stand-in for DockerClient.images."""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, name):
+        if name not in self.store:
+            raise ImageNotFound(name)
+        return self.store[name]
+
+    def remove(self, name):
+        if name not in self.store:
+            raise ImageNotFound(name)
+        del self.store[name]
+
+
+class FakeClient:
+    """Docker client exposing only what CheckpointStore uses."""
+
+    def __init__(self):
+        self.images = FakeImages()
+
+    def add(self, tag, size, shared=0, age_days=0.0, labels=None):
+        self.images.store[tag] = {
+            "Id": f"sha256:{tag}", "RepoTags": [tag], "Size": size, "SharedSize": shared,
+            "Created": int(time.time() - age_days * 86400),
+            "Labels": {CHECKPOINT_LABEL: "1", **(labels or {})},
+        }
+
+    def df(self):
+        return {"Images": list(self.images.store.values())}
+
+
+class FakeExecutor:
+    """Executor that fails chosen commands and records checkpoints."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.executed = []
+        self.checkpoints = []
+        self.removed = []
+        self.started_from = []
+
+    def check_image_exists(self):
+        return True
+
+    def create_image(self):
+        return True
+
+    def prepare_workspace(self, repo_dir):
+        pass
+
+    def start_container(self, repo_dir=None, image=None):
+        self.started_from.append(image)
+        return "fake"
+
+    def execute_command(self, command, timeout=None):
+        self.executed.append(command)
+        exit_code = 1 if command in self.fail else 0
+        return CommandResult(command, exit_code, "", "", 0.1)
+
+    def stop_container(self):
+        return True
+
+    def checkpoint(self, tag, labels=None):
+        image = f"novasystem/checkpoint:{tag}"
+        self.checkpoints.append((image, labels))
+        return image
+
+    def remove_checkpoint(self, image):
+        self.removed.append(image)
+        return True
+
+    def run_commands(self, repo_dir, commands):
+        return []
+
+
+def make_plan(nova, texts):
+    commands = [Command(text, CommandSource.CODE_BLOCK, CommandType.SHELL) for text in texts]
+    return [{**cmd.to_dict(), "stage": nova.doc_parser.classify_stage(cmd)} for cmd in commands]
+
+
+@pytest.fixture
+def nova(tmp_path):
+    instance = Nova(db_path=str(tmp_path / "test.db"), executor=FakeExecutor(fail={"make test"}))
+    yield instance
+    instance.close()
+
+
+def test_gc_removes_expired_then_oldest_over_budget():
+    client = FakeClient()
+    client.add("novasystem/checkpoint:run-1-0", size=100, age_days=30)
+    client.add("novasystem/checkpoint:run-2-0", size=300, shared=100, age_days=3)
+    client.add("novasystem/checkpoint:run-3-0", size=200, age_days=2)
+    client.add("novasystem/checkpoint:run-4-0", size=200, age_days=1)
+    client.images.store["other:latest"] = {"RepoTags": ["other:latest"], "Size": 10 ** 9, "Labels": {}}
+
+    store = CheckpointStore(client)
+    assert [r["size"] for r in store.list()] == [100, 200, 200, 200]
+
+    removed = store.gc(max_age_days=7, max_bytes=400)
+
+    assert removed == ["novasystem/checkpoint:run-1-0", "novasystem/checkpoint:run-2-0"]
+    assert "other:latest" in client.images.store
+
+
+def test_failed_run_checkpoints_each_stage_and_resumes(nova):
+    executor = nova.executor
+    plan = make_plan(nova, ["mkdir out", "pip install -r requirements.txt", "make", "make test"])
+    assert [entry["stage"] for entry in plan] == ["prepare", "install_deps", "build", "build"]
+
+    run_id = nova.db_manager.create_run("https://example.com/repo.git")
+    nova.db_manager.update_run(run_id, metadata={"plan": plan, "mount": False})
+
+    result = nova._run_plan(run_id, "https://example.com/repo.git", plan, None)
+
+    assert not result["success"]
+    # One checkpoint per completed stage; earlier ones are superseded
+    assert [image for image, _ in executor.checkpoints] == [
+        f"novasystem/checkpoint:run-{run_id}-0",
+        f"novasystem/checkpoint:run-{run_id}-1",
+    ]
+    latest = nova.db_manager.get_latest_checkpoint(run_id)
+    assert latest["command_index"] == 1 and latest["stage"] == "install_deps"
+    assert len(nova.db_manager.get_checkpoints(run_id)) == 1
+
+    executor.fail.clear()
+    executor.executed.clear()
+    resumed = nova.resume_run(run_id)
+
+    assert resumed["success"]
+    assert resumed["resumed_from"] == 2
+    assert executor.started_from[-1] == latest["image"]
+    assert executor.executed == ["make", "make test"]
+    assert nova.db_manager.get_checkpoints(run_id) == []
+    assert latest["image"] in executor.removed
+
+
+def test_resume_rejects_successful_runs(nova):
+    plan = make_plan(nova, ["echo hi"])
+    run_id = nova.db_manager.create_run("/tmp/repo")
+    nova.db_manager.update_run(run_id, success=True, metadata={"plan": plan, "mount": False})
+
+    assert not nova.resume_run(run_id)["success"]
+    assert nova.executor.executed == []
@@ -0,0 +1,584 @@
+"""
+Tests for NovaSystem DatabaseManager
+------------------------------------
+"""
+
+import io
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from novasystem.archive import RunArchiveReader, RunArchiveWriter
+from novasystem.database import MIGRATIONS, DatabaseManager, run_cursor
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "runs.db"))
+    yield manager
+    manager.close()
+
+
+def test_log_command_records_resource_usage(db):
+    run_id = db.create_run("https://github.com/example/project")
+    db.log_command(run_id, "pip install .", exit_code=0, execution_time=2.5,
+                   resource_usage={"peak_memory_bytes": 300, "cpu_seconds": 1.5,
+                                   "block_write_bytes": 10, "net_rx_bytes": 20})
+
+    command = db.get_commands(run_id)[0]
+    assert command["peak_memory_bytes"] == 300
+    assert command["cpu_seconds"] == 1.5
+    assert command["block_read_bytes"] is None
+
+
+def test_resource_report_groups_and_orders(db):
+    run_id = db.create_run("https://github.com/example/project")
+    db.log_command(run_id, "pip install .", resource_usage={"peak_memory_bytes": 100})
+    db.log_command(run_id, "pip install .", resource_usage={"peak_memory_bytes": 500})
+    db.log_command(run_id, "npm install", resource_usage={"peak_memory_bytes": 200})
+    db.log_command(run_id, "echo no telemetry")
+
+    report = db.get_resource_report()
+
+    assert [row["name"] for row in report] == ["pip install .", "npm install"]
+    assert report[0]["count"] == 2
+    assert report[0]["max_peak_memory_bytes"] == 500
+    with pytest.raises(ValueError):
+        db.get_resource_report(order_by="id; DROP TABLE runs")
+
+
+def test_existing_database_gains_resource_columns(tmp_path):
+    path = str(tmp_path / "old.db")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE commands (id INTEGER PRIMARY KEY AUTOINCREMENT, run_id INTEGER NOT NULL, "
+                       "command TEXT NOT NULL, exit_code INTEGER, output TEXT, error TEXT, execution_time REAL, "
+                       "status TEXT, timestamp TIMESTAMP, command_type TEXT, priority INTEGER)")
+    connection.commit()
+    connection.close()
+
+    manager = DatabaseManager(path)
+    columns = {row["name"] for row in manager.connection.execute("PRAGMA table_info(commands)")}
+    manager.close()
+
+    assert {"peak_memory_bytes", "cpu_seconds", "net_tx_bytes"} <= columns
+
+
+def test_execution_time_history_uses_normalized_commands(db):
+    run_id = db.create_run("https://github.com/example/project")
+    db.log_command(run_id, "pip install requests==2.31.0", execution_time=4.0, status="success")
+    db.log_command(run_id, "pip  install requests==2.32.1", execution_time=6.0, status="timeout",
+                   timeout=6, timeout_source="history")
+    db.log_command(run_id, "pip install requests==2.32.1", status="pending")
+    db.log_command(run_id, "pip install flask", execution_time=1.0, status="success")
+
+    assert db.get_execution_times("pip install requests==<version>") == [6.0, 4.0]
+    command = db.get_commands(run_id)[1]
+    assert command["timeout"] == 6
+    assert command["timeout_source"] == "history"
+
+
+def count_commands(path):
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute("SELECT COUNT(*) FROM commands").fetchone()[0]
+    finally:
+        connection.close()
+
+
+def test_writes_are_group_committed(tmp_path):
+    path = str(tmp_path / "runs.db")
+    manager = DatabaseManager(path, commit_batch=3, commit_interval=60)
+    assert manager.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    run_id = manager.create_run("https://github.com/example/project")
+    manager.log_command(run_id, "pip install .")
+    # Visible to this manager, not yet committed for other connections
+    assert len(manager.get_commands(run_id)) == 1
+    assert count_commands(path) == 0
+
+    manager.log_command(run_id, "make")
+    assert count_commands(path) == 2
+
+    manager.log_command(run_id, "make test")
+    manager.update_run(run_id, status="completed", end_time=True)
+    # Finishing a run flushes the buffer
+    assert count_commands(path) == 3
+    manager.close()
+
+
+def test_buffered_writes_flush_after_interval(tmp_path):
+    path = str(tmp_path / "runs.db")
+    manager = DatabaseManager(path, commit_interval=0.01)
+    run_id = manager.create_run("https://github.com/example/project")
+    manager.log_command(run_id, "pip install .")
+
+    deadline = time.monotonic() + 5
+    while count_commands(path) == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert count_commands(path) == 1
+    manager.close()
+
+
+def test_update_command_fills_in_result(db):
+    run_id = db.create_run("https://github.com/example/project")
+    command_id = db.log_command(run_id, "pip install .", status="pending", timeout=60,
+                                timeout_source="default")
+
+    assert db.update_command(command_id, exit_code=0, output="ok", execution_time=1.5,
+                             status="success", resource_usage={"peak_memory_bytes": 300})
+
+    [command] = db.get_commands(run_id)
+    assert command["id"] == command_id
+    assert (command["status"], command["exit_code"], command["output"]) == ("success", 0, "ok")
+    assert command["timeout"] == 60 and command["peak_memory_bytes"] == 300
+    assert not db.update_command(command_id + 1, status="failed")
+
+
+def test_migration_collapses_pending_duplicates(tmp_path):
+    path = str(tmp_path / "old.db")
+    manager = DatabaseManager(path)
+    run_id = manager.create_run("https://github.com/example/project")
+    for command, status in [("pip install .", "pending"), ("pip install .", "success"),
+                            ("make", "pending"), ("make", "failed"),
+                            # Resumed: the same command runs again
+                            ("make", "pending"), ("make", "success"),
+                            # Interrupted before a result was logged
+                            ("make test", "pending")]:
+        manager.log_command(run_id, command, status=status)
+    manager.connection.execute("PRAGMA user_version = 0")
+    manager.close()
+
+    manager = DatabaseManager(path)
+    commands = [(c["command"], c["status"]) for c in manager.get_commands(run_id)]
+    manager.close()
+
+    assert commands == [("pip install .", "success"), ("make", "failed"), ("make", "success"),
+                        ("make test", "pending")]
+
+
+def test_concurrent_threads_and_managers_share_database(tmp_path):
+    path = str(tmp_path / "runs.db")
+    shared = DatabaseManager(path)
+    other = DatabaseManager(path, commit_batch=1)
+    errors = []
+
+    def worker(manager, index):
+        try:
+            run_id = manager.create_run(f"https://github.com/example/project-{index}")
+            for step in range(20):
+                command_id = manager.log_command(run_id, f"step {step}", status="pending")
+                manager.update_command(command_id, exit_code=0, status="success")
+                manager.list_runs(limit=5)
+            manager.update_run(run_id, status="completed", success=True, end_time=True)
+            assert len(manager.get_commands(run_id)) == 20
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(shared if i % 2 else other, i)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert count_commands(path) == 160
+    shared.close()
+    other.close()
+
+
+def test_transaction_rolls_back_on_error(db):
+    run_id = db.create_run("https://github.com/example/project")
+
+    with pytest.raises(RuntimeError):
+        with db.transaction() as connection:
+            connection.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+            raise RuntimeError("abort")
+
+    assert db.get_run(run_id) is not None
+
+
+def test_migrations_add_lookup_indexes(db):
+    connection = db.connection
+    assert connection.execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS)
+
+    def plan(query, *params):
+        return " ".join(row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {query}", params))
+
+    assert "idx_commands_run" in plan("SELECT * FROM commands WHERE run_id = ? ORDER BY id", 1)
+    assert "idx_documentation_run" in plan("SELECT * FROM documentation WHERE run_id = ?", 1)
+    assert "idx_runs_status_start" in plan(
+        "SELECT * FROM runs WHERE status = ? ORDER BY start_time DESC LIMIT 10", "completed")
+    assert "idx_runs_start" in plan("SELECT * FROM runs ORDER BY start_time DESC LIMIT 10")
+
+
+@pytest.mark.parametrize("version, created", [(4, "commands_fts_insert"), (5, "runs_stats_insert")])
+def test_failed_migration_rolls_back_with_its_version(tmp_path, monkeypatch, version, created):
+    migration = MIGRATIONS[version - 1]
+
+    def failing(cursor):
+        migration(cursor)
+        raise sqlite3.OperationalError("simulated failure")
+
+    monkeypatch.setattr("novasystem.database.MIGRATIONS",
+                        MIGRATIONS[:version - 1] + [failing] + MIGRATIONS[version:])
+    path = str(tmp_path / "runs.db")
+    with pytest.raises(ValueError):
+        DatabaseManager(path)
+
+    connection = sqlite3.connect(path)
+    assert connection.execute("PRAGMA user_version").fetchone()[0] == version - 1
+    assert connection.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = ?",
+                              (created,)).fetchone()[0] == 0
+    connection.close()
+
+
+def test_get_documentation_returns_stored_files(db):
+    run_id = db.create_run("https://github.com/example/project")
+    db.store_documentation(run_id, "README.md", "# Project\n", metadata={"file_size": 10})
+
+    [doc] = db.get_documentation(run_id)
+    assert doc["file_path"] == "README.md"
+    assert doc["metadata"] == {"file_size": 10}
+
+
+def test_documentation_is_stored_once_across_runs(db):
+    readme = "# Project\n\n" + "Run `pip install -e .` to install.\n" * 50
+    runs = [db.create_run("https://github.com/example/project") for _ in range(3)]
+    for run_id in runs:
+        db.store_documentation(run_id, "README.md", readme)
+    db.store_documentation(runs[0], "INSTALL.md", "make\n")
+
+    blobs = db.connection.execute("SELECT size, compression, length(content) FROM doc_blobs").fetchall()
+    assert len(blobs) == 2
+    size, compression, stored = next(b for b in blobs if b[0] == len(readme))
+    assert compression == "zlib" and stored < size
+    assert [doc["content"] for doc in db.get_documentation(runs[2])] == [readme]
+
+    # Blobs are removed with the last run referencing them
+    db.delete_run(runs[0])
+    assert db.connection.execute("SELECT COUNT(*) FROM doc_blobs").fetchone()[0] == 1
+    db.delete_run(runs[1])
+    db.delete_run(runs[2])
+    assert db.connection.execute("SELECT COUNT(*) FROM doc_blobs").fetchone()[0] == 0
+
+
+def test_migration_moves_existing_documentation_to_blobs(tmp_path):
+    path = str(tmp_path / "old.db")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE runs (id INTEGER PRIMARY KEY AUTOINCREMENT, repo_url TEXT NOT NULL, "
+                       "start_time TIMESTAMP NOT NULL, end_time TIMESTAMP, status TEXT NOT NULL, "
+                       "success BOOLEAN, summary TEXT, repository_type TEXT, metadata TEXT)")
+    connection.execute("CREATE TABLE documentation (id INTEGER PRIMARY KEY AUTOINCREMENT, run_id INTEGER NOT NULL, "
+                       "file_path TEXT NOT NULL, content TEXT NOT NULL, timestamp TIMESTAMP, metadata TEXT)")
+    connection.executemany("INSERT INTO runs (id, repo_url, start_time, status) VALUES (?, ?, ?, ?)",
+                           [(1, "a", "2024-01-01", "completed"), (2, "a", "2024-01-02", "completed")])
+    connection.executemany("INSERT INTO documentation (run_id, file_path, content) VALUES (?, ?, ?)",
+                           [(1, "README.md", "same"), (2, "README.md", "same"), (2, "INSTALL.md", "other")])
+    connection.commit()
+    connection.close()
+
+    manager = DatabaseManager(path)
+    assert manager.connection.execute("SELECT COUNT(*) FROM doc_blobs").fetchone()[0] == 2
+    assert [(d["file_path"], d["content"]) for d in manager.get_documentation(2)] == [
+        ("README.md", "same"), ("INSTALL.md", "other")]
+    manager.close()
+
+
+def test_search_ranks_commands_and_documentation(db):
+    first = db.create_run("https://github.com/example/native")
+    command_id = db.log_command(first, "pip install pycairo", status="pending")
+    db.update_command(command_id, exit_code=1, status="failed",
+                      error="gcc: fatal error: cairo.h: No such file or directory")
+    db.log_command(first, "pip install requests", exit_code=0, status="success")
+    second = db.create_run("https://github.com/example/docs")
+    db.store_documentation(second, "INSTALL.md", "Install the cairo development headers before pip install.")
+
+    matches = db.search("cairo")
+    assert {(m["type"], m["run_id"]) for m in matches} == {("command", first), ("documentation", second)}
+    command = next(m for m in matches if m["type"] == "command")
+    assert command["id"] == command_id and command["status"] == "failed"
+    assert "[cairo]" in command["snippet"]
+
+    assert [m["type"] for m in db.search('"fatal error"', kind="commands")] == ["command"]
+    assert [m["file_path"] for m in db.search("headers", kind="documentation")] == ["INSTALL.md"]
+    # Invalid FTS5 syntax is searched as literal terms
+    assert [m["id"] for m in db.search("cairo.h: No")] == [command_id]
+
+    db.delete_run(first)
+    assert [m["type"] for m in db.search("cairo")] == ["documentation"]
+    with pytest.raises(ValueError):
+        db.search("cairo", kind="runs")
+
+
+def test_documentation_index_works_from_plain_sqlite(db, tmp_path):
+    run_id = db.create_run("https://github.com/example/project")
+    db.store_documentation(run_id, "README.md", "Install with cargo build --release\n" * 20)
+    db.flush()
+
+    # Other SQLite clients lack NovaSystem's SQL functions
+    connection = sqlite3.connect(str(tmp_path / "runs.db"))
+    assert connection.execute("SELECT COUNT(*) FROM sqlite_master WHERE sql LIKE '%blob_text%'").fetchone()[0] == 0
+    assert connection.execute(
+        "SELECT snippet(doc_fts, 0, '[', ']', '...', 4) FROM doc_fts WHERE doc_fts MATCH 'cargo'"
+    ).fetchone()[0].startswith("Install with [cargo]")
+    connection.execute("INSERT INTO doc_blobs (hash, size, content) VALUES ('x', 1, 'x')")
+    connection.commit()
+    connection.close()
+
+    db.delete_run(run_id)
+    assert db.search("cargo") == []
+    assert db.connection.execute("SELECT COUNT(*) FROM doc_fts").fetchone()[0] == 0
+
+
+def test_search_migration_indexes_existing_history(tmp_path):
+    path = str(tmp_path / "old.db")
+    manager = DatabaseManager(path)
+    run_id = manager.create_run("https://github.com/example/project")
+    manager.log_command(run_id, "meson setup build", status="success")
+    manager.store_documentation(run_id, "README.md", "Configure with meson setup build\n" * 20)
+    manager.connection.execute("PRAGMA user_version = 3")
+    manager.connection.execute("DROP TABLE commands_fts")
+    manager.connection.execute("DROP TABLE doc_fts")
+    manager.close()
+
+    manager = DatabaseManager(path)
+    matches = manager.search("meson")
+    manager.close()
+
+    assert sorted(m["type"] for m in matches) == ["command", "documentation"]
+
+
+def test_keyset_pagination_walks_all_runs(db):
+    with db.transaction() as connection:
+        connection.executemany(
+            "INSERT INTO runs (repo_url, start_time, status) VALUES (?, ?, ?)",
+            # Pairs of runs share a start time, so the cursor needs the ID too
+            [(f"repo-{i}", f"2024-01-{i // 2 + 1:02d}T00:00:00", "completed") for i in range(25)]
+        )
+
+    seen, after = [], None
+    while True:
+        page = db.list_runs(limit=10, after=after)
+        if not page:
+            break
+        seen.extend(run["id"] for run in page)
+        after = run_cursor(page[-1])
+
+    newest_first = [run["id"] for run in db.iter_runs(fetch_size=4)]
+    assert seen == newest_first
+    assert sorted(seen) == list(range(1, 26))
+    assert [run["id"] for run in db.iter_runs(after=run_cursor({"start_time": "2024-01-02T00:00:00", "id": 3}))] \
+        == [2, 1]
+    with pytest.raises(ValueError):
+        db.list_runs(after="not-a-cursor")
+
+
+def test_iter_commands_streams_in_id_order(db):
+    run_id = db.create_run("https://github.com/example/project")
+    other = db.create_run("https://github.com/example/other")
+    ids = [db.log_command(run_id if i % 2 else other, f"step {i}") for i in range(10)]
+
+    assert [c["id"] for c in db.iter_commands(fetch_size=3)] == ids
+    assert [c["command"] for c in db.iter_commands(run_id)] == [f"step {i}" for i in range(1, 10, 2)]
+    assert [c["id"] for c in db.iter_commands(after_id=ids[7])] == ids[8:]
+
+
+def test_stats_follow_run_and_command_updates(db):
+    python_run = db.create_run("https://github.com/example/py", repository_type="python")
+    node_run = db.create_run("https://github.com/example/js", repository_type="javascript")
+    pending = db.log_command(python_run, "pip install -r requirements.txt", status="pending")
+    db.update_command(pending, exit_code=0, execution_time=4.0, status="success")
+    db.log_command(node_run, "npm install", exit_code=1, execution_time=10.0, status="failed")
+    db.log_command(node_run, "npm test", exit_code=-1, execution_time=30.0, status="timeout")
+    db.log_command(node_run, "npm ci", status="pending")
+
+    # Unfinished runs are not counted yet
+    assert db.get_stats("repository_type") == []
+    db.update_run(python_run, status="completed", success=True, end_time=True)
+    db.update_run(node_run, status="completed", success=False, end_time=True)
+
+    by_type = {row["name"]: row for row in db.get_stats("repository_type")}
+    assert by_type["python"]["runs"] == 1 and by_type["python"]["success_rate"] == 1.0
+    assert by_type["javascript"]["failures"] == 1
+    assert db.get_stats("repository_type")[0]["name"] == "javascript"
+
+    commands = db.get_stats("command")
+    assert [row["name"] for row in commands] == ["npm test", "npm install", "pip install -r requirements.txt"]
+    assert commands[0]["timeouts"] == 1 and commands[0]["max_seconds"] == 30.0
+
+    # A resumed run that succeeds replaces its earlier outcome
+    db.update_run(node_run, status="completed", success=True, end_time=True)
+    by_type = {row["name"]: row for row in db.get_stats("repository_type")}
+    assert by_type["javascript"]["runs"] == 1 and by_type["javascript"]["failures"] == 0
+
+    day = db.get_stats("day")
+    assert len(day) == 1 and day[0]["runs"] == 2 and day[0]["successes"] == 2
+
+    # Summaries outlive retention
+    db.delete_run(node_run)
+    assert db.get_stats("repository_type", limit=1)[0]["runs"] == 1
+    with pytest.raises(ValueError):
+        db.get_stats("status")
+
+
+def test_stats_migration_summarizes_existing_history(tmp_path):
+    path = str(tmp_path / "old.db")
+    manager = DatabaseManager(path)
+    run_id = manager.create_run("https://github.com/example/project", repository_type="rust")
+    manager.log_command(run_id, "cargo build", exit_code=0, execution_time=3.0, status="success")
+    manager.log_command(run_id, "cargo build", exit_code=1, execution_time=5.0, status="failed")
+    manager.update_run(run_id, status="completed", success=False, end_time=True)
+    manager.connection.execute("PRAGMA user_version = 4")
+    manager.connection.execute("DELETE FROM stats_commands")
+    manager.close()
+
+    manager = DatabaseManager(path)
+    stats = manager.get_stats("command")
+    rust = manager.get_stats("repository_type")
+    manager.close()
+
+    assert stats == [dict(stats[0], name="cargo build", executions=2, successes=1, failures=1,
+                          avg_seconds=4.0, max_seconds=5.0)]
+    assert rust[0]["name"] == "rust" and rust[0]["runs"] == 1
+
+
+def test_retention_archives_then_deletes_in_batches(db, tmp_path):
+    with db.transaction() as connection:
+        connection.executemany(
+            "INSERT INTO runs (repo_url, start_time, status) VALUES (?, ?, ?)",
+            [(f"repo-{i}", f"2020-01-{i + 1:02d}T00:00:00", "completed") for i in range(7)]
+        )
+    db.log_command(1, "make", exit_code=0, status="success")
+    db.store_documentation(1, "README.md", "shared")
+    db.store_documentation(2, "README.md", "old only")
+    recent = db.create_run("https://github.com/example/recent")
+    db.store_documentation(recent, "README.md", "shared")
+
+    archive_path = str(tmp_path / "expired.jsonl.gz")
+    with RunArchiveWriter(archive_path) as archive:
+        assert db.delete_old_runs(30, batch_size=3, archive=archive) == 7
+
+    with gzip.open(archive_path, "rt") as f:
+        records = [json.loads(line) for line in f]
+    assert [record["run"]["repo_url"] for record in records] == [f"repo-{i}" for i in range(7)]
+    assert records[0]["commands"][0]["command"] == "make"
+    assert records[1]["documentation"][0]["content"] == "old only"
+
+    assert [run["id"] for run in db.list_runs()] == [recent]
+    assert db.get_documentation(recent)[0]["content"] == "shared"
+    assert db.connection.execute("SELECT COUNT(*) FROM doc_blobs").fetchone()[0] == 1
+    # Archives are never overwritten
+    with pytest.raises(ValueError):
+        RunArchiveWriter(archive_path)
+
+
+def _populate(db, count):
+    for i in range(count):
+        run_id = db.create_run(f"https://github.com/example/project-{i}", "python", {"index": i})
+        command_id = db.log_command(run_id, f"pip install -r requirements-{i}.txt", status="pending")
+        db.update_command(command_id, exit_code=0, execution_time=2.0, status="success")
+        db.store_documentation(run_id, "README.md", "pip install project\n" * 50)
+        db.update_run(run_id, status="completed", success=True, end_time=True)
+
+
+def test_export_import_round_trip(db, tmp_path):
+    _populate(db, 5)
+    archive_path = str(tmp_path / "runs.jsonl.gz")
+    with RunArchiveWriter(archive_path) as archive:
+        for record in db.iter_run_records(batch_size=2):
+            archive.write(record)
+    assert archive.count == 5
+
+    target = DatabaseManager(str(tmp_path / "target.db"))
+    existing = target.create_run("https://github.com/example/existing")
+    with RunArchiveReader(archive_path) as archive:
+        assert archive.format == "jsonl.gz"
+        counts = target.import_runs(archive, batch_size=2)
+    assert counts == {"runs": 5, "commands": 5, "documentation": 5, "skipped": 0}
+
+    # Imported runs get new IDs, with their commands and documentation attached
+    imported = [run for run in target.list_runs(10) if run["id"] != existing]
+    assert sorted(run["id"] for run in imported) == [existing + i for i in range(1, 6)]
+    run = next(run for run in imported if run["repo_url"].endswith("project-3"))
+    assert run["metadata"] == {"index": 3} and run["success"]
+    assert target.get_commands(run["id"])[0]["command"] == "pip install -r requirements-3.txt"
+    assert target.get_documentation(run["id"])[0]["content"] == "pip install project\n" * 50
+    assert target.connection.execute("SELECT COUNT(*) FROM doc_blobs").fetchone()[0] == 1
+    # Summary tables and search cover imported history
+    assert target.get_stats()[0] == dict(target.get_stats()[0], name="python", runs=5, successes=5)
+    assert target.search("requirements")
+    assert len(target.search("project", kind="documentation")) == 5
+    target.close()
+
+
+def test_import_skips_runs_already_present(db, tmp_path):
+    _populate(db, 3)
+    stream = io.BytesIO()
+    with RunArchiveWriter(fileobj=stream) as archive:
+        for record in db.iter_run_records(since="2000-01-01"):
+            archive.write(record)
+    assert not stream.closed
+
+    target = DatabaseManager(str(tmp_path / "target.db"))
+    for expected in ({"runs": 3, "commands": 3, "documentation": 3, "skipped": 0},
+                     {"runs": 0, "commands": 0, "documentation": 0, "skipped": 3}):
+        stream.seek(0)
+        with RunArchiveReader(fileobj=stream) as archive:
+            assert target.import_runs(archive) == expected
+    assert len(target.list_runs(10)) == 3
+    assert list(db.iter_run_records(since="2999-01-01")) == []
+
+    stream.seek(0)
+    with RunArchiveReader(fileobj=stream) as archive:
+        assert target.import_runs(archive, skip_existing=False)["runs"] == 3
+    with pytest.raises(ValueError):
+        target.import_runs([{"commands": []}])
+    target.close()
+
+
+def test_archived_runs_are_counted_once_after_import(db, tmp_path):
+    _populate(db, 3)
+    with db.transaction() as connection:
+        connection.execute("UPDATE runs SET start_time = '2020-01-01T00:00:00' WHERE id < 3")
+    before = {group: db.get_stats(group) for group in ("repository_type", "command", "day")}
+    assert before["repository_type"][0]["runs"] == 3
+
+    archive_path = str(tmp_path / "expired.jsonl.gz")
+    with RunArchiveWriter(archive_path) as archive:
+        assert db.delete_old_runs(30, archive=archive) == 2
+    assert db.get_stats()[0]["runs"] == 1
+    assert len(db.get_stats("command")) == 1
+
+    with RunArchiveReader(archive_path) as archive:
+        assert db.import_runs(archive)["runs"] == 2
+    assert {group: db.get_stats(group) for group in before} == before
+
+
+def test_incremental_vacuum_releases_deleted_space(tmp_path):
+    db = DatabaseManager(str(tmp_path / "runs.db"))
+    run_id = db.create_run("https://github.com/example/project")
+    with db.transaction() as connection:
+        connection.executemany("INSERT INTO commands (run_id, command, output) VALUES (?, ?, ?)",
+                               [(run_id, f"step {i}", os.urandom(2000).hex()) for i in range(500)])
+    db.delete_run(run_id)
+
+    page_size = db.connection.execute("PRAGMA page_size").fetchone()[0]
+    assert db.incremental_vacuum(max_pages=10) == 10 * page_size
+    assert db.incremental_vacuum() > 1024 * 1024
+    assert db.connection.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    db.close()
+
+    # Databases created without incremental vacuum are converted by compacting
+    legacy = sqlite3.connect(str(tmp_path / "legacy.db"))
+    legacy.execute("CREATE TABLE legacy (id INTEGER PRIMARY KEY)")
+    legacy.close()
+    db = DatabaseManager(str(tmp_path / "legacy.db"))
+    assert db.incremental_vacuum() == 0
+    db.compact()
+    assert db.connection.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    db.close()
@@ -0,0 +1,155 @@
+"""
+Tests for NovaSystem execution backends
+---------------------------------------
+"""
+
+import os
+import sys
+
+import pytest
+
+from novasystem.executor import Executor, LocalExecutor, create_executor
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="local backend tests use POSIX shell")
+
+
+@pytest.fixture
+def executor(tmp_path):
+    lines = []
+    executor = LocalExecutor(timeout=10, work_dir=str(tmp_path),
+                             output_callback=lambda stream, line: lines.append((stream, line)))
+    executor.lines = lines
+    executor.start_container()
+    yield executor
+    if executor.sandbox_dir:
+        executor.stop_container()
+
+
+def test_local_executor_implements_protocol():
+    assert isinstance(LocalExecutor(), Executor)
+    assert isinstance(create_executor("local", image_name="ignored"), LocalExecutor)
+    with pytest.raises(ValueError):
+        create_executor("vm")
+
+
+def test_execute_command_streams_output(executor):
+    result = executor.execute_command("echo hello; echo oops >&2; exit 3")
+
+    assert result.exit_code == 3
+    assert result.status == "completed"
+    assert not result.successful
+    assert result.output == "hello\n"
+    assert result.error == "oops\n"
+    assert ("stdout", "hello\n") in executor.lines
+    assert ("stderr", "oops\n") in executor.lines
+
+
+def test_commands_run_in_writable_repo_copy(tmp_path, executor):
+    executor.stop_container()
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "README.md").write_text("# Demo\n")
+
+    executor.start_container(str(repo))
+    result = executor.execute_command("cat repo/README.md && touch repo/built")
+
+    assert result.successful
+    assert result.output == "# Demo\n"
+    assert not (repo / "built").exists()
+
+
+def test_timeout_kills_process_group(executor):
+    result = executor.execute_command("sleep 5 & sleep 5", timeout=1)
+
+    assert result.status == "timeout"
+    assert result.execution_time < 4
+
+
+def test_background_processes_do_not_outlive_command(executor):
+    result = executor.execute_command("sleep 30 & echo hi")
+
+    assert result.status == "completed"
+    assert result.exit_code == 0
+    assert result.output == "hi\n"
+    assert result.execution_time < 5
+
+
+def test_file_size_limit(executor):
+    executor.file_size_limit = 4096
+    result = executor.execute_command("head -c 100000 /dev/zero > big.bin")
+
+    assert not result.successful
+    assert os.path.getsize(os.path.join(executor.sandbox_dir, "big.bin")) <= 4096
+
+
+def test_limits_apply_to_child_processes_without_capping_address_space(executor):
+    executor.cpu_time_limit = 7
+    result = executor.execute_command("sh -c 'ulimit -t; ulimit -v'")
+
+    assert result.output.split() == ["7", "unlimited"]
+    assert executor.memory_limit is None
+
+    executor.memory_limit = 64 * 1024 ** 2
+    result = executor.execute_command("ulimit -v")
+    assert result.output.strip() == str(64 * 1024)
+
+
+def test_dangerous_command_rejected(executor):
+    result = executor.execute_command("rm -rf /")
+
+    assert result.status == "error"
+
+
+def test_run_commands_stops_on_failure(tmp_path):
+    executor = LocalExecutor(timeout=10, work_dir=str(tmp_path))
+    results = executor.run_commands(None, ["true", "false", "echo never"])
+
+    assert [r.exit_code for r in results] == [0, 1]
+    assert executor.sandbox_dir is None
+    assert os.listdir(tmp_path) == []
+
+
+class FakeStatsContainer:
+    """Container double returning canned stats samples."""
+
+    def __init__(self, snapshots, stream):
+        self.snapshots = list(snapshots)
+        self.stream = stream
+
+    def stats(self, stream=False, decode=False, one_shot=False):
+        if stream:
+            return iter(self.stream)
+        return self.snapshots.pop(0)
+
+
+def _stats(cpu_ns, usage, inactive, read, write, rx, tx):
+    return {
+        "cpu_stats": {"cpu_usage": {"total_usage": cpu_ns}},
+        "memory_stats": {"usage": usage, "stats": {"inactive_file": inactive}},
+        "blkio_stats": {"io_service_bytes_recursive": [{"op": "read", "value": read},
+                                                       {"op": "write", "value": write}]},
+        "networks": {"eth0": {"rx_bytes": rx, "tx_bytes": tx}},
+    }
+
+
+def test_container_stats_sampler_computes_deltas():
+    from novasystem.docker import ContainerStatsSampler
+
+    container = FakeStatsContainer(
+        snapshots=[_stats(1_000_000_000, 100, 0, 10, 20, 5, 5),
+                   _stats(3_500_000_000, 150, 50, 110, 220, 1005, 55)],
+        stream=[_stats(2_000_000_000, 900, 100, 50, 50, 10, 10)],
+    )
+    sampler = ContainerStatsSampler(container)
+    sampler.start()
+    sampler._thread.join()
+    usage = sampler.stop()
+
+    assert usage == {
+        "peak_memory_bytes": 800,
+        "cpu_seconds": 2.5,
+        "block_read_bytes": 100,
+        "block_write_bytes": 200,
+        "net_rx_bytes": 1000,
+        "net_tx_bytes": 50,
+    }
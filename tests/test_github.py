@@ -0,0 +1,173 @@
+"""
+Tests for NovaSystem GitHub API client
+--------------------------------------
+"""
+
+import io
+import json
+import tarfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from novasystem.github import GitHubClient, create_session
+from novasystem.repository import RepositoryHandler
+
+REPO = {"full_name": "owner/project", "default_branch": "main", "stargazers_count": 3}
+
+
+def _tarball():
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        content = b"# Private project\n"
+        info = tarfile.TarInfo("owner-project-abc123/README.md")
+        info.size = len(content)
+        tar.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves /repos/owner/project with an ETag; fails the first N requests if asked to."""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        if server.failures > 0:
+            server.failures -= 1
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/repos/owner/project/tarball/main" and self.headers.get("Authorization"):
+            # Private repositories only serve authenticated requests
+            body = _tarball()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.path != "/repos/owner/project":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps(REPO).encode()
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.requests = []
+    server.failures = 0
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(server, tmp_path, **kwargs):
+    return GitHubClient(api_base=f"http://127.0.0.1:{server.server_port}", token="test-token",
+                        cache_dir=str(tmp_path / "github"),
+                        session=create_session(backoff_factor=0), **kwargs)
+
+
+def test_cached_within_ttl(stub_server, tmp_path):
+    client = make_client(stub_server, tmp_path)
+
+    assert client.get_repository("owner", "project") == REPO
+    assert client.get_repository("owner", "project") == REPO
+
+    assert len(stub_server.requests) == 1
+    assert stub_server.requests[0]["Authorization"] == "Bearer test-token"
+    assert client.stats == {"cached": 1, "revalidated": 0, "fetched": 1, "stale": 0}
+
+
+def test_revalidates_with_etag_after_ttl(stub_server, tmp_path):
+    make_client(stub_server, tmp_path).get_repository("owner", "project")
+
+    # A new client reuses the on-disk cache
+    client = make_client(stub_server, tmp_path, ttl=0)
+    assert client.get_repository("owner", "project") == REPO
+
+    assert stub_server.requests[-1]["If-None-Match"] == '"v1"'
+    assert client.stats["revalidated"] == 1
+
+
+def test_cache_entries_are_not_shared_between_tokens(stub_server, tmp_path):
+    make_client(stub_server, tmp_path).get_repository("owner", "project")
+    for token in ("other-token", None):
+        client = GitHubClient(api_base=f"http://127.0.0.1:{stub_server.server_port}", token=token,
+                              cache_dir=str(tmp_path / "github"), session=create_session(backoff_factor=0))
+        client.token = token  # None would otherwise fall back to GITHUB_TOKEN
+        assert client.get_repository("owner", "project") == REPO
+        assert client.stats["fetched"] == 1
+
+    assert len(stub_server.requests) == 3
+    assert "Authorization" not in stub_server.requests[-1]
+
+
+def test_retries_transient_errors(stub_server, tmp_path):
+    stub_server.failures = 2
+    client = make_client(stub_server, tmp_path)
+
+    assert client.get_repository("owner", "project") == REPO
+    assert len(stub_server.requests) == 3
+
+
+def test_expired_entry_used_when_github_is_unavailable(stub_server, tmp_path):
+    make_client(stub_server, tmp_path).get_repository("owner", "project")
+
+    stub_server.failures = 10
+    client = make_client(stub_server, tmp_path, ttl=0)
+    assert client.get_repository("owner", "project") == REPO
+    assert client.stats["stale"] == 1
+
+    url = f"http://127.0.0.1:{stub_server.server_port}"
+    stub_server.shutdown()
+    stub_server.server_close()
+    assert client.get_repository("owner", "project") == REPO
+    assert client.stats["stale"] == 2
+
+    # Without a cached entry the failure is raised
+    with pytest.raises(requests.RequestException):
+        GitHubClient(api_base=url, token="other-token", cache_dir=str(tmp_path / "github"),
+                     session=create_session(retries=0)).get_repository("owner", "project")
+
+
+def test_validate_github_repository_uses_client(stub_server, tmp_path):
+    handler = RepositoryHandler(work_dir=str(tmp_path / "work"),
+                                github_client=make_client(stub_server, tmp_path))
+
+    info = handler.validate_github_repository("https://github.com/owner/project.git")
+    assert info["full_name"] == "owner/project"
+    assert info["stars"] == 3
+
+    with pytest.raises(ValueError):
+        handler.validate_github_repository("https://github.com/owner/missing")
+
+
+def test_snapshot_download_is_authenticated(stub_server, tmp_path):
+    client = make_client(stub_server, tmp_path)
+    handler = RepositoryHandler(work_dir=str(tmp_path / "work"), github_client=client)
+
+    files = dict(handler.iter_snapshot_files("https://github.com/owner/project", "main"))
+    assert files == {"README.md": b"# Private project\n"}
+    assert stub_server.requests[-1]["Authorization"] == "Bearer test-token"
+    assert "Authorization" not in client.request_headers("https://example.com/project.tar.gz")
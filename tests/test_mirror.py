@@ -0,0 +1,91 @@
+"""
+Tests for NovaSystem repository mirror cache
+--------------------------------------------
+"""
+
+import os
+import subprocess
+
+import pytest
+
+from novasystem.mirror import MirrorCache, mirror_key
+from novasystem.repository import RepositoryHandler
+
+GIT_ENV = {
+    **os.environ,
+    "GIT_AUTHOR_NAME": "Test", "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test", "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+
+def git(*args, cwd=None):
+    subprocess.run(["git", *args], cwd=cwd, env=GIT_ENV, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def commit_file(source, name, content):
+    (source / name).write_text(content)
+    git("add", name, cwd=source)
+    git("commit", "-q", "-m", f"update {name}", cwd=source)
+
+
+@pytest.fixture
+def remote(tmp_path):
+    """A non-bare repository served over file:// (so new commits can be pushed into it)."""
+    source = tmp_path / "remote" / "project"
+    source.mkdir(parents=True)
+    git("init", "-q", str(source))
+    commit_file(source, "README.md", "# Project\n")
+    return source
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return MirrorCache(cache_dir=str(tmp_path / "mirrors"))
+
+
+def test_mirror_key_ignores_git_suffix():
+    assert mirror_key("https://github.com/o/r.git") == mirror_key("https://github.com/o/r/")
+    assert mirror_key("https://github.com/o/r") != mirror_key("https://github.com/x/r")
+
+
+def test_checkout_creates_then_fetches_incrementally(cache, remote, tmp_path):
+    url = f"file://{remote}"
+    first = cache.checkout(url, str(tmp_path / "run1"))
+    assert first["created"]
+    assert (tmp_path / "run1" / "README.md").read_text() == "# Project\n"
+
+    commit_file(remote, "INSTALL.md", "pip install .\n")
+    second = cache.checkout(url, str(tmp_path / "run2"))
+
+    assert not second["created"]
+    assert second["mirror"] == first["mirror"]
+    assert (tmp_path / "run2" / "INSTALL.md").exists()
+    # Worktrees are independent checkouts
+    assert not (tmp_path / "run1" / "INSTALL.md").exists()
+
+    cache.remove_worktree(url, str(tmp_path / "run1"))
+    assert not (tmp_path / "run1").exists()
+
+
+def test_evict_skips_mirrors_with_worktrees(cache, remote, tmp_path):
+    url = f"file://{remote}"
+    cache.checkout(url, str(tmp_path / "run"))
+
+    assert cache.evict(max_bytes=0) == []
+
+    cache.remove_worktree(url, str(tmp_path / "run"))
+    assert cache.evict(max_bytes=0) == [cache.mirror_path(url)]
+    assert cache.stats() == []
+
+
+def test_repository_handler_uses_mirror(cache, remote, tmp_path):
+    handler = RepositoryHandler(work_dir=str(tmp_path / "work"), mirror_cache=cache)
+    repo_dir = handler.clone_repository(f"file://{remote}", sparse=True)
+
+    assert os.path.isfile(os.path.join(repo_dir, "README.md"))
+    assert handler.get_clone_stats(repo_dir)["mirror"] == cache.mirror_path(f"file://{remote}")
+
+    handler.cleanup(repo_dir)
+    assert not os.path.exists(repo_dir)
+    assert cache.evict(max_bytes=0) == [cache.mirror_path(f"file://{remote}")]
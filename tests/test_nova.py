@@ -0,0 +1,91 @@
+"""
+Tests for the NovaSystem orchestrator
+-------------------------------------
+"""
+
+import pytest
+
+from novasystem.executor import CommandResult
+from novasystem.nova import Nova
+
+
+class RecordingExecutor:
+    """Executor that succeeds at every command and records what ran."""
+
+    def __init__(self):
+        self.executed = []
+
+    def check_image_exists(self):
+        return True
+
+    def create_image(self):
+        return True
+
+    def prepare_workspace(self, repo_dir):
+        pass
+
+    def start_container(self, repo_dir=None, image=None):
+        return "recording"
+
+    def execute_command(self, command, timeout=None):
+        self.executed.append(command)
+        return CommandResult(command, 0, "", "", 0.1)
+
+    def stop_container(self):
+        return True
+
+    def checkpoint(self, tag, labels=None):
+        return None
+
+    def remove_checkpoint(self, image):
+        return False
+
+    def run_commands(self, repo_dir, commands):
+        return []
+
+
+@pytest.fixture
+def nova(tmp_path):
+    instance = Nova(db_path=str(tmp_path / "test.db"), executor=RecordingExecutor())
+    yield instance
+    instance.close()
+
+
+def test_process_repository_runs_and_stores_plan(nova, tmp_path):
+    repo = tmp_path / "repo"
+    (repo / "docs").mkdir(parents=True)
+    (repo / "README.md").write_text("# Project\n")
+    (repo / "docs" / "INSTALL.md").write_text("# Installation\n\nRun `pip install -e .` first.\n")
+
+    result = nova.process_repository(str(repo))
+
+    assert result["success"], result["message"]
+    assert nova.executor.executed == ["pip install -e ."]
+    plan = nova.db_manager.get_run(result["run_id"])["metadata"]["plan"]
+    assert [(entry["text"], entry["stage"]) for entry in plan] == [("pip install -e .", "install_deps")]
+
+
+def test_cleanup_rejects_parquet_archives(nova, tmp_path):
+    run_id = nova.db_manager.create_run("https://github.com/example/project")
+    with nova.db_manager.transaction() as connection:
+        connection.execute("UPDATE runs SET start_time = '2020-01-01T00:00:00' WHERE id = ?", (run_id,))
+
+    archive_path = tmp_path / "expired.parquet"
+    with pytest.raises(ValueError):
+        nova.cleanup_old_runs(30, archive_path=str(archive_path))
+
+    assert not archive_path.exists()
+    assert nova.db_manager.get_run(run_id) is not None
+
+
+def test_plan_repository_does_not_execute(nova, tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "INSTALL.md").write_text("# Installation\n\nRun `pip install -e .` first.\n")
+
+    result = nova.plan_repository(str(repo))
+
+    assert result["success"], result["message"]
+    assert [entry["text"] for entry in result["plan"]] == ["pip install -e ."]
+    assert nova.executor.executed == []
+    assert nova.list_runs() == []
@@ -0,0 +1,85 @@
+"""
+Tests for NovaSystem workspace reclamation
+-----------------------------------------
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from novasystem.reclaimer import OWNER_FILE, WorkspaceReclaimer
+from novasystem.repository import RepositoryHandler
+
+
+@pytest.fixture
+def reclaimer(tmp_path):
+    return WorkspaceReclaimer(root=str(tmp_path / "root"), max_bytes=10 ** 9)
+
+
+def fill(path, size):
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "data.bin").write_bytes(b"\0" * size)
+
+
+def test_reclaim_moves_aside_then_deletes(reclaimer, tmp_path):
+    workspace = tmp_path / "root" / "workspace"
+    fill(workspace / "node_modules" / "pkg", 1024)
+
+    assert reclaimer.reclaim(str(workspace))
+    # The path is free immediately, before deletion finishes
+    assert not workspace.exists()
+
+    assert reclaimer.wait(timeout=10)
+    assert os.listdir(tmp_path / "root") == []
+    assert reclaimer.stats["reclaimed"] == 1
+    assert not reclaimer.reclaim(str(workspace))
+
+
+def test_recover_orphans_skips_live_owners(reclaimer, tmp_path):
+    live = reclaimer.create_work_dir()
+
+    # A work directory whose owner has exited, and an interrupted deletion
+    script = ("import sys; from novasystem.reclaimer import WorkspaceReclaimer; "
+              "print(WorkspaceReclaimer(root=sys.argv[1]).create_work_dir())")
+    orphan = subprocess.run([sys.executable, "-c", script, reclaimer.root], check=True,
+                            stdout=subprocess.PIPE, text=True).stdout.strip()
+    interrupted = tmp_path / "root" / ".reclaim-novasystem-old-1234"
+    fill(interrupted, 16)
+    # Directories not created by a reclaimer are left alone
+    unrelated = tmp_path / "root" / "novasystem-manual"
+    unrelated.mkdir()
+
+    recovered = reclaimer.recover_orphans()
+    assert reclaimer.wait(timeout=10)
+
+    assert sorted(recovered) == sorted([orphan, str(interrupted)])
+    assert os.path.isfile(os.path.join(live, OWNER_FILE))
+    assert not os.path.exists(orphan) and not interrupted.exists()
+    assert unrelated.exists()
+
+
+def test_enforce_quota_evicts_inactive_oldest_first(reclaimer):
+    work_dir = reclaimer.create_work_dir()
+    for i, name in enumerate(["old", "newer", "active"]):
+        fill(Path(work_dir) / name, 1000)
+        os.utime(os.path.join(work_dir, name), (1000 + i, 1000 + i))
+    reclaimer.activate(os.path.join(work_dir, "active"))
+
+    assert reclaimer.enforce_quota(max_bytes=2500) == [os.path.join(work_dir, "old")]
+    # Active workspaces are kept even if still over quota
+    assert reclaimer.enforce_quota(max_bytes=0) == [os.path.join(work_dir, "newer")]
+    assert reclaimer.wait(timeout=10)
+    assert sorted(os.listdir(work_dir)) == sorted([OWNER_FILE, "active"])
+
+
+def test_handler_cleanup_reclaims_owned_work_dir(reclaimer):
+    handler = RepositoryHandler(reclaimer=reclaimer)
+    assert os.path.dirname(handler.work_dir) == reclaimer.root
+
+    handler.cleanup()
+    assert not os.path.exists(handler.work_dir)
+    assert reclaimer.wait(timeout=10)
+    assert os.listdir(reclaimer.root) == []
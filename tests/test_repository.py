@@ -0,0 +1,182 @@
+"""
+Tests for NovaSystem repository cloning
+--------------------------------------
+"""
+
+import io
+import os
+import subprocess
+import tarfile
+
+import pytest
+
+from novasystem.repository import RepositoryHandler
+
+GIT_ENV = {
+    **os.environ,
+    "GIT_AUTHOR_NAME": "Test", "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test", "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+
+def git(*args, cwd=None):
+    subprocess.run(["git", *args], cwd=cwd, env=GIT_ENV, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+@pytest.fixture
+def bare_repo(tmp_path):
+    """A bare repository with docs, a manifest, history and a large source file."""
+    source = tmp_path / "source"
+    (source / "docs").mkdir(parents=True)
+    (source / "src").mkdir()
+    (source / "README.md").write_text("# Project\n\n```bash\npip install -e .\n```\n")
+    (source / "docs" / "INSTALL.md").write_text("Run `make`.\n")
+    (source / "setup.py").write_text("from setuptools import setup\nsetup()\n")
+    (source / "src" / "data.bin").write_bytes(os.urandom(256 * 1024))
+    git("init", "-q", str(source))
+    git("add", "-A", cwd=source)
+    git("commit", "-q", "-m", "initial", cwd=source)
+    (source / "src" / "data.bin").write_bytes(os.urandom(256 * 1024))
+    git("commit", "-q", "-am", "second", cwd=source)
+
+    bare = tmp_path / "owner" / "project.git"
+    git("clone", "-q", "--bare", str(source), str(bare))
+    git("config", "uploadpack.allowFilter", "true", cwd=bare)
+    return f"file://{bare}"
+
+
+@pytest.fixture
+def handler(tmp_path):
+    return RepositoryHandler(work_dir=str(tmp_path / "work"))
+
+
+def test_sparse_clone_fetches_only_docs_and_manifests(handler, bare_repo):
+    repo_dir = handler.clone_repository(bare_repo, sparse=True)
+
+    assert os.path.basename(repo_dir) == "owner_project"
+    assert os.path.isfile(os.path.join(repo_dir, "README.md"))
+    assert os.path.isfile(os.path.join(repo_dir, "docs", "INSTALL.md"))
+    assert os.path.isfile(os.path.join(repo_dir, "setup.py"))
+    assert not os.path.exists(os.path.join(repo_dir, "src", "data.bin"))
+
+    stats = handler.get_clone_stats(repo_dir)
+    assert stats["sparse"] and not stats["materialized"]
+    assert stats["files_deferred"] == 1
+    # Neither version of the large file was downloaded
+    assert stats["transfer_bytes"] < 256 * 1024
+
+
+def test_materialize_checks_out_full_tree(handler, bare_repo):
+    repo_dir = handler.clone_repository(bare_repo, sparse=True)
+    stats = handler.materialize(repo_dir)
+
+    assert os.path.getsize(os.path.join(repo_dir, "src", "data.bin")) == 256 * 1024
+    assert stats["materialized"]
+    assert stats["materialize_bytes"] >= 256 * 1024
+    assert stats["materialize_seconds"] >= 0
+    # Materializing again is a no-op
+    assert handler.materialize(repo_dir) == stats
+
+
+def test_full_clone_is_not_sparse(handler, bare_repo):
+    repo_dir = handler.clone_repository(bare_repo)
+
+    assert os.path.isfile(os.path.join(repo_dir, "src", "data.bin"))
+    stats = handler.get_clone_stats(repo_dir)
+    assert stats["materialized"] and stats["files_deferred"] == 0
+
+
+@pytest.fixture
+def doc_tree(tmp_path):
+    """A working tree with documentation at several depths, plus noise."""
+    root = tmp_path / "tree"
+    files = {
+        "README.md": "# Project\n\nSee docs.\n",
+        "CHANGELOG.md": "# Changes\n",
+        "requirements.txt": "requests\n",
+        "docs/INSTALL.md": "# Installation\n\n```bash\npip install -e .\n```\n",
+        "docs/api.md": "# API reference\n",
+        "docs/guide.rst": "Building from source\n====================\n\nRun make.\n",
+        "node_modules/pkg/README.md": "# Vendored\n",
+        "generated/README.md": "# Ignored\n",
+        "a/b/c/d/e/README.md": "# Too deep\n",
+    }
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    (root / ".gitignore").write_text("generated/\n")
+    return root
+
+
+def test_find_documentation_files_ranks_and_filters(handler, doc_tree):
+    found = [os.path.relpath(p, doc_tree) for p in handler.find_documentation_files(str(doc_tree))]
+
+    assert found[0] == os.path.join("docs", "INSTALL.md")
+    assert set(found) == {"README.md", os.path.join("docs", "INSTALL.md"),
+                          os.path.join("docs", "api.md"), os.path.join("docs", "guide.rst")}
+    # Headings mentioning installation topics outrank other docs at the same depth
+    assert found.index(os.path.join("docs", "guide.rst")) < found.index(os.path.join("docs", "api.md"))
+
+
+def test_find_documentation_files_respects_caps(handler, doc_tree):
+    assert len(handler.find_documentation_files(str(doc_tree), max_files=2)) == 2
+
+    install_size = os.path.getsize(doc_tree / "docs" / "INSTALL.md")
+    found = handler.find_documentation_files(str(doc_tree), max_total_bytes=install_size)
+    assert [os.path.relpath(p, doc_tree) for p in found] == [os.path.join("docs", "INSTALL.md")]
+
+
+def test_read_documentation_content_tolerates_bad_encoding(handler, tmp_path):
+    path = tmp_path / "README.md"
+    path.write_bytes(b"pip install caf\xe9\n")
+
+    assert handler.read_documentation_content(str(path)).startswith("pip install caf")
+    assert handler.read_documentation_content(str(path), max_bytes=3) == "pip"
+
+
+@pytest.fixture
+def tarball(tmp_path):
+    """A GitHub-style tarball: one wrapper directory, docs, a large binary and an unsafe member."""
+    def add(tar, name, content):
+        info = tarfile.TarInfo(name)
+        info.size = len(content)
+        tar.addfile(info, io.BytesIO(content))
+
+    path = tmp_path / "project.tar.gz"
+    with tarfile.open(path, "w:gz") as tar:
+        wrapper = tarfile.TarInfo("owner-project-abc123")
+        wrapper.type = tarfile.DIRTYPE
+        tar.addfile(wrapper)
+        add(tar, "owner-project-abc123/README.md", b"# Project\n\nRun `pip install -e .` first.\n")
+        add(tar, "owner-project-abc123/.gitignore", b"build/\n")
+        add(tar, "owner-project-abc123/setup.py", b"from setuptools import setup\nsetup()\n")
+        add(tar, "owner-project-abc123/src/data.bin", os.urandom(64 * 1024))
+        add(tar, "owner-project-abc123/../evil.md", b"# Escape\n")
+    return str(path)
+
+
+def test_fetch_snapshot_extracts_only_docs_and_manifests(handler, tarball):
+    repo_dir = handler.fetch_snapshot(tarball, strip_components=1)
+
+    extracted = sorted(os.path.relpath(os.path.join(root, name), repo_dir)
+                       for root, _, files in os.walk(repo_dir) for name in files)
+    assert extracted == [".gitignore", "README.md", "setup.py"]
+    assert os.path.commonpath([repo_dir, handler.work_dir]) == handler.work_dir
+
+    stats = handler.get_clone_stats(repo_dir)
+    assert stats["snapshot"]
+    assert stats["members"] == 6 and stats["extracted"] == 3
+    assert stats["bytes_streamed"] > 64 * 1024 > stats["bytes_extracted"]
+
+    handler.cleanup(repo_dir)
+    assert not os.path.exists(repo_dir)
+
+
+def test_iter_snapshot_files_rejects_corrupt_archives(handler, tmp_path):
+    path = tmp_path / "broken.tar.gz"
+    path.write_bytes(b"not a tarball")
+
+    with pytest.raises(ValueError):
+        list(handler.iter_snapshot_files(str(path)))
@@ -0,0 +1,42 @@
+"""
+Tests for NovaSystem lazy imports and component construction
+------------------------------------------------------------
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import novasystem
+from novasystem.nova import Nova
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_database_commands_do_not_load_heavy_dependencies(tmp_path):
+    script = (
+        "import sys\n"
+        "from novasystem.cli import main\n"
+        "assert main(['list-runs']) == 0\n"
+        "assert main(['stats']) == 0\n"
+        "print(sorted(m for m in ('git', 'docker', 'requests', 'novasystem.archive') if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=tmp_path, capture_output=True, text=True,
+                            env={"PYTHONPATH": str(ROOT), "NOVASYSTEM_DB_PATH": str(tmp_path / "runs.db")})
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines()[-1] == "[]"
+
+
+def test_components_are_built_on_first_use(tmp_path):
+    nova = Nova(db_path=str(tmp_path / "test.db"), backend="local")
+    assert nova._executor is None and nova._repo_handler is None
+    assert nova.list_runs() == []
+
+    assert nova.executor is nova.docker_executor
+    assert nova.timeout_policy.default_timeout == nova.executor.timeout
+    nova.close()
+
+    # Closing an instance whose construction failed part way does not raise
+    Nova.__new__(Nova).close()
+    assert novasystem.Nova is Nova
+    assert "DatabaseManager" in dir(novasystem)
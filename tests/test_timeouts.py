@@ -0,0 +1,61 @@
+"""
+Tests for NovaSystem adaptive command timeouts
+----------------------------------------------
+"""
+
+import pytest
+
+from novasystem.timeouts import TimeoutPolicy, normalize_command, percentile
+
+
+class FakeHistory:
+    """DatabaseManager double serving canned execution times."""
+
+    def __init__(self, samples):
+        self.samples = samples
+        self.queries = []
+
+    def get_execution_times(self, normalized_command, limit=200):
+        self.queries.append(normalized_command)
+        return self.samples[:limit]
+
+
+@pytest.mark.parametrize("command, expected", [
+    ("pip install requests==2.31.0", "pip install requests==<version>"),
+    ("npm install lodash@4.17.21", "npm install lodash@<version>"),
+    ("git clone https://github.com/a/b.git", "git clone <url>"),
+    ("cd /tmp/novasystem-x/repo  &&  make", "cd <path> && make"),
+    ("git checkout 3f2a9c1d4e5b6a7c", "git checkout <hash>"),
+    ("pip install -r requirements.txt", "pip install -r requirements.txt"),
+])
+def test_normalize_command(command, expected):
+    assert normalize_command(command) == expected
+
+
+def test_percentile_interpolates():
+    assert percentile([1, 2, 3, 4, 5], 0.5) == 3
+    assert percentile([10, 20], 0.99) == pytest.approx(19.9)
+
+
+def test_cold_start_uses_default():
+    policy = TimeoutPolicy(FakeHistory([1.0, 2.0]), default_timeout=300, min_samples=5)
+
+    assert policy.timeout_for("make") == (300, "default")
+
+
+def test_history_scaled_and_clamped():
+    policy = TimeoutPolicy(FakeHistory([10.0] * 9 + [20.0]), quantile=0.99,
+                           safety_factor=3.0, floor=30, ceiling=3600, min_samples=5)
+    timeout, source = policy.timeout_for("pip install requests==2.0")
+
+    assert source == "history"
+    assert timeout == 58  # ceil(19.1 * 3)
+    assert policy.db_manager.queries == ["pip install requests==<version>"]
+
+    assert TimeoutPolicy(FakeHistory([0.1] * 10)).timeout_for("true") == (30, "history")
+    assert TimeoutPolicy(FakeHistory([5000.0] * 10)).timeout_for("make") == (3600, "history")
+
+
+def test_floor_above_ceiling_rejected():
+    with pytest.raises(ValueError):
+        TimeoutPolicy(FakeHistory([]), floor=100, ceiling=10)
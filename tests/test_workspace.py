@@ -0,0 +1,88 @@
+"""
+Tests for NovaSystem workspace archives and ignore rules
+-------------------------------------------------------
+"""
+
+import os
+import subprocess
+import tarfile
+
+import pytest
+
+from novasystem.ignore import IgnoreRules
+from novasystem.workspace import WorkspaceArchiveCache
+
+
+def _write(root, rel_path, content="x"):
+    path = root / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "repo"
+    _write(root, ".gitignore", "*.log\n/build/\n!keep.log\ndocs/**/draft.md\n")
+    _write(root, "README.md")
+    _write(root, "app.log")
+    _write(root, "keep.log")
+    _write(root, "build/out.o")
+    _write(root, "src/build/module.py")
+    _write(root, "docs/a/b/draft.md")
+    _write(root, "docs/guide.md")
+    _write(root, "src/.gitignore", "generated.py\n")
+    _write(root, "src/generated.py")
+    _write(root, "node_modules/pkg/README.md")
+    return root
+
+
+def test_ignore_rules_follow_gitignore_semantics(tree):
+    rules = IgnoreRules(str(tree), vendor_dirs=[".git"])
+    files = sorted(rel for rel, _, _ in rules.walk())
+
+    assert files == [".gitignore", "README.md", "docs/guide.md", "keep.log",
+                     "node_modules/pkg/README.md", "src/.gitignore", "src/build/module.py"]
+
+
+def test_ignore_rules_skip_vendor_dirs_by_default(tree):
+    files = [rel for rel, _, _ in IgnoreRules(str(tree)).walk()]
+
+    assert "node_modules/pkg/README.md" not in files
+    assert "src/build/module.py" not in files
+
+
+def _git(cwd, *args):
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                   cwd=cwd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def test_archive_is_filtered_writable_and_cached_by_commit(tree, tmp_path):
+    _git(tree, "init", "-q")
+    _git(tree, "add", "-A")
+    _git(tree, "commit", "-q", "-m", "init")
+
+    cache = WorkspaceArchiveCache(cache_dir=str(tmp_path / "cache"))
+    key, _ = cache.cache_key(str(tree))
+    archive = cache.get_archive(str(tree), timeout=10)
+
+    assert key.startswith("commit-")
+    assert os.path.basename(archive) == f"{key}.tar"
+    with tarfile.open(archive) as tar:
+        members = {m.name: m for m in tar.getmembers()}
+    assert "repo/README.md" in members
+    assert "repo/app.log" not in members
+    assert "repo/node_modules/pkg/README.md" in members  # tracked, so git keeps it
+    assert members["repo/src"].mode & 0o777 == 0o777
+    assert members["repo/README.md"].mode & 0o666 == 0o666
+
+    mtime = os.path.getmtime(archive)
+    assert cache.get_archive(str(tree), timeout=10) == archive
+    assert os.path.getmtime(archive) >= mtime
+
+    # Uncommitted changes switch to a content fingerprint key
+    _write(tree, "README.md", "changed")
+    dirty_key, _ = cache.cache_key(str(tree))
+    assert dirty_key.startswith("tree-")
+    with tarfile.open(cache.get_archive(str(tree), timeout=10)) as tar:
+        assert tar.extractfile("repo/README.md").read() == b"changed"
+    cache.close()